@@ -0,0 +1,108 @@
+"""
+End-to-end benchmark for Step 6 compositing engines.
+
+Times Step_6_video_generation.execute_step with VIDEO_COMPOSITOR=local (one
+ffmpeg process) and, when Cloudinary credentials are set, with
+VIDEO_COMPOSITOR=cloudinary (two uploads, a remote transcode and a download).
+Inputs are synthesized with ffmpeg unless --video and --audio are given.
+
+Usage:
+    python benchmarks/bench_step6_compositing.py [--duration 30] [--size 1280x720] [--repeat 3]
+        [--style nature] [--video in.mp4 --audio narration.mp3] [--engines local,cloudinary]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Register the pipeline package without running its __init__, which imports every step
+sys.path.insert(0, str(ROOT))
+_package = types.ModuleType('pipeline')
+_package.__path__ = [str(ROOT / 'pipeline')]
+sys.modules.setdefault('pipeline', _package)
+
+from pipeline import Step_6_video_generation  # noqa: E402
+
+def make_inputs(directory: Path, duration: float, size: str) -> tuple:
+    """Synthesize a test video with a tone soundtrack and a narration track."""
+    video = directory / 'source.mp4'
+    audio = directory / 'narration.mp3'
+    subprocess.run([
+        'ffmpeg', '-y', '-loglevel', 'error',
+        '-f', 'lavfi', '-i', f'testsrc2=size={size}:rate=30:duration={duration}',
+        '-f', 'lavfi', '-i', f'sine=frequency=220:duration={duration}',
+        '-c:v', 'libx264', '-preset', 'veryfast', '-pix_fmt', 'yuv420p',
+        '-c:a', 'aac', '-shortest', str(video)
+    ], check=True)
+    subprocess.run([
+        'ffmpeg', '-y', '-loglevel', 'error',
+        '-f', 'lavfi', '-i', f'sine=frequency=440:duration={duration * 0.9}',
+        '-c:a', 'libmp3lame', '-b:a', '64k', str(audio)
+    ], check=True)
+    return video, audio
+
+async def run_engine(engine: str, video: Path, audio: Path, output_dir: Path, style: str, repeat: int) -> list:
+    """Time execute_step with one compositor."""
+    os.environ['VIDEO_COMPOSITOR'] = engine
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = await Step_6_video_generation.execute_step(video, audio, output_dir, style)
+        elapsed = time.perf_counter() - started
+        if result is None:
+            raise RuntimeError(f"{engine} compositor failed")
+        timings.append(elapsed)
+        size = Path(result).stat().st_size / 1024 / 1024
+        print(f"  {engine:<11} {elapsed:7.2f}s  ({size:.1f} MB)")
+    return timings
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--duration', type=float, default=30.0, help='Synthetic video length in seconds')
+    parser.add_argument('--size', default='1280x720', help='Synthetic video size')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--style', default='nature')
+    parser.add_argument('--video', type=Path)
+    parser.add_argument('--audio', type=Path)
+    parser.add_argument('--engines', default='local,cloudinary')
+    args = parser.parse_args()
+
+    engines = args.engines.split(',')
+    has_credentials = all(os.getenv(name) for name in (
+        'CLOUDINARY_CLOUD_NAME', 'CLOUDINARY_API_KEY', 'CLOUDINARY_API_SECRET'
+    ))
+    if 'cloudinary' in engines and not has_credentials:
+        print("Cloudinary credentials not set, skipping the cloudinary engine")
+        engines.remove('cloudinary')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        if args.video and args.audio:
+            video, audio = args.video, args.audio
+        else:
+            video, audio = make_inputs(tmp, args.duration, args.size)
+        print(f"Input: {video} ({video.stat().st_size / 1024 / 1024:.1f} MB), narration: {audio}")
+
+        results = {}
+        for engine in engines:
+            results[engine] = asyncio.run(run_engine(engine, video, audio, tmp, args.style, args.repeat))
+
+    print()
+    print(f"{'engine':<11} {'median':>8} {'min':>8} {'max':>8}")
+    for engine, timings in results.items():
+        print(f"{engine:<11} {statistics.median(timings):7.2f}s {min(timings):7.2f}s {max(timings):7.2f}s")
+    if 'local' in results and 'cloudinary' in results:
+        speedup = statistics.median(results['cloudinary']) / statistics.median(results['local'])
+        print(f"\nlocal is {speedup:.1f}x the speed of cloudinary (median end-to-end)")
+
+if __name__ == '__main__':
+    main()
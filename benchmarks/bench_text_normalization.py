@@ -0,0 +1,160 @@
+"""
+Micro-benchmark for the audio script normalization passes.
+
+Compares the precompiled pipeline/text_normalization.py passes against the
+previous chained implementations on long English and Urdu scripts, and
+checks that both produce identical output.
+
+Usage:
+    python benchmarks/bench_text_normalization.py [--sentences 400] [--repeat 20]
+"""
+
+import argparse
+import importlib.util
+import random
+import re
+import sys
+import timeit
+from pathlib import Path
+
+# Load the module by path so the benchmark does not need the pipeline's API dependencies
+_MODULE_PATH = Path(__file__).resolve().parent.parent / 'pipeline' / 'text_normalization.py'
+_spec = importlib.util.spec_from_file_location('text_normalization', _MODULE_PATH)
+text_normalization = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(text_normalization)
+
+EMPHASIS = {
+    'en': ["critically", "significantly", "notably", "exclusively"],
+    'ur': ["بالکل", "یقیناً", "واقعی", "بےحد"]
+}
+
+ENGLISH_WORDS = (
+    "the crowd watches as a magnificent eagle glides over the valley and critically "
+    "examines the river below while reporters notably describe every significantly "
+    "dramatic moment of this exclusively captured scene"
+).split()
+ENGLISH_NOISE = ["**", "#", "`code`", "~", "\u00e9", "\u2014", "\U0001F985", "@", "\u200b", "\x07", "- "]
+ENGLISH_ENDINGS = [". ", "! ", "? ", "... ", ", ", "; ", ".\n"]
+
+URDU_WORDS = "یہ ایک خوبصورت منظر ہے جہاں پرندہ بالکل آزاد اڑتا ہے اور لوگ واقعی حیران ہیں بےحد".split()
+URDU_NOISE = ["**", "abc", "\U0001F33F", "\u200c", "1", "#"]
+URDU_ENDINGS = ["۔ ", "، ", "؟ ", "! ", "۔\n"]
+
+# --- Previous implementations -------------------------------------------------
+
+def legacy_process_response(text: str, language: str) -> str:
+    text = re.sub(r'[*_#`]', '', text)
+    text = re.sub(r'^\s*[*-]\s*', '', text, flags=re.MULTILINE)
+    text = ''.join(char for char in text if char.isprintable() or char.isspace())
+    if language == 'ur':
+        text = text.replace('۔', '۔<break time="1s"/>')
+        text = text.replace('،', '،<break time="0.5s"/>')
+    else:
+        text = text.replace('. ', '... ')
+        text = text.replace('! ', '... ')
+        text = text.replace('? ', '... ')
+    return text.strip()
+
+def legacy_process_for_audio(commentary: str, language: str = 'en') -> str:
+    script = ''.join(char for char in commentary if char.isprintable() or char.isspace())
+    if language == 'ur':
+        allowed_chars = re.compile(r'[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF\s۔،؟!]')
+        script = ''.join(c for c in script if allowed_chars.match(c))
+        script = script.replace('۔', '۔<break time="1s"/>')
+        script = script.replace('،', '،<break time="0.5s"/>')
+        script = script.replace('؟', '؟<break time="0.8s"/>')
+    else:
+        script = re.sub(r'[*_#`~]', '', script)
+        script = re.sub(r'[^\x00-\x7F]+', '', script)
+        script = re.sub(r'[^\w\s.,!?;:()\-\'\"]+', ' ', script)
+        script = script.replace('. ', '... ').replace('! ', '... ').replace('? ', '... ')
+    script = re.sub(r'\s+', ' ', script)
+    return script.strip()
+
+def legacy_clean_for_speech(text: str) -> str:
+    text = re.sub(r'[^\w\s,.!?;:()\-\'\"]+', '', text)
+    return re.sub(r'\s+', ' ', text)
+
+def legacy_add_speech_markup(text: str, emphasis_words) -> str:
+    text = re.sub(r'([,;])\s', r'\1 <break time="0.2s"/> ', text)
+    text = re.sub(r'([.!?])\s', r'\1 <break time="0.4s"/> ', text)
+    text = re.sub(r'\.\.\.\s', '... <break time="0.3s"/> ', text)
+    text = re.sub(r'(!)\s', r'\1 <break time="0.2s"/> ', text)
+    text = re.sub(r'(\?)\s', r'\1 <break time="0.3s"/> ', text)
+    for emphasis in emphasis_words:
+        text = re.sub(f'\\b{emphasis}\\b', f'<emphasis level="strong">{emphasis}</emphasis>', text)
+    text = re.sub(r'\s*<break[^>]+>\s*<break[^>]+>\s*', ' <break time="0.4s"/> ', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+# --- Benchmark ------------------------------------------------------------------
+
+def make_script(language: str, sentences: int, rng: random.Random) -> str:
+    """Build a long commentary with markdown, symbols and mixed punctuation."""
+    words, noise, endings = (
+        (URDU_WORDS, URDU_NOISE, URDU_ENDINGS) if language == 'ur'
+        else (ENGLISH_WORDS, ENGLISH_NOISE, ENGLISH_ENDINGS)
+    )
+    parts = []
+    for _ in range(sentences):
+        sentence = rng.choices(words, k=rng.randint(6, 18))
+        for _ in range(rng.randint(0, 3)):
+            sentence.insert(rng.randrange(len(sentence) + 1), rng.choice(noise))
+        parts.append(' '.join(sentence) + rng.choice(endings))
+    return ''.join(parts)
+
+def pipelines(language: str):
+    """Return the legacy and new normalization chains for a language."""
+    emphasis = EMPHASIS[language]
+
+    def legacy(text):
+        response = legacy_process_response(text, language)
+        return (
+            legacy_process_for_audio(response, language),
+            legacy_add_speech_markup(legacy_clean_for_speech(response), emphasis)
+        )
+
+    def current(text):
+        response = text_normalization.clean_response(text, language)
+        return (
+            text_normalization.normalize_for_audio(response, language),
+            text_normalization.add_speech_markup(text_normalization.clean_for_speech(response), emphasis)
+        )
+
+    return legacy, current
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sentences', type=int, default=400, help='Sentences per script')
+    parser.add_argument('--repeat', type=int, default=20, help='Timed runs per implementation')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    failures = 0
+
+    for language in ('en', 'ur'):
+        legacy, current = pipelines(language)
+
+        # Parity on many short scripts plus the long benchmark script
+        samples = [make_script(language, rng.randint(1, 8), rng) for _ in range(500)]
+        script = make_script(language, args.sentences, rng)
+        mismatches = sum(legacy(sample) != current(sample) for sample in samples + [script])
+        failures += mismatches
+
+        legacy_time = min(timeit.repeat(lambda: legacy(script), number=1, repeat=args.repeat))
+        current_time = min(timeit.repeat(lambda: current(script), number=1, repeat=args.repeat))
+
+        print(
+            f"{language}: {len(script):>7} chars  "
+            f"legacy {legacy_time * 1000:8.2f} ms  "
+            f"precompiled {current_time * 1000:8.2f} ms  "
+            f"speedup {legacy_time / current_time:5.2f}x  "
+            f"mismatches {mismatches}"
+        )
+
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
+
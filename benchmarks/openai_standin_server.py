@@ -0,0 +1,264 @@
+"""
+Local stand-in for the OpenAI-compatible chat completions API.
+
+Implements the subset of /v1/chat/completions used by Steps 3 and 4 (text
+and image_url message parts, streaming and non-streaming responses) with
+configurable latency, token rate, provider concurrency and error injection,
+so their concurrency limits and queueing can be load-tested offline.
+
+Point the pipeline at it with:
+    OPENAI_BASE_URL=http://127.0.0.1:8080/v1 OPENAI_API_KEY=test
+    DEEPSEEK_BASE_URL=http://127.0.0.1:8080/v1 DEEPSEEK_API_KEY=test
+
+Usage:
+    python benchmarks/openai_standin_server.py [--port 8080] [--latency lognormal:0.8,0.5]
+        [--image-latency 0.4] [--tokens-per-second 60] [--max-concurrency 8]
+        [--error-rate 0.02] [--rate-limit-rate 0.0] [--hang-rate 0.0]
+
+Latency distributions (seconds to the first token):
+    fixed:S          always S
+    uniform:A,B      uniformly between A and B
+    lognormal:M,SIG  lognormal with median M and shape SIG (long tail)
+
+GET /stats returns request counts, in-flight and queue statistics; POST /stats/reset clears them.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+import uuid
+from typing import Callable, List
+
+from aiohttp import web
+
+SENTENCES = [
+    "The camera follows a small group of people walking along a busy street.",
+    "Bright signs and passing cars fill the background with movement.",
+    "A close-up shows someone smiling as they turn toward the lens.",
+    "The light shifts as clouds drift across the afternoon sky.",
+    "Nobody seems to notice the dog waiting patiently by the door.",
+    "The scene cuts to a wide view of the city skyline at dusk.",
+    "Text on screen highlights the key moment of the clip.",
+    "Everyone pauses, and for a second the whole street is quiet."
+]
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """Parse a latency distribution spec into a sampler."""
+    kind, _, args = spec.partition(':')
+    values = [float(v) for v in args.split(',') if v]
+    if kind == 'fixed' and len(values) == 1:
+        return lambda rng: values[0]
+    if kind == 'uniform' and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == 'lognormal' and len(values) == 2:
+        mu = math.log(values[0])
+        return lambda rng: rng.lognormvariate(mu, values[1])
+    raise argparse.ArgumentTypeError(f"Invalid latency spec: {spec}")
+
+def percentile(samples: List[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+class StandinServer:
+    """Simulated chat completions provider."""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.latency = args.latency
+        self.slots = asyncio.Semaphore(args.max_concurrency) if args.max_concurrency > 0 else None
+        self.reset()
+
+    def reset(self) -> None:
+        self.started = time.monotonic()
+        self.requests = 0
+        self.streamed = 0
+        self.images = 0
+        self.errors = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.queue_waits: List[float] = []
+        self.durations: List[float] = []
+        self.completion_tokens = 0
+
+    def _count_images(self, messages: list) -> int:
+        count = 0
+        for message in messages:
+            content = message.get('content')
+            if isinstance(content, list):
+                count += sum(1 for part in content if part.get('type') == 'image_url')
+        return count
+
+    def _completion(self, max_tokens: int) -> List[str]:
+        """Build the completion as a list of word tokens."""
+        words: List[str] = []
+        target = min(max_tokens, self.args.completion_tokens)
+        while len(words) < target:
+            words.extend(self.rng.choice(SENTENCES).split())
+        return [word + ' ' for word in words[:target]]
+
+    def _error(self, status: int, message: str, kind: str) -> web.Response:
+        self.errors[status] = self.errors.get(status, 0) + 1
+        return web.json_response({'error': {'message': message, 'type': kind}}, status=status)
+
+    async def chat_completions(self, request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        messages = body.get('messages', [])
+        model = body.get('model', 'standin')
+        stream = bool(body.get('stream'))
+        max_tokens = int(body.get('max_tokens') or self.args.completion_tokens)
+        images = self._count_images(messages)
+
+        self.requests += 1
+        self.images += images
+
+        # Error injection happens before queueing, like a provider rejecting at the edge
+        roll = self.rng.random()
+        if roll < self.args.rate_limit_rate:
+            return self._error(429, 'Rate limit exceeded (injected)', 'rate_limit_error')
+        roll -= self.args.rate_limit_rate
+        if roll < self.args.error_rate:
+            status = self.rng.choice((500, 502, 503))
+            return self._error(status, 'Upstream error (injected)', 'server_error')
+        roll -= self.args.error_rate
+        hang = roll < self.args.hang_rate
+
+        start = time.monotonic()
+        self.queued += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        if self.slots is not None:
+            await self.slots.acquire()
+        self.queued -= 1
+        self.queue_waits.append(time.monotonic() - start)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if hang:
+                await asyncio.sleep(self.args.hang_seconds)
+            await asyncio.sleep(self.latency(self.rng) + images * self.args.image_latency)
+            tokens = self._completion(max_tokens)
+            self.completion_tokens += len(tokens)
+            completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+            created = int(time.time())
+            if stream:
+                self.streamed += 1
+                return await self._stream(request, tokens, completion_id, created, model)
+            await asyncio.sleep(len(tokens) / self.args.tokens_per_second)
+            return web.json_response({
+                'id': completion_id,
+                'object': 'chat.completion',
+                'created': created,
+                'model': model,
+                'choices': [{
+                    'index': 0,
+                    'message': {'role': 'assistant', 'content': ''.join(tokens).strip()},
+                    'finish_reason': 'stop'
+                }],
+                'usage': {
+                    'prompt_tokens': len(json.dumps(messages)) // 4,
+                    'completion_tokens': len(tokens),
+                    'total_tokens': len(json.dumps(messages)) // 4 + len(tokens)
+                }
+            })
+        finally:
+            self.in_flight -= 1
+            self.durations.append(time.monotonic() - start)
+            if self.slots is not None:
+                self.slots.release()
+
+    async def _stream(self, request: web.Request, tokens: List[str], completion_id: str,
+                      created: int, model: str) -> web.StreamResponse:
+        response = web.StreamResponse(headers={'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache'})
+        await response.prepare(request)
+
+        def chunk(delta: dict, finish_reason=None) -> bytes:
+            payload = {
+                'id': completion_id,
+                'object': 'chat.completion.chunk',
+                'created': created,
+                'model': model,
+                'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}]
+            }
+            return f"data: {json.dumps(payload)}\n\n".encode()
+
+        await response.write(chunk({'role': 'assistant', 'content': ''}))
+        interval = 1 / self.args.tokens_per_second
+        for token in tokens:
+            await response.write(chunk({'content': token}))
+            await asyncio.sleep(interval)
+        await response.write(chunk({}, 'stop'))
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    async def models(self, request: web.Request) -> web.Response:
+        return web.json_response({'object': 'list', 'data': [
+            {'id': name, 'object': 'model', 'owned_by': 'standin'}
+            for name in ('gpt-4o', 'gpt-4o-mini', 'deepseek-chat')
+        ]})
+
+    async def stats(self, request: web.Request) -> web.Response:
+        elapsed = time.monotonic() - self.started
+        return web.json_response({
+            'uptime': round(elapsed, 3),
+            'requests': self.requests,
+            'requests_per_second': round(self.requests / elapsed, 3) if elapsed else 0.0,
+            'streamed': self.streamed,
+            'images': self.images,
+            'errors': self.errors,
+            'completion_tokens': self.completion_tokens,
+            'in_flight': self.in_flight,
+            'max_in_flight': self.max_in_flight,
+            'queued': self.queued,
+            'max_queued': self.max_queued,
+            'queue_wait_p50': round(percentile(self.queue_waits, 0.5), 4),
+            'queue_wait_p95': round(percentile(self.queue_waits, 0.95), 4),
+            'duration_p50': round(percentile(self.durations, 0.5), 4),
+            'duration_p95': round(percentile(self.durations, 0.95), 4)
+        })
+
+    async def reset_stats(self, request: web.Request) -> web.Response:
+        self.reset()
+        return web.json_response({'reset': True})
+
+    def app(self) -> web.Application:
+        app = web.Application(client_max_size=64 * 1024 * 1024)  # base64 frames are large
+        app.router.add_post('/v1/chat/completions', self.chat_completions)
+        app.router.add_get('/v1/models', self.models)
+        app.router.add_get('/stats', self.stats)
+        app.router.add_post('/stats/reset', self.reset_stats)
+        return app
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=parse_latency, default=parse_latency('lognormal:0.8,0.5'),
+                        help='Time to first token distribution')
+    parser.add_argument('--image-latency', type=float, default=0.4, help='Extra seconds per input image')
+    parser.add_argument('--tokens-per-second', type=float, default=60.0, help='Completion token rate')
+    parser.add_argument('--completion-tokens', type=int, default=120, help='Completion length cap')
+    parser.add_argument('--max-concurrency', type=int, default=8,
+                        help='Requests served at once; the rest queue (0 for unlimited)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of 5xx responses')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Fraction of 429 responses')
+    parser.add_argument('--hang-rate', type=float, default=0.0, help='Fraction of requests that stall')
+    parser.add_argument('--hang-seconds', type=float, default=120.0, help='Stall length for hung requests')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    server = StandinServer(args)
+    print(f"Serving chat completions on http://{args.host}:{args.port}/v1")
+    web.run_app(server.app(), host=args.host, port=args.port, print=None)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
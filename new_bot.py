@@ -156,6 +156,10 @@ from pipeline import (
     Step_5_generate_audio,
     Step_6_video_generation
 )
+from pipeline import artifacts, metrics
+from pipeline.prompts import COMMENTARY_STYLES
+from pipeline.response_cache import response_cache
+from pipeline.tts_cache import tts_cache
 
 # Constants
 MAX_VIDEO_SIZE = 50 * 1024 * 1024  # 50MB
@@ -175,7 +179,9 @@ class VideoBot:
             'llm': 'openai',
             'language': 'en',
             'notifications': True,
-            'auto_cleanup': True
+            'auto_cleanup': True,
+            'fresh_commentary': False,
+            'fanout': False
         }
         
         # Available styles
@@ -238,6 +244,9 @@ class VideoBot:
         self.active_processes = 0
         self.process_lock = asyncio.Lock()
         self.thread_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="video_worker")
+        
+        # Stream commentary sentences straight into TTS instead of waiting for the full script
+        self.streaming_commentary = os.getenv('STREAMING_COMMENTARY', 'false').lower() in ('1', 'true', 'yes')
 
     def get_user_settings(self, user_id: int) -> dict:
         """Get settings for a user, with defaults if not set."""
@@ -330,6 +339,16 @@ class VideoBot:
                     callback_data="set_notif"
                 )
             ],
+            [
+                InlineKeyboardButton(
+                    f"{'🎲' if settings.get('fresh_commentary') else '♻️'} Fresh Commentary",
+                    callback_data="toggle_fresh"
+                ),
+                InlineKeyboardButton(
+                    f"{'🎭' if settings.get('fanout') else '🎬'} All Styles",
+                    callback_data="toggle_fanout"
+                )
+            ],
             [InlineKeyboardButton("« Back to Main Menu", callback_data="back_to_main")]
         ]
         
@@ -339,7 +358,9 @@ class VideoBot:
             f"{current_style['icon']} Style: {current_style['name']}\n"
             f"{current_llm['icon']} AI Model: {current_llm['name']}\n"
             f"{current_lang['icon']} Language: {current_lang['name']}\n"
-            f"{'🔔' if settings['notifications'] else '🔕'} Notifications: {'On' if settings['notifications'] else 'Off'}\n\n"
+            f"{'🔔' if settings['notifications'] else '🔕'} Notifications: {'On' if settings['notifications'] else 'Off'}\n"
+            f"{'🎲' if settings.get('fresh_commentary') else '♻️'} Fresh Commentary: {'On' if settings.get('fresh_commentary') else 'Off'}\n"
+            f"{'🎭' if settings.get('fanout') else '🎬'} All Styles: {'On' if settings.get('fanout') else 'Off'}\n\n"
             "Select a setting to change:"
         )
         
@@ -564,6 +585,9 @@ class VideoBot:
             output_dir = Path(f"output_{update.message.message_id}")
             output_dir.mkdir(exist_ok=True)
             
+            # Upload the source video for Step 6 while Steps 2-5 run
+            video_upload_task = Step_6_video_generation.start_video_upload(Path(video_path))
+            
             try:
                 # Save metadata if provided
                 if metadata:
@@ -581,7 +605,9 @@ class VideoBot:
                     "30% ▰▰▰▱▱▱▱▱▱▱"
                 )
                 
-                key_frames, scene_changes, motion_scores, duration, file_metadata = Step_2_extract_frames.execute_step(
+                # In a worker thread, so the background video upload keeps running
+                key_frames, scene_changes, motion_scores, duration, file_metadata = await asyncio.to_thread(
+                    Step_2_extract_frames.execute_step,
                     video_file=video_path,
                     output_dir=output_dir
                 )
@@ -621,65 +647,18 @@ class VideoBot:
                     video_duration=duration
                 )
                 
-                # Step 4: Generate commentary
-                logger.info(f"Generating commentary in {settings['language']}...")
-                await status_message.edit_text(
-                    "💭 Generating commentary...\n\n"
-                    "70% ▰▰▰▰▰▰▰▱▱▱"
-                )
-                
-                audio_script = await Step_4_generate_commentary.execute_step(
-                    frames_info,
-                    output_dir,
-                    settings['style']
+                # Steps 4-6: Generate commentary, audio and final video
+                final_videos = await self.render_styles(
+                    video_path, frames_info, output_dir, settings, status_message, video_upload_task
                 )
                 
-                # Step 5: Generate audio
-                logger.info(f"Generating audio in {settings['language']}...")
-                await status_message.edit_text(
-                    "🎙️ Synthesizing voice...\n\n"
-                    "80% ▰▰▰▰▰▰▰▰▱▱"
-                )
-                
-                audio_path = await Step_5_generate_audio.execute_step(
-                    audio_script,
-                    output_dir,
-                    settings['style']
-                )
-                
-                # Step 6: Generate final video
-                logger.info("Generating final video...")
-                await status_message.edit_text(
-                    "🎥 Creating final video...\n\n"
-                    "85% ▰▰▰▰▰▰▰▰▰▱"
-                )
-                
-                final_video = await Step_6_video_generation.execute_step(
-                    Path(video_path),
-                    Path(str(audio_path)),
-                    output_dir,
-                    settings['style']
-                )
-                
-                if not final_video:
-                    raise ValueError("Failed to generate final video")
-                
                 # Upload final video
                 await status_message.edit_text(
                     "📤 Uploading enhanced video...\n\n"
                     "90% ▰▰▰▰▰▰▰▰▱▱"
                 )
                 
-                with open(final_video, 'rb') as f:
-                    await update.message.reply_video(
-                        video=f,
-                        caption=(
-                            f"✨ Here's your video with {settings['style']} commentary!\n\n"
-                            f"🎭 Style: {settings['style'].title()}\n"
-                            f"🤖 AI: {settings['llm'].title()}\n"
-                            f"🌐 Language: {settings['language'].upper()}"
-                        )
-                    )
+                await self.send_final_videos(update.message, final_videos, settings)
                 
                 # Complete
                 await status_message.edit_text(
@@ -688,6 +667,8 @@ class VideoBot:
                 )
                 
             finally:
+                await Step_6_video_generation.discard_video_upload(video_upload_task)
+                self.log_job_metrics()
                 # Cleanup output directory
                 if output_dir.exists():
                     shutil.rmtree(output_dir)
@@ -903,6 +884,15 @@ class VideoBot:
         except Exception as e:
             logger.error(f"Cleanup error: {e}")
 
+    def log_job_metrics(self):
+        """Log the pipeline counters and cache statistics when a job ends."""
+        try:
+            metrics.log_snapshot()
+            logger.info(f"LLM response cache: {response_cache.stats()}")
+            logger.info(f"TTS cache: {tts_cache.stats()}")
+        except Exception as e:
+            logger.error(f"Error logging metrics: {e}")
+
     async def process_video(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Process uploaded video."""
         user_id = update.effective_user.id
@@ -976,14 +966,18 @@ class VideoBot:
                 output_dir = Path(f"output_{video.file_unique_id}")
                 output_dir.mkdir(exist_ok=True)
                 
+                # Upload the source video for Step 6 while Steps 2-5 run
+                video_upload_task = Step_6_video_generation.start_video_upload(Path(video_path))
+                
                 try:
                     # Process through pipeline
-                    final_video = await self.run_pipeline_sync(
+                    final_videos = await self.run_pipeline_sync(
                         video_path,
                         output_dir,
                         settings,
                         status_message,
-                        metadata
+                        metadata,
+                        video_upload_task
                     )
                     
                     # Upload final video
@@ -992,16 +986,7 @@ class VideoBot:
                         "90% ▰▰▰▰▰▰▰▰▱▱"
                     )
                     
-                    with open(final_video, 'rb') as f:
-                        await update.message.reply_video(
-                            video=f,
-                            caption=(
-                                f"✨ Here's your video with {settings['style']} commentary!\n\n"
-                                f"🎭 Style: {settings['style'].title()}\n"
-                                f"🤖 AI: {settings['llm'].title()}\n"
-                                f"🌐 Language: {settings['language'].upper()}"
-                            )
-                        )
+                    await self.send_final_videos(update.message, final_videos, settings)
                     
                     # Complete
                     await status_message.edit_text(
@@ -1011,6 +996,8 @@ class VideoBot:
                     
                 finally:
                     # Cleanup
+                    await Step_6_video_generation.discard_video_upload(video_upload_task)
+                    self.log_job_metrics()
                     if os.path.exists(video_path):
                         os.remove(video_path)
                     if output_dir.exists():
@@ -1077,8 +1064,167 @@ class VideoBot:
             logger.error(f"Error optimizing video: {e}")
             return video_path  # Return original if optimization fails
 
-    async def run_pipeline_sync(self, video_path: str, output_dir: Path, settings: dict, status_message, metadata=None) -> str:
-        """Synchronous version of pipeline for thread pool."""
+    async def generate_commentary_audio(self, frames_info: dict, output_dir: Path, settings: dict, status_message=None) -> str:
+        """
+        Run Steps 4 and 5 and return the path of the narration audio.
+        
+        In streaming mode each commentary sentence is synthesized while the
+        rest of the commentary is still being generated. Status updates are
+        skipped when no status message is given.
+        """
+        use_cache = not settings.get('fresh_commentary', False)
+        
+        if self.streaming_commentary:
+            logger.info(f"Streaming commentary and audio in {settings['language']}...")
+            if status_message:
+                await status_message.edit_text(
+                    "💭 Generating commentary and voice...\n\n"
+                    "70% ▰▰▰▰▰▰▰▱▱▱"
+                )
+            sentences = Step_4_generate_commentary.stream_step(
+                frames_info,
+                output_dir,
+                settings['style'],
+                use_cache=use_cache,
+                llm=settings['llm']
+            )
+            audio_path = await Step_5_generate_audio.execute_streaming_step(
+                sentences,
+                output_dir,
+                settings['style'],
+                settings['language'],
+                target_duration=frames_info['metadata'].get('duration')
+            )
+            await artifacts.flush()
+            return audio_path
+        
+        # Generate commentary
+        logger.info(f"Generating commentary in {settings['language']}...")
+        if status_message:
+            await status_message.edit_text(
+                "💭 Generating commentary...\n\n"
+                "70% ▰▰▰▰▰▰▰▱▱▱"
+            )
+        commentary = await Step_4_generate_commentary.execute_step(
+            frames_info,
+            output_dir,
+            settings['style'],
+            use_cache=use_cache,
+            llm=settings['llm']
+        )
+        
+        # Generate audio
+        logger.info(f"Generating audio in {settings['language']}...")
+        if status_message:
+            await status_message.edit_text(
+                "🎙️ Synthesizing voice...\n\n"
+                "80% ▰▰▰▰▰▰▰▰▱▱"
+            )
+        audio_path = await Step_5_generate_audio.execute_step(
+            commentary,
+            output_dir,
+            settings['style']
+        )
+        
+        # Commentary artifacts were written in the background during synthesis
+        await artifacts.flush()
+        return audio_path
+
+    async def render_styles(self, video_path: str, frames_info: dict, output_dir: Path, settings: dict, status_message, video_upload_task=None) -> Dict[str, str]:
+        """
+        Run Steps 4-6 for the selected style, or for every style in fan-out mode.
+        
+        In fan-out mode the analysis and the uploaded source video are shared,
+        and each style's commentary, audio and compositing run concurrently.
+        
+        Args:
+            video_upload_task: Background upload of the source video started with
+                Step_6_video_generation.start_video_upload; the caller discards it
+        
+        Returns:
+            Final video path by style
+        """
+        if not settings.get('fanout'):
+            audio_path = await self.generate_commentary_audio(frames_info, output_dir, settings, status_message)
+            
+            logger.info("Generating final video...")
+            await status_message.edit_text(
+                "🎥 Creating final video...\n\n"
+                "85% ▰▰▰▰▰▰▰▰▰▱"
+            )
+            final_video = await Step_6_video_generation.execute_step(
+                Path(video_path),
+                Path(str(audio_path)),
+                output_dir,
+                settings['style'],
+                video_upload=await Step_6_video_generation.await_video_upload(video_upload_task)
+            )
+            if not final_video:
+                raise ValueError("Failed to generate final video")
+            return {settings['style']: str(final_video)}
+        
+        styles = [style for style in self.styles if style in COMMENTARY_STYLES]
+        logger.info(f"Fanning out to styles: {styles}")
+        await status_message.edit_text(
+            f"🎭 Creating {len(styles)} commentary styles...\n\n"
+            "70% ▰▰▰▰▰▰▰▱▱▱"
+        )
+        
+        # Cloudinary renders from an uploaded copy; the local compositor reads the file directly
+        shared_upload = None
+        if video_upload_task is None and Step_6_video_generation.compositor() == 'cloudinary':
+            shared_upload = await Step_6_video_generation.upload_shared_video(Path(video_path))
+            if not shared_upload:
+                raise ValueError("Failed to upload video")
+        
+        async def render(style: str) -> str:
+            style_settings = {**settings, 'style': style}
+            audio_path = await self.generate_commentary_audio(frames_info, output_dir, style_settings)
+            video_upload = shared_upload or await Step_6_video_generation.await_video_upload(video_upload_task)
+            final_video = await Step_6_video_generation.execute_step(
+                Path(video_path),
+                Path(str(audio_path)),
+                output_dir,
+                style,
+                video_upload=video_upload
+            )
+            if not final_video:
+                raise ValueError(f"Failed to generate {style} video")
+            return str(final_video)
+        
+        try:
+            results = await asyncio.gather(*(render(style) for style in styles), return_exceptions=True)
+        finally:
+            if shared_upload:
+                await Step_6_video_generation.release_shared_video(shared_upload['public_id'])
+        
+        final_videos = {}
+        for style, result in zip(styles, results):
+            if isinstance(result, Exception):
+                logger.error(f"Style {style} failed: {result}")
+            else:
+                final_videos[style] = result
+        
+        if not final_videos:
+            raise ValueError("Failed to generate any style")
+        return final_videos
+
+    async def send_final_videos(self, message, final_videos: Dict[str, str], settings: dict):
+        """Send each generated video to the user."""
+        for style, final_video in final_videos.items():
+            with open(final_video, 'rb') as f:
+                await message.reply_video(
+                    video=f,
+                    caption=(
+                        f"✨ Here's your video with {style} commentary!\n\n"
+                        f"🎭 Style: {style.title()}\n"
+                        f"🤖 AI: {settings['llm'].title()}\n"
+                        f"🌐 Language: {settings['language'].upper()}"
+                    )
+                )
+
+    async def run_pipeline_sync(self, video_path: str, output_dir: Path, settings: dict, status_message, metadata=None, video_upload_task=None) -> Dict[str, str]:
+        """Synchronous version of pipeline for thread pool. Returns final video paths by style."""
         try:
             # Save metadata if provided
             if metadata:
@@ -1088,7 +1234,9 @@ class VideoBot:
             
             # Extract frames
             logger.info("Extracting frames...")
-            key_frames, scene_changes, motion_scores, duration, file_metadata = Step_2_extract_frames.execute_step(
+            # In a worker thread, so the background video upload keeps running
+            key_frames, scene_changes, motion_scores, duration, file_metadata = await asyncio.to_thread(
+                Step_2_extract_frames.execute_step,
                 video_file=video_path,
                 output_dir=output_dir
             )
@@ -1129,54 +1277,12 @@ class VideoBot:
                 video_duration=duration
             )
             
-            # Update status
-            await status_message.edit_text(
-                "💭 Generating commentary...\n\n"
-                "70% ▰▰▰▰▰▰▰▱▱▱"
+            # Generate commentary, audio and final video
+            final_videos = await self.render_styles(
+                video_path, frames_info, output_dir, settings, status_message, video_upload_task
             )
-            
-            # Generate commentary
-            logger.info(f"Generating commentary in {settings['language']}...")
-            audio_script = await Step_4_generate_commentary.execute_step(
-                frames_info,
-                output_dir,
-                settings['style']
-            )
-            
-            # Update status
-            await status_message.edit_text(
-                "🎙️ Synthesizing voice...\n\n"
-                "80% ▰▰▰▰▰▰▰▰▱▱"
-            )
-            
-            # Generate audio
-            logger.info(f"Generating audio in {settings['language']}...")
-            audio_path = await Step_5_generate_audio.execute_step(
-                audio_script,
-                output_dir,
-                settings['style']
-            )
-            
-            # Update status
-            await status_message.edit_text(
-                "🎥 Creating final video...\n\n"
-                "85% ▰▰▰▰▰▰▰▰▰▱"
-            )
-            
-            # Generate final video
-            logger.info("Generating final video...")
-            final_video = await Step_6_video_generation.execute_step(
-                Path(video_path),
-                Path(str(audio_path)),
-                output_dir,
-                settings['style']
-            )
-            
-            if final_video:
-                logger.info(f"Processing complete! Final video: {final_video}")
-                return str(final_video)
-            else:
-                raise ValueError("Failed to generate final video")
+            logger.info(f"Processing complete! Final videos: {final_videos}")
+            return final_videos
             
         except Exception as e:
             logger.error(f"Pipeline error: {e}")
@@ -1200,6 +1306,24 @@ class VideoBot:
                 await self.handle_language_selection(update, context)
             elif data == "set_notif":
                 await self.handle_notification_setting(update, context)
+            elif data == "toggle_fresh":
+                settings = self.get_user_settings(update.effective_user.id)
+                value = not settings.get('fresh_commentary', False)
+                self.update_user_setting(update.effective_user.id, 'fresh_commentary', value)
+                await query.answer(
+                    "Commentary will be regenerated for every video" if value
+                    else "Repeated videos will reuse cached commentary"
+                )
+                await self.settings_menu(update, context)
+            elif data == "toggle_fanout":
+                settings = self.get_user_settings(update.effective_user.id)
+                value = not settings.get('fanout', False)
+                self.update_user_setting(update.effective_user.id, 'fanout', value)
+                await query.answer(
+                    "You will receive a video for every style" if value
+                    else "You will receive a video in your selected style"
+                )
+                await self.settings_menu(update, context)
             elif data == "url":
                 await self.handle_url_share(update, context)
             elif data.startswith("style_"):
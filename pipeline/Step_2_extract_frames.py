@@ -9,6 +9,9 @@ from typing import List, Tuple
 import cv2
 import numpy as np
 
+from .analysis_models import FrameRecord, save_frame_manifest
+from .frame_signatures import dhash
+
 logger = logging.getLogger(__name__)
 
 class FrameExtractor:
@@ -27,6 +30,7 @@ class FrameExtractor:
         self.frames_dir.mkdir(parents=True, exist_ok=True)
         self.scene_changes = []
         self.motion_scores = []
+        self.manifest: List[FrameRecord] = []
         
         # Load object detection models only if needed
         self.face_cascade = None
@@ -192,6 +196,14 @@ class FrameExtractor:
                     if frame_diff > min_scene_change:
                         self.scene_changes.append(frame_path)
                     self.motion_scores.append((frame_path, motion_score))
+                    self.manifest.append(FrameRecord(
+                        path=str(frame_path),
+                        timestamp=float(timestamp),
+                        frame_diff=float(frame_diff),
+                        motion_score=float(motion_score),
+                        scene_change=bool(frame_diff > min_scene_change),
+                        hash=dhash(frame)
+                    ))
                     
                     logger.info(f"Saved frame at {timestamp:.2f}s (scene_change={frame_diff > min_scene_change}, "
                               f"motion={motion_score:.2f}")
@@ -203,6 +215,10 @@ class FrameExtractor:
     def get_motion_scores(self) -> List[Tuple[Path, float]]:
         """Get motion scores for saved frames."""
         return self.motion_scores
+    
+    def get_manifest(self) -> List[FrameRecord]:
+        """Get manifest records (timestamp, scores and hash) for saved frames."""
+        return self.manifest
 
 def execute_step(
     video_file: Path,
@@ -228,6 +244,9 @@ def execute_step(
         - List of tuples containing (frame path, motion score)
         - Video duration in seconds
         - Video metadata dictionary
+        
+    The frame manifest (timestamp, scores and perceptual hash per frame) is
+    written to frame_manifest.json in the output directory for Step 3.
     """
     logger.debug("Step 2: Extracting frames...")
     
@@ -263,6 +282,7 @@ def execute_step(
     
     scene_changes = frame_extractor.get_scene_changes()
     motion_scores = frame_extractor.get_motion_scores()
+    save_frame_manifest(frame_extractor.get_manifest(), output_dir / "frame_manifest.json")
     
     logger.debug(f"Extracted {len(key_frames)} key frames")
     logger.debug(f"Detected {len(scene_changes)} scene changes")
@@ -3,34 +3,65 @@ Step 3: Frame analysis module
 Analyzes extracted frames using Google Vision and OpenAI Vision APIs
 """
 
+import asyncio
 import base64
-import json
+import bisect
 import logging
 import os
+import time
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Union
 
 from google.cloud import vision
-from openai import OpenAI
+from openai import APITimeoutError, AsyncOpenAI
+
+from . import analysis_models, metrics
+from .frame_signatures import DEFAULT_MAX_DISTANCE, cluster_by_signature, dhash_file
+from .analysis_models import (
+    DetectedObject,
+    FrameAnalysis,
+    FrameDescription,
+    FrameRecord,
+    GoogleVisionResult,
+    Label,
+    VideoAnalysis
+)
+from .hedging import LatencyTracker, hedged_request
+from .prompt_budget import PromptBudget
 
 logger = logging.getLogger(__name__)
 
-def convert_numpy_floats(obj):
-    """Convert any numpy float types to Python floats for JSON serialization."""
-    if isinstance(obj, dict):
-        return {str(k): convert_numpy_floats(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_numpy_floats(item) for item in obj]
-    elif isinstance(obj, Path):
-        return str(obj)
-    elif hasattr(obj, 'dtype'):  # Check if it's a numpy type
-        return float(obj)
-    return obj
+# Token budgets for the variable context in the OpenAI Vision prompt
+PROMPT_TITLE_TOKENS = int(os.getenv('VISION_PROMPT_TITLE_TOKENS', '40'))
+PROMPT_DESCRIPTION_TOKENS = int(os.getenv('VISION_PROMPT_DESCRIPTION_TOKENS', '150'))
+PROMPT_MAX_LABELS = int(os.getenv('VISION_PROMPT_MAX_LABELS', '10'))
+PROMPT_MAX_OBJECTS = int(os.getenv('VISION_PROMPT_MAX_OBJECTS', '8'))
+
+# Observed OpenAI Vision latencies, shared across jobs to derive the hedge delay
+_openai_latency = LatencyTracker()
+
+def _env_flag(name: str, default: bool = False) -> bool:
+    """Read a boolean flag from the environment."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
 
 class VisionAnalyzer:
     """Handles image analysis using multiple vision APIs with optimized usage."""
     
-    def __init__(self, frames_dir: Path, output_dir: Path, metadata: Optional[dict] = None):
+    def __init__(
+        self,
+        frames_dir: Path,
+        output_dir: Path,
+        metadata: Optional[dict] = None,
+        call_timeout: Optional[float] = None,
+        hedging: Optional[bool] = None,
+        job_budget: Optional[float] = None,
+        max_descriptions: Optional[int] = None,
+        diversity_threshold: Optional[int] = None,
+        frame_manifest: Optional[List[FrameRecord]] = None
+    ):
         """
         Initialize vision analyzer.
         
@@ -38,19 +69,47 @@ class VisionAnalyzer:
             frames_dir: Directory containing frames to analyze
             output_dir: Directory to save analysis results
             metadata: Video metadata dictionary
+            call_timeout: Deadline in seconds for each OpenAI Vision call (env VISION_CALL_TIMEOUT)
+            hedging: Issue a duplicate request once a call passes the observed P90 latency (env VISION_HEDGING)
+            job_budget: Total seconds for the vision stage, after which it returns with
+                the descriptions it has (env VISION_JOB_BUDGET)
+            max_descriptions: Upper bound on paid OpenAI Vision calls per video (env VISION_MAX_DESCRIPTIONS)
+            diversity_threshold: Maximum perceptual hash distance for two frames to count as
+                the same shot (env VISION_DIVERSITY_THRESHOLD)
+            frame_manifest: Frame records from Step 2 (timestamps, scores and hashes)
         """
         self.frames_dir = Path(frames_dir)
         self.output_dir = Path(output_dir)
-        self.metadata = convert_numpy_floats(metadata or {})
+        self.metadata = dict(metadata or {})
+        self.frame_records: Dict[Path, FrameRecord] = {
+            Path(record.path): record for record in (frame_manifest or [])
+        }
+        
+        # Latency controls
+        self.call_timeout = call_timeout if call_timeout is not None else float(os.getenv('VISION_CALL_TIMEOUT', '30'))
+        self.hedging = hedging if hedging is not None else _env_flag('VISION_HEDGING')
+        self.job_budget = job_budget if job_budget is not None else float(os.getenv('VISION_JOB_BUDGET', '90'))
+        
+        # Frame budget, scaled by the visual variety of the video
+        self.max_descriptions = max_descriptions if max_descriptions is not None else int(os.getenv('VISION_MAX_DESCRIPTIONS', '3'))
+        self.diversity_threshold = (diversity_threshold if diversity_threshold is not None
+                                    else int(os.getenv('VISION_DIVERSITY_THRESHOLD', str(DEFAULT_MAX_DISTANCE))))
         
         # Initialize API clients
         self.vision_client = vision.ImageAnnotatorClient()
-        self.openai_client = OpenAI()  # Initialize without explicit API key
+        self.openai_client = AsyncOpenAI(base_url=os.getenv('VISION_BASE_URL') or os.getenv('OPENAI_BASE_URL') or None)
         
         # Analysis storage
         self.google_vision_results = {}
         self.openai_results = {}
     
+    def _frame_timestamp(self, frame_path: Path) -> float:
+        """Get a frame's timestamp from the manifest, falling back to its filename."""
+        record = self.frame_records.get(frame_path)
+        if record is not None:
+            return record.timestamp
+        return float(frame_path.stem.split('_')[1].rstrip('s'))
+    
     def select_key_frames(self, scene_changes: List[Union[Path, str]], motion_scores: List[Tuple[Union[Path, str], float]], max_frames: int = 12) -> List[Path]:
         """
         Select key frames for detailed analysis.
@@ -61,11 +120,15 @@ class VisionAnalyzer:
         motion_scores = [(Path(p) if isinstance(p, str) else p, float(s)) for p, s in motion_scores]
         
         selected_frames = []
+        selected_set = set()
+        selected_times = []  # Sorted timestamps of selected frames
         
         # Include all scene changes up to half of max_frames
         scene_limit = max_frames // 2
-        if scene_changes:
-            selected_frames.extend(scene_changes[:scene_limit])
+        for frame_path in scene_changes[:scene_limit]:
+            selected_frames.append(frame_path)
+            selected_set.add(frame_path)
+            bisect.insort(selected_times, self._frame_timestamp(frame_path))
         
         # Sort motion scores by magnitude
         sorted_motion = sorted(motion_scores, key=lambda x: x[1], reverse=True)
@@ -74,20 +137,53 @@ class VisionAnalyzer:
         for frame_path, _ in sorted_motion:
             if len(selected_frames) >= max_frames:
                 break
+            if frame_path in selected_set:
+                continue
                 
-            # Check if frame is sufficiently different in time from selected frames
-            frame_time = float(frame_path.name.split('_')[1].replace('s.jpg', ''))
-            is_unique = all(
-                abs(float(f.name.split('_')[1].replace('s.jpg', '')) - frame_time) > 2.0
-                for f in selected_frames
+            # Only the nearest selected neighbours need checking for temporal spacing
+            frame_time = self._frame_timestamp(frame_path)
+            index = bisect.bisect_left(selected_times, frame_time)
+            is_unique = (
+                (index == 0 or frame_time - selected_times[index - 1] > 2.0) and
+                (index == len(selected_times) or selected_times[index] - frame_time > 2.0)
             )
             
-            if is_unique and frame_path not in selected_frames:
+            if is_unique:
                 selected_frames.append(frame_path)
+                selected_set.add(frame_path)
+                selected_times.insert(index, frame_time)
         
         return selected_frames
     
-    async def analyze_frame_google_vision(self, frame_path: Path) -> Tuple[Optional[dict], bool]:
+    def select_diverse_frames(self, key_frames: List[Path], max_frames: int = 12) -> List[Path]:
+        """
+        Reduce key frames to one representative per visually distinct shot.
+        
+        Frames are clustered by perceptual hash; the highest-priority frame of
+        each cluster is kept, so a static clip costs a single analysis while a
+        varied one keeps up to max_frames.
+        
+        Args:
+            key_frames: Candidate frames in priority order
+            max_frames: Maximum number of representatives to return
+            
+        Returns:
+            Representative frames in priority order
+        """
+        signatures = {}
+        for frame_path in key_frames:
+            record = self.frame_records.get(frame_path)
+            # Reuse the hash computed by Step 2; only hash from disk if it is missing
+            signatures[frame_path] = record.hash if record is not None and record.hash is not None else dhash_file(frame_path)
+        clusters = cluster_by_signature(key_frames, signatures, self.diversity_threshold)
+        representatives = [cluster[0] for cluster in clusters][:max_frames]
+        
+        logger.info(f"Grouped {len(key_frames)} candidate frames into {len(clusters)} visual clusters")
+        metrics.observe("vision.visual_clusters", len(clusters))
+        metrics.increment("vision.frames_skipped", len(key_frames) - len(representatives))
+        return representatives
+    
+    async def analyze_frame_google_vision(self, frame_path: Path) -> Tuple[Optional[GoogleVisionResult], bool]:
         """
         Analyze a frame using Google Vision API.
         Optimized to use only essential features.
@@ -110,29 +206,29 @@ class VisionAnalyzer:
             for obj in response.localized_object_annotations:
                 # Higher confidence threshold for better accuracy
                 if obj.score >= 0.7:  
-                    validated_objects.append({
-                        'name': str(obj.name),  # Ensure name is string
-                        'confidence': float(obj.score),
-                        'area': float(obj.bounding_poly.normalized_vertices[2].x * obj.bounding_poly.normalized_vertices[2].y)
-                    })
+                    validated_objects.append(DetectedObject(
+                        name=str(obj.name),
+                        confidence=float(obj.score),
+                        area=float(obj.bounding_poly.normalized_vertices[2].x * obj.bounding_poly.normalized_vertices[2].y)
+                    ))
             
             # Sort objects by area and confidence
-            validated_objects.sort(key=lambda x: (x['area'], x['confidence']), reverse=True)
+            validated_objects.sort(key=lambda x: (x.area, x.confidence), reverse=True)
             
-            # Convert all values to basic Python types
-            result = {
-                "labels": [{'description': str(label.description), 'confidence': float(label.score)} 
-                          for label in response.label_annotations if label.score >= 0.7],
-                "objects": validated_objects,
-                "confidence": float(response.label_annotations[0].score) if response.label_annotations else 0.0
-            }
+            # Build the result with native Python types
+            result = GoogleVisionResult(
+                labels=[Label(description=str(label.description), confidence=float(label.score))
+                        for label in response.label_annotations if label.score >= 0.7],
+                objects=validated_objects,
+                confidence=float(response.label_annotations[0].score) if response.label_annotations else 0.0
+            )
             
-            return convert_numpy_floats(result), True
+            return result, True
         except Exception as e:
             logger.error(f"Google Vision API error: {str(e)}")
             return None, False
     
-    async def analyze_frame_openai(self, frame_path: Path, google_analysis: Optional[dict] = None) -> Tuple[Optional[dict], bool]:
+    async def analyze_frame_openai(self, frame_path: Path, google_analysis: Optional[dict] = None) -> Tuple[Optional[FrameDescription], bool]:
         """
         Analyze a frame using OpenAI Vision API.
         Provides detailed scene understanding.
@@ -141,55 +237,69 @@ class VisionAnalyzer:
             with open(frame_path, "rb") as image_file:
                 base64_image = base64.b64encode(image_file.read()).decode('utf-8')
             
-            # Convert google_analysis to ensure it's JSON serializable
-            if google_analysis:
-                google_analysis = convert_numpy_floats(google_analysis)
-            
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {"type": "text", "text": self._build_openai_prompt(google_analysis)},
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/jpeg;base64,{base64_image}",
-                                },
+            budget = PromptBudget("vision")
+            messages = [
+                {
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": self._build_openai_prompt(google_analysis, budget)},
+                        {
+                            "type": "image_url",
+                            "image_url": {
+                                "url": f"data:image/jpeg;base64,{base64_image}",
                             },
-                        ],
-                    }
-                ],
-                max_tokens=300,
+                        },
+                    ],
+                }
+            ]
+            budget.report(messages)
+            
+            def request():
+                return self.openai_client.chat.completions.create(
+                    model="gpt-4o",
+                    messages=messages,
+                    max_tokens=300,
+                    timeout=self.call_timeout,
+                )
+            
+            # Hedge once the call passes the observed P90 latency
+            hedge_after = _openai_latency.percentile(0.9) if self.hedging else None
+            
+            start = time.monotonic()
+            response = await hedged_request(
+                request,
+                hedge=request if self.hedging else None,
+                hedge_after=hedge_after,
+                timeout=self.call_timeout,
+                metric_prefix="vision"
             )
+            latency = time.monotonic() - start
+            _openai_latency.record(latency)
+            metrics.observe("vision.openai_latency", latency)
             
-            return {"detailed_description": response.choices[0].message.content}, True
+            return FrameDescription(detailed_description=response.choices[0].message.content), True
+        except (asyncio.TimeoutError, APITimeoutError):
+            # Timeouts are the slow tail; leaving them out would bias the hedge delay low
+            _openai_latency.record(self.call_timeout)
+            logger.error(f"OpenAI Vision API timed out after {self.call_timeout:.1f}s")
+            return None, False
         except Exception as e:
             logger.error(f"OpenAI Vision API error: {str(e)}")
             return None, False
     
-    def _build_openai_prompt(self, google_analysis: Optional[dict] = None) -> str:
-        """Build prompt for OpenAI Vision API analysis."""
-        prompt = f"""Analyze this frame in detail, considering both the visual content and the following context:
-
-Video Title: {self.metadata.get('title', 'Unknown')}
-Description: {self.metadata.get('description', 'No description available')}
-
-Previous computer vision analysis detected:"""
+    def _build_openai_prompt(self, google_analysis: Optional[dict] = None, budget: Optional[PromptBudget] = None) -> str:
+        """
+        Build prompt for OpenAI Vision API analysis.
         
-        if google_analysis:
-            if google_analysis.get("labels"):
-                prompt += "\nKey elements detected (with confidence):"
-                for label in google_analysis["labels"]:
-                    prompt += f"\n- {label['description']} ({label['confidence']:.2f})"
-            
-            if google_analysis.get("objects"):
-                prompt += "\n\nObjects detected (with confidence and relative size):"
-                for obj in google_analysis["objects"]:
-                    prompt += f"\n- {obj['name']} (confidence: {obj['confidence']:.2f}, area: {obj['area']:.2f})"
+        Fixed instructions come first so every frame shares the same prompt
+        prefix; the compacted video context and detections follow.
         
-        prompt += """
+        Args:
+            google_analysis: Aggregated Google Vision labels and objects
+            budget: Optional budget that records the tokens saved by compaction
+        """
+        budget = budget or PromptBudget("vision")
+        prompt = """Analyze this frame in detail, considering both the visual content and the video context given below.
 
 Please provide a comprehensive analysis that:
 1. Describes the main focus or subject of this frame in relation to the video's context
@@ -201,6 +311,35 @@ Please provide a comprehensive analysis that:
 
 Keep the analysis natural and focused on how this frame relates to the video's context."""
         
+        title = budget.truncate(self.metadata.get('title'), PROMPT_TITLE_TOKENS) or 'Unknown'
+        description = budget.truncate(self.metadata.get('description'), PROMPT_DESCRIPTION_TOKENS) or 'No description available'
+        prompt += f"""
+
+Video Title: {title}
+Description: {description}
+
+Previous computer vision analysis detected:"""
+        
+        if google_analysis:
+            objects = budget.dedupe(google_analysis.get("objects") or [], key=lambda obj: obj.name)
+            objects = budget.limit(objects, PROMPT_MAX_OBJECTS, key=lambda obj: obj.name)
+            labels = budget.dedupe(
+                google_analysis.get("labels") or [],
+                key=lambda label: label.description,
+                exclude=[obj.name for obj in objects]
+            )
+            labels = budget.limit(labels, PROMPT_MAX_LABELS, key=lambda label: label.description)
+            
+            if labels:
+                prompt += "\nKey elements detected (with confidence):"
+                for label in labels:
+                    prompt += f"\n- {label.description} ({label.confidence:.2f})"
+            
+            if objects:
+                prompt += "\n\nObjects detected (with confidence and relative size):"
+                for obj in objects:
+                    prompt += f"\n- {obj.name} (confidence: {obj.confidence:.2f}, area: {obj.area:.2f})"
+        
         return prompt
     
     async def analyze_video(self, scene_changes: List[Path], motion_scores: List[Tuple[Path, float]], video_duration: float) -> dict:
@@ -208,92 +347,99 @@ Keep the analysis natural and focused on how this frame relates to the video's c
         Main analysis workflow with optimized API usage.
         """
         try:
+            deadline = time.monotonic() + self.job_budget
+            
             # Convert all inputs to ensure consistent types
             scene_changes = [Path(p) if isinstance(p, str) else p for p in scene_changes]
             motion_scores = [(Path(p) if isinstance(p, str) else p, float(s)) for p, s in motion_scores]
             video_duration = float(video_duration)
             
-            final_results = {
-                "metadata": self.metadata,
-                "frames": []
-            }
+            analysis = VideoAnalysis(metadata=self.metadata)
             
             # Select key frames for analysis
             key_frames = self.select_key_frames(scene_changes, motion_scores, max_frames=12)
+            key_frames = self.select_diverse_frames(key_frames, max_frames=12)
             logger.info(f"Selected {len(key_frames)} key frames for analysis")
             
             # Analyze all selected frames with Google Vision
-            google_vision_results = []
             for frame_path in key_frames:
-                frame_result = {
-                    "frame": frame_path.name,
-                    "timestamp": float(frame_path.name.split('_')[1].replace('s.jpg', '')),
-                    "path": str(frame_path)
-                }
+                if time.monotonic() >= deadline:
+                    logger.warning(f"Vision budget of {self.job_budget:.0f}s exhausted during Google Vision analysis")
+                    metrics.increment("vision.budget_exhausted")
+                    break
                 
                 # Google Vision Analysis for all frames
                 google_analysis, success = await self.analyze_frame_google_vision(frame_path)
                 if success:
-                    frame_result["google_vision"] = google_analysis
-                    google_vision_results.append(frame_result)
-                    final_results["frames"].append(frame_result)
+                    analysis.frames.append(FrameAnalysis(
+                        frame=frame_path.name,
+                        timestamp=self._frame_timestamp(frame_path),
+                        path=str(frame_path),
+                        google_vision=google_analysis
+                    ))
             
-            # Aggregate all Google Vision results using string keys
+            # Aggregate all Google Vision results keyed by name
             unique_labels = {}
             unique_objects = {}
             
-            for result in google_vision_results:
-                if "google_vision" in result:
-                    # Process labels
-                    for label in result["google_vision"].get("labels", []):
-                        desc = str(label['description'])
-                        if desc not in unique_labels or label['confidence'] > unique_labels[desc]['confidence']:
-                            unique_labels[desc] = label
-                    
-                    # Process objects
-                    for obj in result["google_vision"].get("objects", []):
-                        name = str(obj['name'])
-                        if name not in unique_objects or obj['confidence'] > unique_objects[name]['confidence']:
-                            unique_objects[name] = obj
+            for frame in analysis.frames:
+                # Process labels
+                for label in frame.google_vision.labels:
+                    if label.description not in unique_labels or label.confidence > unique_labels[label.description].confidence:
+                        unique_labels[label.description] = label
+                
+                # Process objects
+                for obj in frame.google_vision.objects:
+                    if obj.name not in unique_objects or obj.confidence > unique_objects[obj.name].confidence:
+                        unique_objects[obj.name] = obj
             
             # Convert back to lists and sort
-            all_labels = sorted(unique_labels.values(), key=lambda x: x['confidence'], reverse=True)
-            all_objects = sorted(unique_objects.values(), key=lambda x: x['confidence'], reverse=True)
+            all_labels = sorted(unique_labels.values(), key=lambda x: x.confidence, reverse=True)
+            all_objects = sorted(unique_objects.values(), key=lambda x: x.confidence, reverse=True)
             
-            # Select frames for OpenAI analysis
-            openai_frames = sorted(google_vision_results, 
-                                 key=lambda x: x["google_vision"].get("confidence", 0),
-                                 reverse=True)[:3]
+            # Select frames for OpenAI analysis; frames are already one per visual cluster
+            openai_frames = sorted(analysis.frames,
+                                 key=lambda x: x.google_vision.confidence,
+                                 reverse=True)[:self.max_descriptions]
+            metrics.increment("vision.openai_calls", len(openai_frames))
             
-            # OpenAI Vision Analysis for selected frames
-            for frame_data in openai_frames:
-                frame_path = self.frames_dir / frame_data["frame"]
-                
+            # OpenAI Vision Analysis for selected frames, run concurrently within the budget
+            async def describe(frame: FrameAnalysis):
                 # Pass aggregated Google Vision results to OpenAI
                 openai_analysis, success = await self.analyze_frame_openai(
-                    frame_path,
+                    self.frames_dir / frame.frame,
                     {
                         "labels": all_labels,
                         "objects": all_objects,
-                        "current_frame_objects": frame_data["google_vision"].get("objects", []),
-                        "current_frame_labels": frame_data["google_vision"].get("labels", [])
+                        "current_frame_objects": frame.google_vision.objects,
+                        "current_frame_labels": frame.google_vision.labels
                     }
                 )
-                
                 if success:
-                    # Add OpenAI analysis to the frame
-                    for frame in final_results["frames"]:
-                        if frame["frame"] == frame_data["frame"]:
-                            frame["openai_vision"] = openai_analysis
-                            break
+                    frame.openai_vision = openai_analysis
+            
+            remaining = deadline - time.monotonic()
+            if openai_frames and remaining > 0:
+                tasks = [asyncio.ensure_future(describe(frame)) for frame in openai_frames]
+                _, pending = await asyncio.wait(tasks, timeout=remaining)
+                if pending:
+                    logger.warning(f"Vision budget of {self.job_budget:.0f}s exhausted, "
+                                   f"returning without {len(pending)} pending description(s)")
+                    metrics.increment("vision.budget_exhausted")
+                    for task in pending:
+                        task.cancel()
+            elif openai_frames:
+                logger.warning("Vision budget exhausted before OpenAI analysis")
+                metrics.increment("vision.budget_exhausted")
             
-            # Save results
+            # Serialize once: the same dictionary is saved and returned
+            final_results = analysis.to_dict()
             analysis_file = self.output_dir / "final_analysis.json"
-            with open(analysis_file, 'w', encoding='utf-8') as f:
-                json.dump(convert_numpy_floats(final_results), f, indent=2, ensure_ascii=False)
+            analysis_models.save(final_results, analysis_file)
             
             logger.info(f"Analysis complete. Results saved to {analysis_file}")
-            return convert_numpy_floats(final_results)
+            metrics.log_snapshot("vision.")
+            return final_results
             
         except Exception as e:
             logger.error(f"Error in analyze_video: {str(e)}")
@@ -305,7 +451,8 @@ async def execute_step(
     metadata: dict,
     scene_changes: List[Path],
     motion_scores: List[Tuple[Path, float]],
-    video_duration: float
+    video_duration: float,
+    frame_manifest: Optional[List[FrameRecord]] = None
 ) -> dict:
     """
     Execute frame analysis step.
@@ -317,6 +464,8 @@ async def execute_step(
         scene_changes: List of frames where scene changes were detected
         motion_scores: List of tuples containing (frame path, motion score)
         video_duration: Duration of the video in seconds
+        frame_manifest: Frame records from Step 2; loaded from frame_manifest.json
+            in the output directory when not given
         
     Returns:
         Dictionary containing analysis results
@@ -326,16 +475,20 @@ async def execute_step(
     # Convert all inputs to ensure consistent types
     frames_dir = Path(frames_dir)
     output_dir = Path(output_dir)
-    metadata = convert_numpy_floats(metadata)
     scene_changes = [Path(p) if isinstance(p, str) else p for p in scene_changes]
     motion_scores = [(Path(p) if isinstance(p, str) else p, float(s)) for p, s in motion_scores]
     video_duration = float(video_duration)
+    if frame_manifest is None:
+        frame_manifest = analysis_models.load_frame_manifest(output_dir / "frame_manifest.json")
     
     # Initialize analyzer with metadata
-    analyzer = VisionAnalyzer(frames_dir, output_dir, metadata)
+    analyzer = VisionAnalyzer(frames_dir, output_dir, metadata, frame_manifest=frame_manifest)
     
     # Analyze video with provided parameters
-    results = await analyzer.analyze_video(scene_changes, motion_scores, video_duration)
+    try:
+        results = await analyzer.analyze_video(scene_changes, motion_scores, video_duration)
+    finally:
+        await analyzer.openai_client.close()
     
     logger.debug(f"Analyzed {len(results['frames'])} frames")
-    return results 
\ No newline at end of file
+    return results
\ No newline at end of file
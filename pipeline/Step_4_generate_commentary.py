@@ -5,17 +5,27 @@ Generates styled commentary based on frame analysis and content type
 import json
 import logging
 import os
-import re
 import random
 from enum import Enum
 from pathlib import Path
-from typing import Dict, Optional, Tuple, List
+from typing import AsyncIterator, Dict, Optional, Tuple, List, Union
 
 from openai import OpenAI
-from .prompts import PromptManager, LLMProvider, COMMENTARY_STYLES, SPEECH_PATTERNS
+from . import artifacts, metrics, speech_timing
+from .prompts import LLMProvider, COMMENTARY_STYLES, SPEECH_PATTERNS
+from .llm_router import LLMRouter
+from .text_segmentation import SentenceSegmenter
+from .prompt_budget import PromptBudget
+from .text_normalization import add_speech_markup, clean_for_speech, clean_response, normalize_for_audio
 
 logger = logging.getLogger(__name__)
 
+# Token budgets for the variable parts of the commentary prompt
+TITLE_TOKENS = int(os.getenv('PROMPT_TITLE_TOKENS', '40'))
+DESCRIPTION_TOKENS = int(os.getenv('PROMPT_DESCRIPTION_TOKENS', '200'))
+VIDEO_TEXT_TOKENS = int(os.getenv('PROMPT_VIDEO_TEXT_TOKENS', '150'))
+SCENE_DESCRIPTION_TOKENS = int(os.getenv('PROMPT_SCENE_DESCRIPTION_TOKENS', '120'))
+
 class ContentType(Enum):
     """Available content types for commentary."""
     NEWS = "news"
@@ -26,23 +36,40 @@ class ContentType(Enum):
 class CommentaryGenerator:
     """Generates video commentary using OpenAI."""
     
-    def __init__(self, content_type: ContentType):
+    def __init__(self, content_type: ContentType, use_cache: bool = True, llm: str = LLMProvider.OPENAI.value):
         """
         Initialize commentary generator.
         
         Args:
             content_type: Type of content for commentary generation
+            use_cache: Reuse cached commentary for identical prompts (False for fresh variations)
+            llm: Preferred LLM provider ('openai' or 'deepseek'); others are used for failover
         """
         self.content_type = content_type
-        self.prompt_manager = PromptManager()
+        self.use_cache = use_cache
+        self.router = LLMRouter(preferred=LLMProvider(llm))
+
+    @staticmethod
+    def _providers_for(language: str) -> Optional[List[LLMProvider]]:
+        """Providers that can write commentary in a language (None for any)."""
+        return [LLMProvider.OPENAI] if language == 'ur' else None
         
     def _build_system_prompt(self) -> str:
         """Build system prompt based on content type."""
         style = COMMENTARY_STYLES[self.content_type.value]
         return style["system_prompt"]
 
-    def _build_prompt(self, analysis: Dict) -> str:
-        """Build the prompt for commentary generation."""
+    def _build_prompt(self, analysis: Dict, budget: Optional[PromptBudget] = None) -> str:
+        """
+        Build the prompt for commentary generation.
+        
+        Args:
+            analysis: Analysis results from Step 3
+            budget: Optional budget that records the tokens saved by compaction
+            
+        Returns:
+            User prompt with fixed instructions first and compacted video content last
+        """
         # Get video metadata
         video_text = analysis['metadata'].get('text', '')
         video_title = analysis['metadata'].get('title', '')
@@ -109,37 +136,43 @@ class CommentaryGenerator:
             ]
             vision_insights['labels'].sort(key=lambda x: x['confidence'], reverse=True)
         
-        # Build content text with enhanced analysis
+        # Compact the variable content to its token budgets
+        budget = budget or PromptBudget("commentary")
+        objects = budget.dedupe(vision_insights['objects'][:5], key=lambda obj: obj['name'])  # Top 5 most confident/frequent objects
+        labels = budget.dedupe(
+            vision_insights['labels'],
+            key=lambda label: label['description'],
+            exclude=[obj['name'] for obj in objects]
+        )[:8]
+        descriptions = budget.dedupe(vision_insights['descriptions'], key=lambda desc: desc)[:2]  # Top 2 most detailed descriptions
+        
         content_text = "VIDEO CONTENT:\n"
         if video_title:
-            content_text += f"Title: {video_title}\n"
+            content_text += f"Title: {budget.truncate(video_title, TITLE_TOKENS)}\n"
         if video_description:
-            content_text += f"Description: {video_description}\n"
+            content_text += f"Description: {budget.truncate(video_description, DESCRIPTION_TOKENS)}\n"
         if video_text:
-            content_text += f"Text: {video_text}\n"
+            content_text += f"Text: {budget.truncate(video_text, VIDEO_TEXT_TOKENS)}\n"
             
         content_text += "\nVISUAL ANALYSIS:\n"
         
-        if vision_insights['objects']:
+        if objects:
             content_text += "\nMain subjects detected (with confidence and frequency):\n"
-            for obj in vision_insights['objects'][:5]:  # Focus on top 5 most confident/frequent objects
+            for obj in objects:
                 content_text += f"- {obj['name']} (confidence: {obj['confidence']:.2f}, seen {obj['frequency']} times)\n"
         
-        if vision_insights['labels']:
-            content_text += "\nKey visual elements (with confidence):\n"
-            for label in vision_insights['labels'][:8]:  # Include more relevant labels
-                content_text += f"- {label['description']} ({label['confidence']:.2f})\n"
+        if labels:
+            content_text += "\nKey visual elements: " + ", ".join(label['description'] for label in labels) + "\n"
         
-        if vision_insights['descriptions']:
+        if descriptions:
             content_text += "\nDetailed scene descriptions:\n"
-            for desc in vision_insights['descriptions'][:2]:  # Include top 2 most detailed descriptions
-                content_text += f"- {desc}\n"
+            for desc in descriptions:
+                content_text += f"- {budget.truncate(desc, SCENE_DESCRIPTION_TOKENS)}\n"
         
         selected_language = analysis['metadata'].get('language', 'en')
         
-        base_prompt = f"""Generate a VERY SHORT {selected_language.upper()} commentary (1-2 lines maximum) for this video in {self.content_type.value} style.
-
-{content_text}
+        # Fixed instructions come first so every video in this style and language shares the prompt prefix
+        base_prompt = f"""Generate a VERY SHORT {selected_language.upper()} commentary (1-2 lines maximum) for the video below in {self.content_type.value} style.
 
 STRICT REQUIREMENTS:
 1. MUST be 1-2 lines only - no exceptions
@@ -155,32 +188,34 @@ STRICT REQUIREMENTS:
             base_prompt += """
 9. Use proper Urdu script and punctuation (۔، ؟)"""
 
-        return base_prompt
+        return f"{base_prompt}\n\n{content_text}"
 
     def _process_response(self, text: str, language: str) -> str:
         """Process and clean the generated commentary."""
-        # Remove stars, markdown formatting and other special characters
-        text = re.sub(r'[*_#`]', '', text)  # Remove markdown formatting
-        text = re.sub(r'^\s*[*-]\s*', '', text, flags=re.MULTILINE)  # Remove list markers
-        text = ''.join(char for char in text if char.isprintable() or char.isspace())
-        
-        # Add appropriate pauses and formatting based on language
-        if language == 'ur':
-            text = text.replace('۔', '۔<break time="1s"/>')
-            text = text.replace('،', '،<break time="0.5s"/>')
-        else:
-            text = text.replace('. ', '... ')
-            text = text.replace('! ', '... ')
-            text = text.replace('? ', '... ')
+        # Remove markdown and list markers, then add language-specific pauses
+        return clean_response(text, language)
+
+    async def generate_commentary(
+        self,
+        analysis: Union[Dict, Path],
+        output_file: Optional[Path] = None,
+        max_seconds: Optional[float] = None
+    ) -> Optional[Dict]:
+        """
+        Generate commentary from analysis results.
         
-        return text.strip()
-
-    async def generate_commentary(self, analysis_file: Path, output_file: Path) -> Optional[Dict]:
-        """Generate commentary from analysis results."""
+        Args:
+            analysis: Analysis results from Step 3, or the path of a saved analysis JSON
+            output_file: Optional path to save the commentary JSON (written in the background)
+            max_seconds: Optional hard speech-length limit to state in the prompt
+            
+        Returns:
+            Commentary dictionary, or None on failure
+        """
         try:
-            # Load analysis
-            with open(analysis_file, encoding='utf-8') as f:
-                analysis = json.load(f)
+            if not isinstance(analysis, dict):
+                with open(analysis, encoding='utf-8') as f:
+                    analysis = json.load(f)
 
             # Log the video text from metadata
             video_text = analysis['metadata'].get('text', '')
@@ -188,8 +223,15 @@ STRICT REQUIREMENTS:
             logger.info(video_text if video_text else "No text found in metadata")
             
             # Build messages for the API call
+            budget = PromptBudget("commentary")
             system_prompt = self._build_system_prompt()
-            user_prompt = self._build_prompt(analysis)
+            user_prompt = self._build_prompt(analysis, budget)
+            language = analysis['metadata'].get('language', 'en')
+            if max_seconds:
+                user_prompt += (
+                    f"\n\nLENGTH LIMIT: The narration must be speakable within {max_seconds:.0f} seconds, "
+                    f"at most {speech_timing.max_words(max_seconds, language)} words."
+                )
             
             # Log prompts
             logger.info("\n=== SYSTEM PROMPT ===")
@@ -201,15 +243,17 @@ STRICT REQUIREMENTS:
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}
             ]
+            budget.report(messages)
             
             try:
-                # Generate commentary using the prompt manager
+                # Generate commentary through the provider router
                 logger.info("\n=== GENERATING COMMENTARY ===")
-                commentary_text = self.prompt_manager.generate_response(
+                commentary_text = await self.router.agenerate_response(
                     messages=messages,
-                    model="gpt-4o-mini",
+                    allowed=self._providers_for(language),
                     temperature=0.7,
-                    max_tokens=500
+                    max_tokens=500,
+                    use_cache=self.use_cache
                 )
                 
                 logger.info("\n=== RAW GENERATED COMMENTARY ===")
@@ -220,7 +264,6 @@ STRICT REQUIREMENTS:
                     return None
 
                 # Process the generated text
-                language = analysis['metadata'].get('language', 'en')
                 processed_text = self._process_response(commentary_text, language)
                 
                 logger.info("\n=== PROCESSED COMMENTARY ===")
@@ -234,13 +277,8 @@ STRICT REQUIREMENTS:
                     "language": language
                 }
 
-                # Log final output
-                logger.info("\n=== FINAL COMMENTARY OBJECT ===")
-                logger.info(json.dumps(commentary, indent=2, ensure_ascii=False))
-
-                # Save commentary
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(commentary, f, indent=2, ensure_ascii=False)
+                if output_file:
+                    artifacts.save_later(commentary, output_file)
 
                 return commentary
 
@@ -252,6 +290,92 @@ STRICT REQUIREMENTS:
             logger.error(f"Error generating commentary: {str(e)}")
             return None
 
+    async def stream_commentary(self, analysis: Dict, output_file: Optional[Path] = None) -> AsyncIterator[str]:
+        """
+        Stream commentary as audio-ready sentences while the LLM is still generating.
+        
+        The commentary that was actually yielded is saved to output_file in the
+        background once the stream ends, so it matches the narration even when the
+        speech budget stopped the stream early.
+        
+        Args:
+            analysis: Analysis results from Step 3
+            output_file: Optional path for the commentary JSON
+            
+        Yields:
+            Audio-ready sentences in order
+        """
+        language = analysis['metadata'].get('language', 'en')
+        budget = PromptBudget("commentary")
+        messages = [
+            {"role": "system", "content": self._build_system_prompt()},
+            {"role": "user", "content": self._build_prompt(analysis, budget)}
+        ]
+        budget.report(messages)
+        
+        logger.info("\n=== STREAMING COMMENTARY ===")
+        segmenter = SentenceSegmenter()
+        parts = []
+        # Processed sentences and audio scripts that were actually yielded
+        spoken_text = []
+        spoken_scripts = []
+        
+        async def sentences() -> AsyncIterator[str]:
+            async for delta in self.router.astream_response(
+                messages=messages,
+                allowed=self._providers_for(language),
+                temperature=0.7,
+                max_tokens=500,
+                use_cache=self.use_cache
+            ):
+                parts.append(delta)
+                for sentence in segmenter.feed(delta):
+                    yield sentence
+            remainder = segmenter.flush()
+            if remainder:
+                yield remainder
+        
+        # Stop once the narration would outrun the video; already-synthesized sentences cannot be re-planned
+        max_seconds = speech_timing.max_speech_seconds(analysis['metadata'])
+        spoken = 0.0
+        stream = sentences()
+        try:
+            async for sentence in stream:
+                processed = self._process_response(sentence, language)
+                script = process_for_audio(processed, language)
+                if not script:
+                    continue
+                if max_seconds:
+                    duration = speech_timing.estimate_speech_duration(script, language)
+                    if spoken + duration > max_seconds:
+                        logger.warning(f"Commentary exceeds {max_seconds:.1f}s of speech, stopping after {spoken:.1f}s")
+                        metrics.increment("commentary.fit_trimmed")
+                        if not spoken:
+                            script = speech_timing.truncate_words(script, language, max_seconds)
+                            spoken_text.append(speech_timing.truncate_words(processed, language, max_seconds))
+                            spoken_scripts.append(script)
+                            yield script
+                        break
+                    spoken += duration
+                spoken_text.append(processed)
+                spoken_scripts.append(script)
+                yield script
+        finally:
+            await stream.aclose()
+        
+        if not ''.join(parts):
+            raise ValueError("Empty response from API")
+        
+        commentary = {
+            "style": self.content_type.value,
+            "commentary": ' '.join(spoken_text),
+            "audio_script": ' '.join(spoken_scripts),
+            "metadata": analysis['metadata'],
+            "language": language
+        }
+        if output_file:
+            artifacts.save_later(commentary, output_file)
+
     def _analyze_scene_sequence(self, frames: List[Dict]) -> Dict:
         """
         Analyze the sequence of scenes to identify narrative patterns.
@@ -317,21 +441,14 @@ STRICT REQUIREMENTS:
         Returns:
             Estimated duration in seconds
         """
-        # Words per minute rates for different languages
-        WPM_RATES = {
-            'en': 150,  # English: ~150 words per minute
-            'ur': 120   # Urdu: ~120 words per minute (slower due to formal speech)
-        }
-        
-        words = len(text.split())
-        rate = WPM_RATES.get(language, 150)
-        return (words / rate) * 60  # Convert from minutes to seconds
+        return speech_timing.estimate_speech_duration(text, language)
 
-    def _build_narration_prompt(self, analysis: Dict, sequence: Dict) -> str:
+    def _build_narration_prompt(self, analysis: Dict, sequence: Dict, budget: Optional[PromptBudget] = None) -> str:
         """Build a prompt specifically for generating narration-friendly commentary."""
+        budget = budget or PromptBudget("commentary")
         video_duration = float(analysis['metadata'].get('duration', 0))
-        video_title = analysis['metadata'].get('title', '')
-        video_description = analysis['metadata'].get('description', '')
+        video_title = budget.truncate(analysis['metadata'].get('title', ''), TITLE_TOKENS)
+        video_description = budget.truncate(analysis['metadata'].get('description', ''), DESCRIPTION_TOKENS)
         selected_language = analysis['metadata'].get('language', 'en')
         
         # Target shorter duration to ensure final audio fits
@@ -341,17 +458,8 @@ STRICT REQUIREMENTS:
         words_per_minute = 120 if selected_language == 'ur' else 150
         target_words = int((target_duration / 60) * words_per_minute)
         
-        prompt = f"""Create engaging commentary for this specific video content:
-
-CONTENT TO NARRATE:
-Title: {video_title}
-Description: {video_description}
-
-STRICT DURATION CONSTRAINTS:
-- Video Duration: {video_duration:.1f} seconds
-- Target Duration: {target_duration:.1f} seconds
-- Maximum Words: {target_words} words
-- DO NOT EXCEED these limits!
+        # Fixed guidelines first so the prompt prefix is shared across videos; video specifics go last
+        prompt = """Create engaging commentary for the video content described at the end.
 
 KEY REQUIREMENTS:
 1. Keep commentary SHORTER than video duration
@@ -446,6 +554,18 @@ URDU NARRATION REQUIREMENTS:
    - Conclusion: "یوں یہ منظر..."
 """
 
+        prompt += f"""
+
+CONTENT TO NARRATE:
+Title: {video_title}
+Description: {video_description}
+
+STRICT DURATION CONSTRAINTS:
+- Video Duration: {video_duration:.1f} seconds
+- Target Duration: {target_duration:.1f} seconds
+- Maximum Words: {target_words} words
+- DO NOT EXCEED these limits!"""
+
         return prompt
     
     def _validate_urdu_text(self, text: str) -> bool:
@@ -625,8 +745,7 @@ URDU NARRATION REQUIREMENTS:
         text = commentary['commentary']
         
         # Remove emojis and special characters
-        text = re.sub(r'[^\w\s,.!?;:()\-\'\"]+', '', text)  # Keep only basic punctuation
-        text = re.sub(r'\s+', ' ', text)  # Normalize whitespace
+        text = clean_for_speech(text)
         
         # Get content-specific speech patterns
         content_config = SPEECH_PATTERNS[self.content_type.value]
@@ -670,24 +789,8 @@ URDU NARRATION REQUIREMENTS:
         # Join sentences with appropriate pauses
         text = '. '.join(enhanced_sentences)
         
-        # Add final formatting and pauses
-        text = re.sub(r'([,;])\s', r'\1 <break time="0.2s"/> ', text)  # Short pauses
-        text = re.sub(r'([.!?])\s', r'\1 <break time="0.4s"/> ', text)  # Medium pauses
-        text = re.sub(r'\.\.\.\s', '... <break time="0.3s"/> ', text)  # Thoughtful pauses
-        
-        # Add natural variations in pace
-        text = re.sub(r'(!)\s', r'\1 <break time="0.2s"/> ', text)  # Quick pauses after excitement
-        text = re.sub(r'(\?)\s', r'\1 <break time="0.3s"/> ', text)  # Questioning pauses
-        
-        # Add occasional emphasis for important words
-        for emphasis in content_config['emphasis']:
-            text = re.sub(f'\\b{emphasis}\\b', f'<emphasis level="strong">{emphasis}</emphasis>', text)
-        
-        # Clean up any duplicate breaks or spaces
-        text = re.sub(r'\s*<break[^>]+>\s*<break[^>]+>\s*', ' <break time="0.4s"/> ', text)
-        text = re.sub(r'\s+', ' ', text)
-        
-        return text.strip()
+        # Add pauses, emphasis for important words and clean up duplicate breaks
+        return add_speech_markup(text, content_config['emphasis'])
 
 def process_for_audio(commentary: str, language: str = 'en') -> str:
     """
@@ -698,56 +801,77 @@ def process_for_audio(commentary: str, language: str = 'en') -> str:
         language: Language of the text ('en' or 'ur')
     """
     try:
-        # Remove any non-printable characters first
-        script = ''.join(char for char in commentary if char.isprintable() or char.isspace())
-        
-        if language == 'ur':
-            # For Urdu text, keep Urdu characters and basic punctuation
-            # Keep Urdu Unicode ranges and Urdu punctuation
-            allowed_chars = re.compile(r'[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF\s۔،؟!]')
-            script = ''.join(c for c in script if allowed_chars.match(c))
-            
-            # Add SSML pauses for Urdu punctuation
-            script = script.replace('۔', '۔<break time="1s"/>')
-            script = script.replace('،', '،<break time="0.5s"/>')
-            script = script.replace('؟', '؟<break time="0.8s"/>')
-            
-        else:  # English
-            # For English text, keep only ASCII characters and basic punctuation
-            script = re.sub(r'[*_#`~]', '', script)  # Remove markdown symbols
-            script = re.sub(r'[^\x00-\x7F]+', '', script)  # Remove non-ASCII
-            script = re.sub(r'[^\w\s.,!?;:()\-\'\"]+', ' ', script)  # Keep basic punctuation
-            
-            # Add pauses for English punctuation
-            script = script.replace('. ', '... ').replace('! ', '... ').replace('? ', '... ')
-        
-        # Normalize whitespace for both languages
-        script = re.sub(r'\s+', ' ', script)
-        
-        return script.strip()
+        return normalize_for_audio(commentary, language)
         
     except Exception as e:
         logger.error(f"Error processing text for audio: {str(e)}")
         return commentary.strip()
 
-async def execute_step(frames_info: dict, output_dir: Path, content_type: str) -> str:
-    """Generate commentary based on video analysis and content type."""
-    analysis_file = output_dir / "final_analysis.json"
+async def fit_to_video(generator: CommentaryGenerator, analysis: Dict, commentary: Dict) -> Dict:
+    """
+    Make sure the audio script can be spoken within the video before it is synthesized.
+    
+    Overlong scripts are trimmed locally at sentence boundaries. The LLM is only
+    asked again, with an explicit length limit, when not even the first sentence fits.
+    
+    Args:
+        generator: Generator that produced the commentary
+        analysis: Analysis results from Step 3
+        commentary: Commentary with its 'audio_script'
+        
+    Returns:
+        Commentary whose 'audio_script' fits the video
+    """
+    max_seconds = speech_timing.max_speech_seconds(analysis['metadata'])
+    language = commentary.get('language', 'en')
+    script = commentary['audio_script']
+    estimate = speech_timing.estimate_speech_duration(script, language)
+    metrics.observe("commentary.estimated_speech_seconds", estimate)
+    if not max_seconds or estimate <= max_seconds:
+        return commentary
+    
+    logger.warning(f"Audio script needs ~{estimate:.1f}s of speech but the video allows {max_seconds:.1f}s")
+    fitted = speech_timing.trim_to_duration(script, language, max_seconds)
+    if fitted:
+        metrics.increment("commentary.fit_trimmed")
+    else:
+        # Last resort: one shorter regeneration, cut at the last fitting word if still too long
+        metrics.increment("commentary.fit_regenerated")
+        retry = await generator.generate_commentary(analysis, max_seconds=max_seconds)
+        if retry:
+            commentary = retry
+            script = process_for_audio(retry['commentary'], language)
+        fitted = (speech_timing.trim_to_duration(script, language, max_seconds)
+                  or speech_timing.truncate_words(script, language, max_seconds))
+    
+    commentary['audio_script'] = fitted
+    logger.info(f"Fitted audio script to ~{speech_timing.estimate_speech_duration(fitted, language):.1f}s of speech")
+    return commentary
+
+async def execute_step(frames_info: dict, output_dir: Path, content_type: str, use_cache: bool = True, llm: str = 'openai') -> Dict:
+    """
+    Generate commentary based on video analysis and content type.
+    
+    Args:
+        frames_info: Analysis results from Step 3
+        output_dir: Directory for commentary files
+        content_type: Commentary style
+        use_cache: Reuse cached commentary for identical prompts (False for fresh variations)
+        llm: Preferred LLM provider from the user's settings
+        
+    Returns:
+        Commentary dictionary for Step 5, including the processed 'audio_script'
+    """
     commentary_file = output_dir / f"commentary_{content_type}.json"
     
     try:
         logger.info("\n=== STARTING COMMENTARY GENERATION ===")
         logger.info(f"Content Type: {content_type}")
-        logger.info(f"Analysis File: {analysis_file}")
-        
-        # Save analysis
-        with open(analysis_file, 'w', encoding='utf-8') as f:
-            json.dump(frames_info, f, indent=2)
         
-        # Generate commentary
+        # Generate commentary from the in-memory analysis
         content = ContentType[content_type.upper()]
-        generator = CommentaryGenerator(content)
-        commentary = await generator.generate_commentary(analysis_file, commentary_file)
+        generator = CommentaryGenerator(content, use_cache=use_cache, llm=llm)
+        commentary = await generator.generate_commentary(frames_info)
         
         if not commentary:
             raise ValueError("Failed to generate commentary")
@@ -757,15 +881,42 @@ async def execute_step(frames_info: dict, output_dir: Path, content_type: str) -
         logger.info("\n=== PROCESSING FOR AUDIO ===")
         logger.info(f"Language: {language}")
         
-        audio_script = process_for_audio(commentary['commentary'], language)
+        commentary['audio_script'] = process_for_audio(commentary['commentary'], language)
+        commentary = await fit_to_video(generator, frames_info, commentary)
         logger.info("\n=== FINAL AUDIO SCRIPT ===")
-        logger.info(audio_script)
+        logger.info(commentary['audio_script'])
         
-        # Save result
-        with open(commentary_file, 'w', encoding='utf-8') as f:
-            json.dump(commentary, f, indent=2)
+        # Save result once, off the critical path
+        artifacts.save_later(commentary, commentary_file)
         
-        return audio_script
+        return commentary
     except Exception as e:
         logger.error(f"Error generating commentary: {str(e)}")
         raise
+
+async def stream_step(frames_info: dict, output_dir: Path, content_type: str, use_cache: bool = True, llm: str = 'openai') -> AsyncIterator[str]:
+    """
+    Generate commentary as a stream of audio-ready sentences for Step 5.
+    
+    Args:
+        frames_info: Analysis results from Step 3
+        output_dir: Directory for commentary files
+        content_type: Commentary style
+        use_cache: Reuse cached commentary for identical prompts (False for fresh variations)
+        llm: Preferred LLM provider from the user's settings
+        
+    Yields:
+        Audio-ready sentences in order
+    """
+    commentary_file = output_dir / f"commentary_{content_type}.json"
+    
+    try:
+        logger.info("\n=== STARTING STREAMING COMMENTARY GENERATION ===")
+        logger.info(f"Content Type: {content_type}")
+        
+        generator = CommentaryGenerator(ContentType[content_type.upper()], use_cache=use_cache, llm=llm)
+        async for sentence in generator.stream_commentary(frames_info, commentary_file):
+            yield sentence
+    except Exception as e:
+        logger.error(f"Error streaming commentary: {str(e)}")
+        raise
@@ -4,15 +4,45 @@ Generates audio from commentary using Google Cloud TTS
 """
 
 import os
+import time
+import asyncio
 import logging
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import AsyncIterator, BinaryIO, Optional, Dict, List, Tuple, Union
 from google.cloud import texttospeech
 import json
 import re
+import shutil
+
+from . import metrics
+from .audio_fit import ENCODER_ARGS, audio_duration, fit_audio
+from .mp3_assembly import join_mp3
+from .speech_timing import split_script
+from .wav_assembly import assemble_wav
+from .tts_backends import get_backend
+from .tts_cache import make_key, tts_cache
+from .voice_catalog import voice_catalog
 
 logger = logging.getLogger(__name__)
 
+# Google TTS rejects inputs (text or SSML) larger than this
+MAX_INPUT_BYTES = 5000
+
+# Target chunk size for parallel synthesis; smaller chunks start audio sooner and spread across requests
+CHUNK_BYTES = int(os.getenv('TTS_CHUNK_BYTES', '1500'))
+
+# Output encoding (TTS_AUDIO_ENCODING): compressed MP3 by default, which Cloudinary overlays
+# directly and is about a tenth of the PCM size; LINEAR16 keeps PCM WAV for local processing
+AUDIO_EXTENSIONS = {'MP3': 'mp3', 'OGG_OPUS': 'ogg', 'LINEAR16': 'wav'}
+SAMPLE_RATE = int(os.getenv('TTS_SAMPLE_RATE', '24000'))
+
+# Preferred voices, validated against the voice catalog before use
+ENGLISH_VOICE = os.getenv('TTS_ENGLISH_VOICE', 'en-US-Neural2-F')
+URDU_VOICE = os.getenv('TTS_URDU_VOICE') or None
+
+# Words and whole SSML tags, so long sentences are never split inside a tag
+_WORD_OR_TAG = re.compile(r'<[^>]+>|[^\s<]+')
+
 class AudioGenerator:
     """Handles audio generation using Google Cloud Text-to-Speech."""
     
@@ -27,18 +57,16 @@ class AudioGenerator:
         self.client = texttospeech.TextToSpeechClient()
         
     def list_english_voices(self) -> List[Dict]:
-        """List all available English voices."""
-        voices = self.client.list_voices().voices
-        english_voices = []
-        for voice in voices:
-            if any(language_code.startswith('en-') for language_code in voice.language_codes):
-                english_voices.append({
-                    'name': voice.name,
-                    'language_codes': voice.language_codes,
-                    'ssml_gender': texttospeech.SsmlVoiceGender(voice.ssml_gender).name,
-                    'natural_sample_rate_hertz': voice.natural_sample_rate_hertz
-                })
-        return english_voices
+        """List all available English voices from the cached voice catalog."""
+        return [
+            {
+                'name': voice.name,
+                'language_codes': list(voice.language_codes),
+                'ssml_gender': voice.ssml_gender,
+                'natural_sample_rate_hertz': voice.natural_sample_rate_hertz
+            }
+            for voice in voice_catalog.voices('en')
+        ]
         
     async def generate_audio(self, text: str, output_path: Path, target_duration: float, is_urdu: bool = False) -> Optional[Path]:
         """
@@ -99,6 +127,9 @@ class AudioGenerator:
             # Write the audio content to file
             with open(output_path, "wb") as out:
                 out.write(response.audio_content)
+            
+            # Time-stretch locally if the narration overruns the target
+            await fit_audio(output_path, target_duration)
                 
             logger.info(f"Successfully generated audio file: {output_path}")
             return output_path
@@ -107,45 +138,162 @@ class AudioGenerator:
             logger.error(f"Error generating audio: {str(e)}")
             return None
 
-def generate_urdu_audio(text: str, output_path: str) -> bool:
-    """Generate audio for Urdu text using appropriate SSML and voice settings."""
-    try:
-        client = texttospeech.TextToSpeechClient()
-        
-        # Clean the text and wrap in proper SSML
-        clean_text = text.replace('<prosody rate="medium" pitch="medium">', '')
-        clean_text = clean_text.replace('</prosody>', '')
-        clean_text = clean_text.replace('<lang xml:lang="ur-PK">', '')
-        clean_text = clean_text.replace('</lang>', '')
-        
-        ssml_text = f"""
+def _voice_params(language_code: str, name: Optional[str], gender: str) -> texttospeech.VoiceSelectionParams:
+    """Build voice selection params, validated against the voice catalog when it is available."""
+    resolved = voice_catalog.resolve(language_code, name, gender) if get_backend().uses_voice_catalog else None
+    if resolved is not None:
+        name, language_code = resolved
+    params = {'language_code': language_code, 'ssml_gender': texttospeech.SsmlVoiceGender[gender]}
+    if name:
+        params['name'] = name
+    return texttospeech.VoiceSelectionParams(**params)
+
+def _build_urdu_request(text: str, encoding: str = 'LINEAR16', speaking_rate: float = 1.0) -> Tuple:
+    """Build synthesis input, voice and audio config for Urdu text."""
+    # Clean the text and wrap in proper SSML
+    clean_text = text.replace('<prosody rate="medium" pitch="medium">', '')
+    clean_text = clean_text.replace('</prosody>', '')
+    clean_text = clean_text.replace('<lang xml:lang="ur-PK">', '')
+    clean_text = clean_text.replace('</lang>', '')
+    
+    ssml_text = f"""
         <speak>
             <prosody rate="1.2" pitch="+2st">
                 {clean_text}
             </prosody>
         </speak>
         """
+    
+    synthesis_input = texttospeech.SynthesisInput(ssml=ssml_text)
+    
+    voice = _voice_params("ur-PK", URDU_VOICE, 'FEMALE')
+    
+    audio_config = texttospeech.AudioConfig(
+        audio_encoding=texttospeech.AudioEncoding[encoding],
+        sample_rate_hertz=SAMPLE_RATE,
+        speaking_rate=speaking_rate,
+        effects_profile_id=["headphone-class-device"]
+    )
+    return synthesis_input, voice, audio_config
+
+def _build_english_request(text: str, encoding: str = 'LINEAR16', speaking_rate: float = 1.0) -> Tuple:
+    """Build synthesis input, voice and audio config for English text."""
+    # Clean text of any SSML tags
+    clean_text = text.replace('<prosody rate="medium" pitch="medium">', '')
+    clean_text = clean_text.replace('</prosody>', '')
+    clean_text = clean_text.replace('<lang xml:lang="en-US">', '')
+    clean_text = clean_text.replace('</lang>', '')
+    clean_text = clean_text.replace('<break time="0.3s"/>', '')
+    clean_text = clean_text.replace('<break time="1s"/>', '')
+    
+    synthesis_input = texttospeech.SynthesisInput(text=clean_text)
+    
+    voice = _voice_params("en-US", ENGLISH_VOICE, 'FEMALE')  # a neural voice for better quality
+    
+    audio_config = texttospeech.AudioConfig(
+        audio_encoding=texttospeech.AudioEncoding[encoding],
+        sample_rate_hertz=SAMPLE_RATE,
+        speaking_rate=speaking_rate,
+        pitch=0.0,
+        effects_profile_id=["headphone-class-device"]
+    )
+    return synthesis_input, voice, audio_config
+
+def _cache_key(synthesis_input, voice, audio_config) -> str:
+    """Build the TTS cache key for a synthesis request."""
+    return make_key(
+        text=synthesis_input.ssml or synthesis_input.text,
+        voice_name=voice.name or f"{voice.language_code}-{voice.ssml_gender}",
+        language_code=voice.language_code,
+        audio_config={
+            'audio_encoding': int(audio_config.audio_encoding),
+            'speaking_rate': audio_config.speaking_rate,
+            'pitch': audio_config.pitch,
+            'sample_rate_hertz': audio_config.sample_rate_hertz,
+            'effects_profile_id': list(audio_config.effects_profile_id)
+        }
+    )
+
+def _input_bytes(synthesis_input) -> int:
+    return len((synthesis_input.ssml or synthesis_input.text).encode('utf-8'))
+
+def split_for_synthesis(text: str, language: str = 'en', chunk_bytes: int = CHUNK_BYTES) -> List[str]:
+    """
+    Split a script into chunks at sentence boundaries for separate synthesis requests.
+    
+    Chunks stay under chunk_bytes where possible and always under the API's
+    input limit once wrapped in the language's SSML; a sentence longer than
+    that is split between words.
+    
+    Args:
+        text: Script to split
+        language: Language code ('en' or 'ur')
+        chunk_bytes: Target chunk size in UTF-8 bytes
         
-        synthesis_input = texttospeech.SynthesisInput(ssml=ssml_text)
-        
-        voice = texttospeech.VoiceSelectionParams(
-            language_code="ur-PK",
-            ssml_gender=texttospeech.SsmlVoiceGender.FEMALE
-        )
-        
-        audio_config = texttospeech.AudioConfig(
-            audio_encoding=texttospeech.AudioEncoding.LINEAR16,
-            effects_profile_id=["headphone-class-device"]
-        )
+    Returns:
+        Chunks in playback order
+    """
+    builder = _build_urdu_request if language == 'ur' else _build_english_request
+    overhead = _input_bytes(builder('')[0])
+    limit = max(1, min(chunk_bytes, MAX_INPUT_BYTES - overhead))
+    
+    pieces: List[str] = []
+    for sentence in split_script(text):
+        if len(sentence.encode('utf-8')) <= limit:
+            pieces.append(sentence)
+            continue
+        words: List[str] = []
+        for word in _WORD_OR_TAG.findall(sentence):
+            if words and len(' '.join(words + [word]).encode('utf-8')) > limit:
+                pieces.append(' '.join(words))
+                words = []
+            words.append(word)
+        if words:
+            pieces.append(' '.join(words))
+    
+    chunks: List[str] = []
+    for piece in pieces:
+        if chunks and len(f"{chunks[-1]} {piece}".encode('utf-8')) <= limit:
+            chunks[-1] = f"{chunks[-1]} {piece}"
+        else:
+            chunks.append(piece)
+    return chunks
+
+def synthesize_speech(text: str, language: str = 'en') -> bytes:
+    """
+    Synthesize text with the voice settings for its language.
+    
+    Identical requests are served from the on-disk TTS cache.
+    
+    Args:
+        text: Text to synthesize
+        language: Language code ('en' or 'ur')
         
-        response = client.synthesize_speech(
-            input=synthesis_input,
-            voice=voice,
-            audio_config=audio_config
-        )
+    Returns:
+        WAV (LINEAR16) audio content
+    """
+    backend = get_backend()
+    builder = _build_urdu_request if language == 'ur' else _build_english_request
+    synthesis_input, voice, audio_config = builder(text)
+    
+    key = _cache_key(synthesis_input, voice, audio_config) if backend.cacheable else None
+    cached = tts_cache.get(key) if key else None
+    if cached is not None:
+        logger.info("Using cached audio for identical synthesis request")
+        return cached
+    
+    audio_content = backend.synthesize(synthesis_input, voice, audio_config)
+    if key:
+        tts_cache.put(key, audio_content)
+    return audio_content
+
+def generate_urdu_audio(text: str, output_path: str) -> bool:
+    """Generate audio for Urdu text using appropriate SSML and voice settings."""
+    try:
+        audio_content = synthesize_speech(text, 'ur')
         
         with open(output_path, "wb") as out:
-            out.write(response.audio_content)
+            out.write(audio_content)
             
         return True
         
@@ -156,38 +304,10 @@ def generate_urdu_audio(text: str, output_path: str) -> bool:
 def generate_english_audio(text: str, output_path: str) -> bool:
     """Generate audio for English text using appropriate voice settings."""
     try:
-        client = texttospeech.TextToSpeechClient()
-        
-        # Clean text of any SSML tags
-        clean_text = text.replace('<prosody rate="medium" pitch="medium">', '')
-        clean_text = clean_text.replace('</prosody>', '')
-        clean_text = clean_text.replace('<lang xml:lang="en-US">', '')
-        clean_text = clean_text.replace('</lang>', '')
-        clean_text = clean_text.replace('<break time="0.3s"/>', '')
-        clean_text = clean_text.replace('<break time="1s"/>', '')
-        
-        synthesis_input = texttospeech.SynthesisInput(text=clean_text)
-        
-        voice = texttospeech.VoiceSelectionParams(
-            language_code="en-US",
-            name="en-US-Neural2-F"  # Using a specific neural voice for better quality
-        )
-        
-        audio_config = texttospeech.AudioConfig(
-            audio_encoding=texttospeech.AudioEncoding.LINEAR16,
-            speaking_rate=1.0,
-            pitch=0.0,
-            effects_profile_id=["headphone-class-device"]
-        )
-        
-        response = client.synthesize_speech(
-            input=synthesis_input,
-            voice=voice,
-            audio_config=audio_config
-        )
+        audio_content = synthesize_speech(text, 'en')
         
         with open(output_path, "wb") as out:
-            out.write(response.audio_content)
+            out.write(audio_content)
             
         return True
         
@@ -195,43 +315,284 @@ def generate_english_audio(text: str, output_path: str) -> bool:
         logger.error(f"Error generating English audio: {str(e)}")
         return False
 
-async def execute_step(frames_info: dict, output_dir: Path, style: str = None) -> str:
+def join_wav_segments(segments: List[bytes], output: Union[Path, BinaryIO]) -> None:
+    """
+    Concatenate WAV segments with identical formats into one WAV file.
+    
+    Args:
+        segments: WAV file contents in playback order
+        output: Path or binary file object for the combined file
+    """
+    if hasattr(output, 'write'):
+        output.write(assemble_wav(segments))
+    else:
+        assemble_wav(segments, output=Path(output))
+
+_warned_encodings = set()
+
+def output_encoding() -> str:
+    """
+    Get the configured TTS output encoding (TTS_AUDIO_ENCODING, default MP3).
+    
+    OGG_OPUS falls back to MP3 when ffmpeg is not installed, since multi-chunk
+    Opus audio is assembled from PCM and encoded with ffmpeg. Backends that
+    cannot produce compressed audio (the local stand-in) fall back to LINEAR16.
+    """
+    encoding = os.getenv('TTS_AUDIO_ENCODING', 'MP3').upper()
+    if not get_backend().supports('MP3'):
+        fallback = 'LINEAR16'
+    elif encoding not in AUDIO_EXTENSIONS:
+        fallback = 'MP3'
+    elif encoding == 'OGG_OPUS' and shutil.which('ffmpeg') is None:
+        fallback = 'MP3'
+    else:
+        return encoding
+    if fallback == encoding:
+        return encoding
+    if encoding not in _warned_encodings:
+        logger.warning(f"TTS_AUDIO_ENCODING={encoding} is not usable here, using {fallback}")
+        _warned_encodings.add(encoding)
+    return fallback
+
+def _segment_encoding(encoding: str, segment_count: Optional[int] = None) -> str:
+    """Encoding to request per segment: MP3 frames and PCM join directly, Opus streams do not."""
+    if encoding == 'OGG_OPUS' and segment_count != 1:
+        return 'LINEAR16'
+    return encoding
+
+async def _transcode(wav: bytes, encoding: str) -> bytes:
+    """Encode WAV audio with ffmpeg."""
+    process = await asyncio.create_subprocess_exec(
+        'ffmpeg', '-loglevel', 'error', '-i', 'pipe:0', *ENCODER_ARGS[encoding], 'pipe:1',
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    stdout, stderr = await process.communicate(wav)
+    if process.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed to encode {encoding}: {stderr.decode(errors='replace').strip()}")
+    return stdout
+
+async def join_audio_segments(segments: List[bytes], encoding: str, segment_encoding: str) -> bytes:
+    """
+    Join synthesized segments in order into one file in the output encoding.
+    
+    Args:
+        segments: Segment audio contents in playback order
+        encoding: Output encoding
+        segment_encoding: Encoding the segments were synthesized in
+        
+    Returns:
+        Audio content
+    """
+    if len(segments) == 1 and segment_encoding == encoding:
+        return segments[0]
+    if segment_encoding == 'MP3':
+        audio = bytes(join_mp3(segments))  # Frames only; per-segment tags and Xing headers would skew durations
+    else:
+        audio = assemble_wav(segments)
+    if segment_encoding != encoding:
+        audio = await _transcode(audio, encoding)
+    return audio
+
+async def synthesize_speech_async(text: str, language: str = 'en', encoding: str = 'LINEAR16', speaking_rate: float = 1.0) -> bytes:
+    """
+    Synthesize a script with the async client, chunked at sentence boundaries.
+    
+    Chunks are synthesized concurrently (at most TTS_CONCURRENCY at once,
+    default 4) and joined in order. Each chunk is looked up in the TTS cache first.
+    
+    Args:
+        text: Script to synthesize
+        language: Language code ('en' or 'ur')
+        encoding: Output encoding ('LINEAR16', 'MP3' or 'OGG_OPUS')
+        speaking_rate: Speaking-rate multiplier (1.0 is the voice's normal rate)
+        
+    Returns:
+        Audio content in the requested encoding
+    """
+    backend = get_backend()
+    if backend.uses_voice_catalog and not voice_catalog.ready():
+        await asyncio.to_thread(voice_catalog.load)
+    builder = _build_urdu_request if language == 'ur' else _build_english_request
+    chunks = split_for_synthesis(text, language)
+    if not chunks:
+        raise ValueError("No text to synthesize")
+    segment_encoding = _segment_encoding(encoding, len(chunks))
+    semaphore = asyncio.Semaphore(int(os.getenv('TTS_CONCURRENCY', '4')))
+    
+    async def synthesize_chunk(chunk: str) -> bytes:
+        synthesis_input, voice, audio_config = builder(chunk, segment_encoding, speaking_rate)
+        key = _cache_key(synthesis_input, voice, audio_config) if backend.cacheable else None
+        cached = await asyncio.to_thread(tts_cache.get, key) if key else None
+        if cached is not None:
+            return cached
+        async with semaphore:
+            audio_content = await backend.asynthesize(synthesis_input, voice, audio_config)
+        if key:
+            await asyncio.to_thread(tts_cache.put, key, audio_content)
+        return audio_content
+    
+    tasks = [asyncio.create_task(synthesize_chunk(chunk)) for chunk in chunks]
+    try:
+        segments = await asyncio.gather(*tasks)
+    except Exception:
+        for task in tasks:
+            task.cancel()
+        raise
+    
+    metrics.increment("tts.chunks", len(segments))
+    return await join_audio_segments(segments, encoding, segment_encoding)
+
+async def report_audio_size(audio_file: Path, encoding: str) -> int:
+    """
+    Record the audio file size and the upload bytes saved against PCM WAV.
+    
+    Args:
+        audio_file: Generated audio file
+        encoding: Its encoding
+        
+    Returns:
+        Bytes saved (0 for PCM or when the duration cannot be read)
+    """
+    size = audio_file.stat().st_size
+    metrics.observe("tts.audio_bytes", size)
+    if encoding == 'LINEAR16':
+        return 0
+    duration = await audio_duration(audio_file)
+    if duration is None:
+        return 0
+    pcm_size = 44 + int(duration * SAMPLE_RATE) * 2  # mono 16-bit WAV
+    saved = max(0, pcm_size - size)
+    metrics.increment("tts.upload_bytes_saved", saved)
+    logger.info(f"{encoding} audio is {size / 1024:.0f} KB, ~{saved / 1024:.0f} KB smaller than PCM WAV to upload")
+    return saved
+
+def _video_duration(metadata: Optional[dict]) -> Optional[float]:
+    """Get the video duration from metadata, if known."""
+    try:
+        return float((metadata or {}).get('duration') or 0) or None
+    except (TypeError, ValueError):
+        return None
+
+async def execute_step(commentary: dict, output_dir: Path, style: str = None, target_duration: Optional[float] = None) -> str:
     """
     Generate audio from commentary text.
     
+    Narration that overruns the video is fitted locally (see audio_fit).
+    
     Args:
-        frames_info: Dictionary containing frame analysis and commentary
+        commentary: Commentary dictionary returned by Step 4
         output_dir: Directory to save output files
         style: Commentary style (optional)
+        target_duration: Duration to fit in seconds (defaults to the video duration in the metadata)
         
     Returns:
         Path to generated audio file
     """
     try:
-        # Load commentary
-        style = style or frames_info['metadata'].get('style', 'documentary')
-        commentary_file = output_dir / f"commentary_{style}.json"
-        with open(commentary_file, encoding='utf-8') as f:
-            commentary = json.load(f)
-        
-        # Get text and language
-        text = commentary['commentary']
+        style = style or commentary.get('style') or commentary['metadata'].get('style', 'documentary')
+        
+        # Fall back to the saved commentary when given analysis results instead
+        if 'commentary' not in commentary:
+            commentary_file = output_dir / f"commentary_{style}.json"
+            with open(commentary_file, encoding='utf-8') as f:
+                commentary = json.load(f)
+        
+        # Get text and language, preferring the audio script fitted to the video in Step 4
+        text = commentary.get('audio_script') or commentary['commentary']
         language = commentary.get('language', 'en')
         
         logger.info(f"Generating audio for text: {text[:100]}...")
         
         # Generate audio file path
-        audio_file = output_dir / f"commentary_{style}.wav"
+        encoding = output_encoding()
+        audio_file = output_dir / f"commentary_{style}.{AUDIO_EXTENSIONS[encoding]}"
         
-        # Generate audio based on language
-        success = generate_urdu_audio(text, str(audio_file)) if language == 'ur' else generate_english_audio(text, str(audio_file))
+        # Synthesize sentence chunks concurrently without blocking the event loop
+        audio_content = await synthesize_speech_async(text, language, encoding)
+        await asyncio.to_thread(audio_file.write_bytes, audio_content)
         
-        if success:
-            logger.info(f"Successfully generated audio file: {audio_file}")
-            return str(audio_file)
-        else:
-            raise Exception("Failed to generate audio")
+        async def resynthesize(speaking_rate: float) -> None:
+            content = await synthesize_speech_async(text, language, encoding, speaking_rate)
+            await asyncio.to_thread(audio_file.write_bytes, content)
+        
+        await fit_audio(audio_file, target_duration or _video_duration(commentary.get('metadata')), resynthesize)
+        await report_audio_size(audio_file, encoding)
+        
+        logger.info(f"Successfully generated audio file: {audio_file}")
+        return str(audio_file)
             
     except Exception as e:
         logger.error(f"Error in audio generation: {str(e)}")
-        raise 
\ No newline at end of file
+        raise 
+
+async def execute_streaming_step(
+    sentences: AsyncIterator[str],
+    output_dir: Path,
+    style: str,
+    language: str = 'en',
+    target_duration: Optional[float] = None
+) -> str:
+    """
+    Synthesize streamed commentary sentence by sentence.
+    
+    Each sentence is sent to TTS as soon as it arrives, so synthesis overlaps
+    with commentary generation. Segments are joined in order at the end.
+    
+    Args:
+        sentences: Audio-ready sentences from Step 4
+        output_dir: Directory to save output files
+        style: Commentary style
+        language: Language code ('en' or 'ur')
+        target_duration: Optional duration in seconds to fit the narration to
+        
+    Returns:
+        Path to generated audio file
+    """
+    start = time.monotonic()
+    encoding = output_encoding()
+    segment_encoding = _segment_encoding(encoding)
+    semaphore = asyncio.Semaphore(int(os.getenv('TTS_STREAM_CONCURRENCY', '4')))
+    tasks: List[asyncio.Task] = []
+    texts: List[str] = []
+    
+    async def synthesize(index: int, text: str) -> bytes:
+        async with semaphore:
+            audio_content = await synthesize_speech_async(text, language, segment_encoding)
+        if index == 0:
+            first_audio = time.monotonic() - start
+            metrics.observe("tts.time_to_first_audio", first_audio)
+            logger.info(f"First audio segment ready after {first_audio:.2f}s")
+        return audio_content
+    
+    try:
+        async for sentence in sentences:
+            logger.info(f"Synthesizing sentence {len(tasks) + 1}: {sentence[:60]}...")
+            texts.append(sentence)
+            tasks.append(asyncio.create_task(synthesize(len(tasks), sentence)))
+        
+        if not tasks:
+            raise ValueError("No commentary to synthesize")
+        
+        segments = await asyncio.gather(*tasks)
+        
+        audio_file = output_dir / f"commentary_{style}.{AUDIO_EXTENSIONS[encoding]}"
+        audio_content = await join_audio_segments(segments, encoding, segment_encoding)
+        await asyncio.to_thread(audio_file.write_bytes, audio_content)
+        
+        async def resynthesize(speaking_rate: float) -> None:
+            content = await synthesize_speech_async(' '.join(texts), language, encoding, speaking_rate)
+            await asyncio.to_thread(audio_file.write_bytes, content)
+        
+        await fit_audio(audio_file, target_duration, resynthesize)
+        await report_audio_size(audio_file, encoding)
+        metrics.increment("tts.streamed_segments", len(segments))
+        logger.info(f"Successfully generated audio file from {len(segments)} segments: {audio_file}")
+        return str(audio_file)
+        
+    except Exception as e:
+        for task in tasks:
+            task.cancel()
+        logger.error(f"Error in streaming audio generation: {str(e)}")
+        raise
@@ -1,22 +1,263 @@
 """
 Step 6: Video generation module
-Combines video and audio using Cloudinary for professional video processing
+Combines video and audio using Cloudinary for professional video processing,
+or locally with ffmpeg when VIDEO_COMPOSITOR=local
 """
 
+import asyncio
+import hashlib
 import os
 import logging
-import re
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional, Dict
 import cloudinary
 import cloudinary.uploader
 import cloudinary.api
 from cloudinary import CloudinaryVideo
+from cloudinary.exceptions import NotFound
 import requests
 import aiohttp
 
+from . import local_compositor, metrics
+from .local_compositor import find_logo, logo_settings
+
 logger = logging.getLogger(__name__)
 
+COMPOSITORS = ('cloudinary', 'local')
+
+# Files above this size go through the chunked upload_large API
+LARGE_UPLOAD_BYTES = int(float(os.getenv('CLOUDINARY_LARGE_UPLOAD_MB', '20')) * 1024 * 1024)
+UPLOAD_CHUNK_SIZE = 6000000  # 6MB chunks
+UPLOAD_WORKERS = int(os.getenv('CLOUDINARY_UPLOAD_WORKERS', '8'))
+
+# Every process (bot, Streamlit server, replica) tags the assets it uses with its
+# own reference tag; an asset is deleted only once no reference tag remains
+REF_TAG_PREFIX = 'ref_'
+PROCESS_TAG = f"{REF_TAG_PREFIX}{uuid.uuid4().hex[:16]}"
+
+def compositor() -> str:
+    """
+    Get the configured compositing engine.
+
+    Returns:
+        VIDEO_COMPOSITOR: 'cloudinary' (default) renders remotely from uploads,
+        'local' renders with ffmpeg on this machine
+    """
+    name = os.getenv('VIDEO_COMPOSITOR', 'cloudinary').lower()
+    if name not in COMPOSITORS:
+        logger.warning(f"Unknown video compositor {name}, using cloudinary")
+        return 'cloudinary'
+    return name
+
+def file_digest(file_path: str) -> str:
+    """Get the hex SHA-256 digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+@dataclass(slots=True)
+class _Asset:
+    """An uploaded asset shared by the jobs of this process."""
+    resource_type: str
+    upload: Future
+    refs: int = 0
+
+# Uploads and deletions run on a process-wide pool rather than an event loop's
+# executor: Streamlit runs each session on its own short-lived loop, and an
+# upload must be cleaned up even if the loop that started it is gone.
+_executor = ThreadPoolExecutor(max_workers=UPLOAD_WORKERS, thread_name_prefix='cloudinary')
+_assets_lock = threading.Lock()
+# Assets by public_id; each is deleted when its last in-process user releases it
+_assets: Dict[str, _Asset] = {}
+# Deletions in progress by public_id
+_deletions: Dict[str, Future] = {}
+
+def _upload(file_path: str, public_id: str, resource_type: str) -> Optional[Dict]:
+    """
+    Make sure a file is on Cloudinary under its content-hash public_id (blocking).
+    
+    An existing resource is reused once this process's reference tag is on it,
+    so the processes that uploaded it will not delete it while it is in use;
+    otherwise the file is uploaded with the tag, chunked through upload_large
+    when large.
+    
+    Returns:
+        Resource details or upload response, None on failure
+    """
+    try:
+        tagged = cloudinary.uploader.add_tag(PROCESS_TAG, [public_id], resource_type=resource_type)
+        if public_id in tagged.get('public_ids', []):
+            # Confirm it was not deleted before the tag landed
+            resource = cloudinary.api.resource(public_id, resource_type=resource_type)
+            logger.info(f"{resource_type.capitalize()} already uploaded, skipping upload. Public ID: {public_id}")
+            metrics.increment("cloudinary.upload_dedup_remote")
+            return resource
+    except NotFound:
+        pass
+    except Exception as e:
+        logger.warning(f"Could not reference existing resource {public_id}, uploading: {str(e)}")
+    
+    try:
+        size = os.path.getsize(file_path)
+        large = size > LARGE_UPLOAD_BYTES
+        logger.info(f"Uploading {resource_type}: {file_path} ({size / 1024 / 1024:.1f} MB{', chunked' if large else ''})")
+        
+        # Optimize upload settings
+        options = dict(
+            resource_type=resource_type,
+            public_id=public_id,
+            overwrite=False,  # Same public_id means same bytes
+            chunk_size=UPLOAD_CHUNK_SIZE,
+            eager_async=True,  # Async transformations
+            eager=[  # Pre-generate common transformations
+                {"quality": "auto:good"},
+                {"fetch_format": "auto"}
+            ],
+            unique_filename=False,
+            tags=[PROCESS_TAG]
+        )
+        upload = cloudinary.uploader.upload_large if large else cloudinary.uploader.upload
+        
+        started = time.perf_counter()
+        response = upload(file_path, **options)
+        elapsed = time.perf_counter() - started
+        if response.get('existing'):
+            # Another process uploaded it meanwhile; upload options are not applied to existing assets
+            cloudinary.uploader.add_tag(PROCESS_TAG, [public_id], resource_type=resource_type)
+        
+        throughput = size / elapsed / 1024 / 1024 if elapsed > 0 else 0.0
+        metrics.observe("cloudinary.upload_seconds", elapsed)
+        metrics.observe("cloudinary.upload_mb_per_second", throughput)
+        metrics.increment("cloudinary.upload_bytes", size)
+        logger.info(f"Upload successful in {elapsed:.1f}s ({throughput:.2f} MB/s). Public ID: {response['public_id']}")
+        return response
+    except Exception as e:
+        logger.error(f"Error uploading media: {str(e)}")
+        return None
+
+def _destroy(public_id: str, asset: _Asset) -> None:
+    """
+    Drop this process's reference tag from a released asset once its upload has
+    finished, and delete the asset if no other process references it (blocking).
+    
+    A process that dies without releasing leaves its tag behind, which keeps
+    the asset rather than risk deleting one in use.
+    """
+    try:
+        if asset.upload.result() is None:
+            return
+        cloudinary.uploader.remove_tag(PROCESS_TAG, [public_id], resource_type=asset.resource_type)
+        tags = cloudinary.api.resource(public_id, resource_type=asset.resource_type).get('tags', [])
+        holders = [tag for tag in tags if tag.startswith(REF_TAG_PREFIX)]
+        # Not atomic: a process tagging it between this check and the delete (one
+        # API round trip) still loses it
+        if holders:
+            logger.info(f"Keeping resource {public_id}, still used by {len(holders)} other process(es)")
+            return
+        cloudinary.uploader.destroy(public_id, resource_type=asset.resource_type)
+        logger.info(f"Cleaned up resource: {public_id}")
+    except NotFound:
+        pass
+    except Exception as e:
+        logger.warning(f"Error cleaning up resource {public_id}: {str(e)}")
+
+def _release(public_id: str) -> Optional[Future]:
+    """
+    Drop one in-process reference to an asset without blocking.
+    
+    When it was the last one, the asset is deleted in a worker thread once its
+    upload has finished (right away if it already has), so cleanup never
+    depends on an event loop and never blocks one.
+    
+    Returns:
+        Future of the deletion, or None if the asset is still in use
+    """
+    with _assets_lock:
+        asset = _assets.get(public_id)
+        if asset is None:
+            return None
+        asset.refs -= 1
+        if asset.refs > 0:
+            return None
+        del _assets[public_id]
+        deletion = _deletions[public_id] = Future()
+    
+    def run():
+        try:
+            _destroy(public_id, asset)
+        finally:
+            with _assets_lock:
+                if _deletions.get(public_id) is deletion:
+                    del _deletions[public_id]
+            deletion.set_result(None)
+    
+    # The callback may run on the calling thread if the upload is already done, so it only schedules
+    asset.upload.add_done_callback(lambda _: _executor.submit(run))
+    return deletion
+
+async def acquire_asset(file_path: str, resource_type: str) -> Optional[Dict]:
+    """
+    Get a Cloudinary asset for a file, uploading it only if needed.
+    
+    Assets are keyed on a hash of the file contents, so re-processing a video
+    reuses its upload and jobs with the same filename cannot overwrite each
+    other. Concurrent requests for the same content, from any thread or event
+    loop, share one upload. Every successful call takes a reference that must
+    be returned with release_asset.
+    
+    Args:
+        file_path: Path to the media file
+        resource_type: Cloudinary resource type
+        
+    Returns:
+        Resource details or upload response, None on failure
+    """
+    public_id = (await asyncio.to_thread(file_digest, file_path))[:32]
+    
+    while True:
+        with _assets_lock:
+            # Let a deletion of the same content finish first, or it could remove the new upload
+            deletion = _deletions.get(public_id)
+            if deletion is None:
+                asset = _assets.get(public_id)
+                if asset is None:
+                    asset = _assets[public_id] = _Asset(
+                        resource_type, _executor.submit(_upload, file_path, public_id, resource_type)
+                    )
+                else:
+                    logger.info(f"Reusing {resource_type} in use by another job. Public ID: {public_id}")
+                    metrics.increment("cloudinary.upload_dedup_local")
+                asset.refs += 1
+                break
+        await asyncio.wrap_future(deletion)
+    
+    try:
+        response = await asyncio.shield(asyncio.wrap_future(asset.upload))
+    except BaseException:
+        _release(public_id)
+        raise
+    if response is None:
+        _release(public_id)
+    return response
+
+async def release_asset(public_id: str) -> None:
+    """
+    Return a reference taken by acquire_asset.
+    
+    The asset is deleted once no job in this process uses it anymore and no
+    other process holds a reference tag on it.
+    """
+    deletion = _release(public_id)
+    if deletion is not None:
+        await asyncio.wrap_future(deletion)
+
 class VideoGenerator:
     """Handles video generation and audio overlay using Cloudinary."""
     
@@ -47,30 +288,11 @@ class VideoGenerator:
             cache_duration=3600  # 1 hour cache
         )
         
-    def _sanitize_filename(self, filename: str) -> str:
-        """
-        Sanitize filename for Cloudinary public ID.
-        
-        Args:
-            filename: Original filename
-            
-        Returns:
-            Sanitized filename suitable for Cloudinary
-        """
-        # Remove file extension
-        filename = os.path.splitext(filename)[0]
-        # Remove emojis and special characters
-        filename = re.sub(r'[^\w\s-]', '', filename)
-        # Replace spaces with underscores
-        filename = re.sub(r'[-\s]+', '_', filename)
-        # Ensure it's not empty
-        if not filename:
-            filename = 'video'
-        return filename.strip('_')
-        
     async def upload_media(self, file_path: str, resource_type: str) -> Optional[Dict]:
         """
-        Upload media file to Cloudinary with optimized settings.
+        Upload media file to Cloudinary, reusing an identical existing upload.
+        
+        The asset is released when this generator's resources are cleaned up.
         
         Args:
             file_path: Path to the media file
@@ -80,33 +302,13 @@ class VideoGenerator:
             Upload response if successful, None otherwise
         """
         try:
-            # Sanitize the filename for the public_id
-            public_id = self._sanitize_filename(os.path.basename(file_path))
-            logger.info(f"Uploading {resource_type}: {file_path}")
-            
-            # Optimize upload settings
-            response = cloudinary.uploader.upload(
-                file_path,
-                resource_type=resource_type,
-                public_id=public_id,
-                overwrite=True,
-                chunk_size=6000000,  # 6MB chunks
-                eager_async=True,  # Async transformations
-                eager=[  # Pre-generate common transformations
-                    {"quality": "auto:good"},
-                    {"fetch_format": "auto"}
-                ],
-                use_filename=True,
-                unique_filename=False,
-                invalidate=True
-            )
-            
-            logger.info(f"Upload successful. Public ID: {response['public_id']}")
-            self.uploaded_resources.append(response['public_id'])
-            return response
+            response = await acquire_asset(file_path, resource_type)
         except Exception as e:
             logger.error(f"Error uploading media: {str(e)}")
             return None
+        if response:
+            self.uploaded_resources.append(response['public_id'])
+        return response
             
     async def upload_logo(self, logo_path: Path, style_name: str) -> Optional[str]:
         """Upload logo and cache its public_id."""
@@ -120,7 +322,8 @@ class VideoGenerator:
             logger.info(f"Uploading new logo for style {style_name}: {logo_path}")
             
             # Upload logo with specific settings
-            logo_response = cloudinary.uploader.upload(
+            logo_response = await asyncio.to_thread(
+                cloudinary.uploader.upload,
                 str(logo_path),
                 resource_type="image",
                 public_id=f"logo_{style_key}",
@@ -148,15 +351,9 @@ class VideoGenerator:
             return None
             
     async def cleanup_resources(self):
-        """Clean up temporary resources but preserve logos."""
+        """Release uploaded media; assets still used by other jobs are kept. Logos are never released."""
         for resource_id in self.uploaded_resources:
-            try:
-                # Don't cleanup logo resources
-                if not any(resource_id == logo_id for logo_id in self.uploaded_logos.values()):
-                    cloudinary.uploader.destroy(resource_id)
-                    logger.info(f"Cleaned up resource: {resource_id}")
-            except Exception as e:
-                logger.warning(f"Error cleaning up resource {resource_id}: {str(e)}")
+            await release_asset(resource_id)
         self.uploaded_resources = []
             
     async def generate_video(self, video_id: str, audio_id: str, output_path: Path, style_name: str = None) -> Optional[Path]:
@@ -176,7 +373,7 @@ class VideoGenerator:
             video = CloudinaryVideo(video_id)
             
             # Get video details
-            details = cloudinary.api.resource(video_id, resource_type='video')
+            details = await asyncio.to_thread(cloudinary.api.resource, video_id, resource_type='video')
             width = details.get('width', 0)
             height = details.get('height', 0)
             
@@ -225,75 +422,15 @@ class VideoGenerator:
             # Add style-specific logo if available
             if style_name:
                 try:
-                    # Look for logo in style-specific directory
-                    logo_dir = Path(__file__).parent.parent / 'framesAndLogo' / style_name.capitalize()
-                    logger.info(f"Looking for logo in directory: {logo_dir}")
+                    logo_path = find_logo(style_name)
                     
-                    if not logo_dir.exists():
-                        logger.warning(f"Logo directory does not exist: {logo_dir}")
-                        raise FileNotFoundError(f"Logo directory not found: {logo_dir}")
-                    
-                    # Search for logo files with multiple patterns
-                    logo_patterns = [
-                        f"{style_name.lower()}logo.*",  # e.g., naturelogo.png
-                        "logo.*",                       # e.g., logo.png
-                        "*.png"                         # any png file
-                    ]
-                    
-                    logo_path = None
-                    for pattern in logo_patterns:
-                        matches = list(logo_dir.glob(pattern))
-                        if matches:
-                            logo_path = matches[0]
-                            logger.info(f"Found logo using pattern '{pattern}': {logo_path}")
-                            break
-                    
-                    if logo_path and logo_path.exists():
+                    if logo_path:
                         # Upload or get cached logo
                         logo_public_id = await self.upload_logo(logo_path, style_name)
                         
                         if logo_public_id:
-                            # Configure logo settings based on style
-                            logo_settings = {
-                                'nature': {
-                                    'width': 120,
-                                    'opacity': 85,
-                                    'gravity': 'south_east',
-                                    'x': 20,
-                                    'y': 20,
-                                    'effect': 'brightness:20'  # Slightly brighten logo
-                                },
-                                'news': {
-                                    'width': 100,
-                                    'opacity': 90,
-                                    'gravity': 'north_east',
-                                    'x': 15,
-                                    'y': 15
-                                },
-                                'funny': {
-                                    'width': 110,
-                                    'opacity': 80,
-                                    'gravity': 'south_west',
-                                    'x': 20,
-                                    'y': 20
-                                },
-                                'infographic': {
-                                    'width': 130,
-                                    'opacity': 95,
-                                    'gravity': 'north_west',
-                                    'x': 15,
-                                    'y': 15
-                                }
-                            }
-                            
                             # Get style-specific settings or use defaults
-                            settings = logo_settings.get(style_name.lower(), {
-                                'width': 100,
-                                'opacity': 80,
-                                'gravity': 'south_east',
-                                'x': 20,
-                                'y': 20
-                            })
+                            settings = logo_settings(style_name)
                             
                             # Add logo overlay transformation
                             logo_transform = {
@@ -317,8 +454,6 @@ class VideoGenerator:
                             logger.info(f"Added {style_name} logo transformation: {logo_transform}")
                         else:
                             logger.error("Failed to get logo public_id")
-                    else:
-                        logger.warning(f"No logo files found in {logo_dir} using patterns: {logo_patterns}")
                 except Exception as e:
                     logger.error(f"Error adding {style_name} logo: {str(e)}", exc_info=True)
             
@@ -355,11 +490,107 @@ class VideoGenerator:
         finally:
             await self.cleanup_resources()
 
+def _create_generator() -> Optional[VideoGenerator]:
+    """Create a video generator from the Cloudinary environment credentials."""
+    cloud_name = os.getenv("CLOUDINARY_CLOUD_NAME")
+    api_key = os.getenv("CLOUDINARY_API_KEY")
+    api_secret = os.getenv("CLOUDINARY_API_SECRET")
+    
+    if not all([cloud_name, api_key, api_secret]):
+        logger.error("Missing Cloudinary credentials")
+        return None
+    
+    return VideoGenerator(cloud_name, api_key, api_secret)
+
+async def upload_shared_video(video_file: Path) -> Optional[Dict]:
+    """
+    Upload a source video once so several styles can be rendered from it.
+    
+    Only the Cloudinary compositor needs this; check compositor() first.
+    
+    Args:
+        video_file: Path to the input video file
+        
+    Returns:
+        Upload response to pass to execute_step as video_upload, None on failure
+    """
+    generator = _create_generator()
+    if generator is None:
+        return None
+    return await generator.upload_media(str(video_file), 'video')
+
+async def release_shared_video(public_id: str) -> None:
+    """Release a video uploaded with upload_shared_video once every style is rendered."""
+    await release_asset(public_id)
+
+def start_video_upload(video_file: Path) -> Optional[asyncio.Task]:
+    """
+    Start uploading the source video in the background as soon as it is downloaded.
+    
+    The upload then overlaps frame extraction, analysis, commentary and speech
+    synthesis, and Step 6 only has to upload the audio.
+    
+    Args:
+        video_file: Path to the input video file
+        
+    Returns:
+        Task resolving to the upload response (None on failure), or None when the
+        compositor does not need uploads. Pass it to await_video_upload, and always
+        to discard_video_upload once the job ends.
+    """
+    if compositor() != 'cloudinary':
+        return None
+    metrics.increment("cloudinary.speculative_uploads")
+    return asyncio.create_task(upload_shared_video(video_file))
+
+async def await_video_upload(task: Optional[asyncio.Task]) -> Optional[Dict]:
+    """
+    Wait for a speculative upload.
+    
+    Returns:
+        Upload response to pass to execute_step as video_upload, or None if there
+        was no upload or it failed (execute_step then uploads the video itself)
+    """
+    if task is None:
+        return None
+    started = time.perf_counter()
+    try:
+        response = await asyncio.shield(task)
+    except Exception as e:
+        logger.warning(f"Speculative video upload failed: {str(e)}")
+        return None
+    # Time Step 6 still had to wait; zero when the upload fully overlapped Steps 2-5
+    metrics.observe("cloudinary.speculative_wait_seconds", time.perf_counter() - started)
+    return response
+
+async def discard_video_upload(task: Optional[asyncio.Task]) -> None:
+    """
+    Clean up a speculative upload when its job ends, successfully or not.
+    
+    An upload still in progress (typically because the job failed early) is
+    cancelled without waiting for it. Cancelling releases the reference, and
+    the deletion is chained onto the upload's worker thread, so it runs when
+    the upload lands, even if the caller's event loop has closed by then.
+    """
+    if task is None:
+        return
+    if not task.done():
+        logger.info("Job ended before the speculative video upload finished, deleting it once it lands")
+        metrics.increment("cloudinary.speculative_discarded")
+        task.cancel()
+    await asyncio.wait([task])
+    if task.cancelled() or task.exception() is not None:
+        return
+    response = task.result()
+    if response:
+        await release_shared_video(response['public_id'])
+
 async def execute_step(
     video_file: Path,
     audio_file: Path,
     output_dir: Path,
-    style_name: str
+    style_name: str,
+    video_upload: Optional[Dict] = None
 ) -> Optional[Path]:
     """
     Execute video generation step.
@@ -369,33 +600,39 @@ async def execute_step(
         audio_file: Path to the generated audio file
         output_dir: Directory to save generated video
         style_name: Name of the commentary style used
+        video_upload: Upload response from upload_shared_video; the video is
+            then reused and left for the caller to release
         
     Returns:
         Path to the generated video if successful, None otherwise
     """
     logger.debug("Step 6: Generating final video...")
+    output_file = output_dir / f"final_video_{style_name}.mp4"
     
-    # Initialize video generator with Cloudinary credentials
-    cloud_name = os.getenv("CLOUDINARY_CLOUD_NAME")
-    api_key = os.getenv("CLOUDINARY_API_KEY")
-    api_secret = os.getenv("CLOUDINARY_API_SECRET")
+    if compositor() == 'local':
+        return await local_compositor.compose(Path(video_file), Path(audio_file), output_file, style_name)
     
-    if not all([cloud_name, api_key, api_secret]):
-        logger.error("Missing Cloudinary credentials")
+    # Initialize video generator with Cloudinary credentials
+    generator = _create_generator()
+    if generator is None:
         return None
     
-    generator = VideoGenerator(cloud_name, api_key, api_secret)
-    
     try:
-        # Upload video and audio
-        video_response = await generator.upload_media(str(video_file), 'video')
-        audio_response = await generator.upload_media(str(audio_file), 'video')  # Use video type for audio to support overlay
+        # Upload video (unless already shared) and audio concurrently
+        audio_upload = generator.upload_media(str(audio_file), 'video')  # Use video type for audio to support overlay
+        if video_upload:
+            video_response, audio_response = video_upload, await audio_upload
+        else:
+            video_response, audio_response = await asyncio.gather(
+                generator.upload_media(str(video_file), 'video'),
+                audio_upload
+            )
         
         if not video_response or not audio_response:
+            await generator.cleanup_resources()
             return None
         
         # Generate final video
-        output_file = output_dir / f"final_video_{style_name}.mp4"
         result = await generator.generate_video(
             video_response['public_id'],
             audio_response['public_id'],
@@ -406,4 +643,4 @@ async def execute_step(
         return result
     except Exception as e:
         logger.error(f"Error executing step: {str(e)}")
-        return None 
\ No newline at end of file
+        return None
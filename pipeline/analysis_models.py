@@ -0,0 +1,168 @@
+"""
+Analysis result model
+Compact, slotted records for frame analysis results with a single serialization pass
+"""
+
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the standard library
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+@dataclass(slots=True)
+class FrameRecord:
+    """Manifest entry for a frame saved by Step 2."""
+    path: str
+    timestamp: float
+    frame_diff: float
+    motion_score: float
+    scene_change: bool
+    hash: Optional[int] = None
+
+    def to_dict(self) -> dict:
+        return {
+            'path': self.path,
+            'timestamp': self.timestamp,
+            'frame_diff': self.frame_diff,
+            'motion_score': self.motion_score,
+            'scene_change': self.scene_change,
+            'hash': f"{self.hash:016x}" if self.hash is not None else None
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'FrameRecord':
+        return cls(
+            path=str(data['path']),
+            timestamp=float(data['timestamp']),
+            frame_diff=float(data.get('frame_diff', 0.0)),
+            motion_score=float(data.get('motion_score', 0.0)),
+            scene_change=bool(data.get('scene_change', False)),
+            hash=int(data['hash'], 16) if data.get('hash') else None
+        )
+
+@dataclass(slots=True)
+class Label:
+    """A scene label detected by Google Vision."""
+    description: str
+    confidence: float
+
+    def to_dict(self) -> dict:
+        return {'description': self.description, 'confidence': self.confidence}
+
+@dataclass(slots=True)
+class DetectedObject:
+    """A localized object detected by Google Vision."""
+    name: str
+    confidence: float
+    area: float
+
+    def to_dict(self) -> dict:
+        return {'name': self.name, 'confidence': self.confidence, 'area': self.area}
+
+@dataclass(slots=True)
+class GoogleVisionResult:
+    """Labels and objects detected in a single frame."""
+    labels: List[Label] = field(default_factory=list)
+    objects: List[DetectedObject] = field(default_factory=list)
+    confidence: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            'labels': [label.to_dict() for label in self.labels],
+            'objects': [obj.to_dict() for obj in self.objects],
+            'confidence': self.confidence
+        }
+
+@dataclass(slots=True)
+class FrameDescription:
+    """Detailed scene description from OpenAI Vision."""
+    detailed_description: str
+
+    def to_dict(self) -> dict:
+        return {'detailed_description': self.detailed_description}
+
+@dataclass(slots=True)
+class FrameAnalysis:
+    """Analysis results for one key frame."""
+    frame: str
+    timestamp: float
+    path: str
+    google_vision: Optional[GoogleVisionResult] = None
+    openai_vision: Optional[FrameDescription] = None
+
+    def to_dict(self) -> dict:
+        result = {'frame': self.frame, 'timestamp': self.timestamp, 'path': self.path}
+        if self.google_vision is not None:
+            result['google_vision'] = self.google_vision.to_dict()
+        if self.openai_vision is not None:
+            result['openai_vision'] = self.openai_vision.to_dict()
+        return result
+
+@dataclass(slots=True)
+class VideoAnalysis:
+    """Complete analysis of a video: metadata plus per-frame results."""
+    metadata: Dict[str, Any]
+    frames: List[FrameAnalysis] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        """Build the plain dictionary consumed by later pipeline steps."""
+        return {
+            'metadata': self.metadata,
+            'frames': [frame.to_dict() for frame in self.frames]
+        }
+
+def save_frame_manifest(records: List[FrameRecord], path: Path) -> None:
+    """Write the Step 2 frame manifest."""
+    save({'frames': [record.to_dict() for record in records]}, path)
+
+def load_frame_manifest(path: Path) -> List[FrameRecord]:
+    """
+    Read a frame manifest written by Step 2.
+
+    Returns:
+        Frame records, or an empty list if the manifest is missing or unreadable
+    """
+    path = Path(path)
+    if not path.exists():
+        return []
+    try:
+        with open(path, 'rb') as f:
+            data = orjson.loads(f.read()) if orjson is not None else json.load(f)
+        return [FrameRecord.from_dict(entry) for entry in data.get('frames', [])]
+    except Exception as e:
+        logger.warning(f"Error loading frame manifest {path}: {str(e)}")
+        return []
+
+def _json_default(obj):
+    """Serialize the few non-JSON types that can appear in video metadata."""
+    if isinstance(obj, Path):
+        return str(obj)
+    if hasattr(obj, 'item'):  # numpy scalars
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps(data: Union[dict, list]) -> bytes:
+    """
+    Serialize analysis data to indented UTF-8 JSON.
+
+    Uses orjson when available, otherwise the standard json module.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            data,
+            default=_json_default,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(data, indent=2, ensure_ascii=False, default=_json_default).encode('utf-8')
+
+def save(data: Union[dict, list], path: Path) -> None:
+    """Write analysis data to a JSON file in one serialization pass."""
+    with open(path, 'wb') as f:
+        f.write(dumps(data))
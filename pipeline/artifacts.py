@@ -0,0 +1,54 @@
+"""
+Pipeline artifacts module
+Deferred, optional persistence of intermediate JSON artifacts off the critical path
+"""
+
+import asyncio
+import logging
+import os
+from pathlib import Path
+from typing import Optional, Set, Union
+
+from . import analysis_models
+
+logger = logging.getLogger(__name__)
+
+_pending: Set[asyncio.Future] = set()
+
+def artifacts_enabled() -> bool:
+    """Whether intermediate artifacts are written to disk (SAVE_ARTIFACTS, default true)."""
+    return os.getenv('SAVE_ARTIFACTS', 'true').lower() in ('1', 'true', 'yes')
+
+def _write(data: Union[dict, list], path: Path) -> None:
+    try:
+        analysis_models.save(data, path)
+        logger.debug(f"Saved artifact: {path}")
+    except Exception as e:
+        logger.warning(f"Error saving artifact {path}: {str(e)}")
+
+def save_later(data: Union[dict, list], path: Path) -> Optional[asyncio.Future]:
+    """
+    Write a JSON artifact in a worker thread without waiting for it.
+
+    The data must not be modified after it is handed over.
+
+    Args:
+        data: JSON-serializable artifact
+        path: Destination file
+
+    Returns:
+        Future for the write, or None if artifacts are disabled
+    """
+    if not artifacts_enabled():
+        return None
+    future = asyncio.get_running_loop().run_in_executor(None, _write, data, Path(path))
+    _pending.add(future)
+    future.add_done_callback(_pending.discard)
+    return future
+
+async def flush() -> None:
+    """Wait for artifact writes scheduled on the running event loop."""
+    loop = asyncio.get_running_loop()
+    pending = [future for future in _pending if future.get_loop() is loop]
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
@@ -0,0 +1,170 @@
+"""
+Audio fit module
+Local, pitch-preserving time-stretch that fits synthesized narration to the video duration
+"""
+
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Awaitable, Callable, List, Optional
+
+from . import metrics
+from .wav_assembly import wav_duration
+
+try:
+    import mutagen
+except ImportError:  # mutagen is optional, a fallback when ffprobe is not installed
+    mutagen = None
+
+logger = logging.getLogger(__name__)
+
+# Speed-up applied locally without re-synthesis; beyond this, speech starts to sound rushed
+MAX_TEMPO = float(os.getenv('AUDIO_FIT_MAX_TEMPO', '1.15'))
+# Overrun tolerated without any processing, in seconds
+TOLERANCE = float(os.getenv('AUDIO_FIT_TOLERANCE', '0.25'))
+
+# speaking_rate range accepted by Google TTS
+MIN_SPEAKING_RATE = 0.25
+MAX_SPEAKING_RATE = 4.0
+
+# ffmpeg output arguments per TTS encoding, shared by every step that re-encodes narration
+ENCODER_ARGS = {
+    'MP3': ['-c:a', 'libmp3lame', '-b:a', '64k', '-f', 'mp3'],
+    'OGG_OPUS': ['-c:a', 'libopus', '-b:a', '48k', '-f', 'ogg'],
+    'LINEAR16': ['-c:a', 'pcm_s16le', '-f', 'wav']
+}
+EXTENSION_ENCODINGS = {'.mp3': 'MP3', '.ogg': 'OGG_OPUS', '.wav': 'LINEAR16'}
+
+async def _run(*args: str) -> bytes:
+    process = await asyncio.create_subprocess_exec(
+        *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    stdout, stderr = await process.communicate()
+    if process.returncode != 0:
+        raise RuntimeError(f"{args[0]} failed: {stderr.decode(errors='replace').strip()}")
+    return stdout
+
+async def audio_duration(audio_file: Path) -> Optional[float]:
+    """
+    Measure the duration of an audio file.
+
+    WAV headers are read directly; other formats use ffprobe, which decodes
+    the stream, and fall back to mutagen when ffprobe is not installed.
+
+    Returns:
+        Duration in seconds, or None if it cannot be measured
+    """
+    audio_file = Path(audio_file)
+    try:
+        if audio_file.suffix.lower() == '.wav':
+            return await asyncio.to_thread(lambda: wav_duration(audio_file.read_bytes()))
+        if shutil.which('ffprobe'):
+            output = await _run(
+                'ffprobe', '-v', 'error', '-show_entries', 'format=duration',
+                '-of', 'default=noprint_wrappers=1:nokey=1', str(audio_file)
+            )
+            return float(output.strip())
+        if mutagen is not None:
+            info = await asyncio.to_thread(mutagen.File, str(audio_file))
+            if info is not None:
+                return info.info.length
+    except Exception as e:
+        logger.warning(f"Could not measure duration of {audio_file}: {str(e)}")
+    return None
+
+def _atempo_chain(tempo: float) -> str:
+    """Build an atempo filter chain with each stage at most 2.0, the limit of older ffmpeg builds."""
+    stages: List[str] = []
+    while tempo > 2.0:
+        stages.append('atempo=2.0')
+        tempo /= 2.0
+    stages.append(f'atempo={tempo:.5f}')
+    return ','.join(stages)
+
+async def time_stretch(audio_file: Path, tempo: float) -> Path:
+    """
+    Change the tempo of an audio file in place without changing its pitch.
+
+    Args:
+        audio_file: Audio file; the output keeps its format, codec and bitrate
+        tempo: Speed factor (above 1 is faster and shorter)
+
+    Returns:
+        audio_file
+    """
+    audio_file = Path(audio_file)
+    encoding = EXTENSION_ENCODINGS.get(audio_file.suffix.lower())
+    if encoding is None:
+        raise ValueError(f"Unsupported narration format: {audio_file.suffix}")
+    fd, tmp_path = tempfile.mkstemp(dir=audio_file.parent, suffix=audio_file.suffix)
+    os.close(fd)
+    try:
+        await _run(
+            'ffmpeg', '-y', '-loglevel', 'error', '-i', str(audio_file),
+            '-filter:a', _atempo_chain(tempo), *ENCODER_ARGS[encoding], tmp_path
+        )
+        os.replace(tmp_path, audio_file)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return audio_file
+
+async def fit_audio(
+    audio_file: Path,
+    target_duration: Optional[float],
+    resynthesize: Optional[Callable[[float], Awaitable[None]]] = None
+) -> Path:
+    """
+    Fit narration to a target duration.
+
+    Overruns up to AUDIO_FIT_MAX_TEMPO are time-stretched locally with ffmpeg
+    atempo. Larger overruns are re-synthesized once at a faster speaking rate,
+    then stretched if a small overrun remains. Narration shorter than the
+    video is left as it is.
+
+    Args:
+        audio_file: Synthesized narration
+        target_duration: Duration to fit, in seconds (None or 0 to skip)
+        resynthesize: Optional coroutine function that rewrites audio_file at a
+            given speaking-rate multiplier
+
+    Returns:
+        audio_file
+    """
+    try:
+        target_duration = float(target_duration or 0)
+    except (TypeError, ValueError):
+        return audio_file
+    if target_duration <= 0:
+        return audio_file
+    duration = await audio_duration(audio_file)
+    if duration is None:
+        return audio_file
+    metrics.observe("audio.fit_overrun_seconds", max(0.0, duration - target_duration))
+
+    if duration <= target_duration + TOLERANCE:
+        return audio_file
+    tempo = duration / target_duration
+
+    if tempo > MAX_TEMPO and resynthesize is not None:
+        rate = min(MAX_SPEAKING_RATE, max(MIN_SPEAKING_RATE, tempo))
+        logger.info(f"Narration is {duration:.1f}s for a {target_duration:.1f}s video, re-synthesizing at {rate:.2f}x speaking rate")
+        metrics.increment("audio.fit_resynthesized")
+        await resynthesize(rate)
+        duration = await audio_duration(audio_file)
+        if duration is None or duration <= target_duration + TOLERANCE:
+            return audio_file
+        tempo = duration / target_duration
+
+    if shutil.which('ffmpeg') is None:
+        logger.warning("ffmpeg is not installed, cannot time-stretch narration")
+        return audio_file
+
+    tempo = min(tempo, MAX_TEMPO)
+    logger.info(f"Time-stretching narration from {duration:.1f}s by {tempo:.3f}x to fit {target_duration:.1f}s")
+    await time_stretch(audio_file, tempo)
+    metrics.increment("audio.fit_stretched")
+    return audio_file
@@ -0,0 +1,84 @@
+"""
+Frame signature module
+Cheap perceptual hashes for grouping visually similar frames
+"""
+
+import logging
+from pathlib import Path
+from typing import Dict, Hashable, List, Optional, Sequence
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Frames whose hashes differ in at most this many of 64 bits are treated as the same shot
+DEFAULT_MAX_DISTANCE = 10
+
+def dhash(image: np.ndarray, hash_size: int = 8) -> int:
+    """
+    Compute a difference hash of an image.
+
+    Args:
+        image: BGR or grayscale image
+        hash_size: Hash width in bits (the hash has hash_size * hash_size bits)
+
+    Returns:
+        Hash as a Python int
+    """
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    resized = cv2.resize(image, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = (resized[:, 1:] > resized[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+def dhash_file(frame_path: Path) -> Optional[int]:
+    """Compute the difference hash of an image file, or None if it cannot be read."""
+    image = cv2.imread(str(frame_path), cv2.IMREAD_GRAYSCALE)
+    if image is None:
+        logger.warning(f"Could not read frame for hashing: {frame_path}")
+        return None
+    return dhash(image)
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two hashes."""
+    return (a ^ b).bit_count()
+
+def cluster_by_signature(
+    items: Sequence[Hashable],
+    signatures: Dict[Hashable, Optional[int]],
+    max_distance: int = DEFAULT_MAX_DISTANCE
+) -> List[List[Hashable]]:
+    """
+    Group items whose signatures are within max_distance of a cluster leader.
+
+    Items are visited in the given order, so the first member of each cluster
+    is the highest-priority representative. Items without a signature each
+    form their own cluster.
+
+    Args:
+        items: Items in priority order
+        signatures: Signature for each item
+        max_distance: Maximum Hamming distance to join an existing cluster
+
+    Returns:
+        List of clusters, each a list of items with the representative first
+    """
+    clusters: List[List[Hashable]] = []
+    leaders: List[Optional[int]] = []
+
+    for item in items:
+        signature = signatures.get(item)
+        if signature is not None:
+            for cluster, leader in zip(clusters, leaders):
+                if leader is not None and hamming_distance(signature, leader) <= max_distance:
+                    cluster.append(item)
+                    break
+            else:
+                clusters.append([item])
+                leaders.append(signature)
+        else:
+            clusters.append([item])
+            leaders.append(None)
+
+    return clusters
@@ -0,0 +1,122 @@
+"""
+Request hedging module
+Deadline-bounded API calls with optional hedged duplicates once a request runs slow
+"""
+
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+class LatencyTracker:
+    """Rolling window of observed request latencies."""
+
+    def __init__(self, window: int = 100, min_samples: int = 5):
+        """
+        Initialize latency tracker.
+
+        Args:
+            window: Number of most recent samples to keep
+            min_samples: Samples required before percentiles are reported
+        """
+        self.samples = deque(maxlen=window)
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        """Record a completed request latency."""
+        with self._lock:
+            self.samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Get a latency percentile.
+
+        Args:
+            q: Percentile as a fraction, e.g. 0.9 for P90
+
+        Returns:
+            Latency in seconds, or None while there are too few samples
+        """
+        with self._lock:
+            if len(self.samples) < self.min_samples:
+                return None
+            ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(q * len(ordered)))
+        return ordered[index]
+
+async def hedged_request(
+    primary: Callable[[], Awaitable[T]],
+    hedge: Optional[Callable[[], Awaitable[T]]] = None,
+    hedge_after: Optional[float] = None,
+    timeout: Optional[float] = None,
+    metric_prefix: str = "requests"
+) -> T:
+    """
+    Run a request with a deadline and an optional hedged duplicate.
+
+    The primary request starts immediately. If it has not finished after
+    `hedge_after` seconds, the hedge request is started as well and the first
+    successful response wins; the other request is cancelled.
+
+    Args:
+        primary: Factory returning the primary request coroutine
+        hedge: Factory returning the hedge request coroutine (None disables hedging)
+        hedge_after: Seconds to wait before hedging (None disables hedging)
+        timeout: Overall deadline in seconds (None for no deadline)
+        metric_prefix: Prefix for the hedges/hedge_wins/timeouts counters
+
+    Returns:
+        Result of the first request to succeed
+
+    Raises:
+        asyncio.TimeoutError: If no request succeeded before the deadline
+        Exception: The last request error if every request failed
+    """
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    primary_task = asyncio.ensure_future(primary())
+    tasks = [primary_task]
+    can_hedge = hedge is not None and hedge_after is not None
+    last_error = None
+
+    try:
+        while tasks:
+            elapsed = loop.time() - start
+            remaining = None if timeout is None else timeout - elapsed
+            if remaining is not None and remaining <= 0:
+                metrics.increment(f"{metric_prefix}.timeouts")
+                raise asyncio.TimeoutError(f"Request exceeded deadline of {timeout:.1f}s")
+
+            wait_for = remaining
+            if can_hedge:
+                until_hedge = max(0.0, hedge_after - elapsed)
+                wait_for = until_hedge if wait_for is None else min(wait_for, until_hedge)
+
+            done, _ = await asyncio.wait(tasks, timeout=wait_for, return_when=asyncio.FIRST_COMPLETED)
+
+            for task in done:
+                tasks.remove(task)
+                if task.exception() is None:
+                    if task is not primary_task:
+                        metrics.increment(f"{metric_prefix}.hedge_wins")
+                    return task.result()
+                last_error = task.exception()
+
+            if can_hedge and tasks and loop.time() - start >= hedge_after:
+                logger.info(f"Request still pending after {hedge_after:.2f}s, issuing hedged request")
+                metrics.increment(f"{metric_prefix}.hedges")
+                tasks.append(asyncio.ensure_future(hedge()))
+                can_hedge = False
+
+        raise last_error
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,272 @@
+"""
+LLM routing module
+Latency- and error-aware routing between LLM providers with failover and optional hedging
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import AsyncIterator, Dict, List, Optional, Sequence
+
+from openai import APIConnectionError, APIStatusError
+
+from . import metrics
+from .hedging import LatencyTracker, hedged_request
+from .prompts import LLMProvider, PromptManager
+
+logger = logging.getLogger(__name__)
+
+# Chat model used for each provider
+MODELS = {
+    LLMProvider.OPENAI: "gpt-4o-mini",
+    LLMProvider.DEEPSEEK: "deepseek-chat"
+}
+
+class ProviderStats:
+    """Rolling latency and error rate for one provider."""
+
+    def __init__(self, window: int = 50):
+        self.latency = LatencyTracker(window=window)
+        self.outcomes = deque(maxlen=window)
+        self.last_failure = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: Optional[float], success: bool) -> None:
+        """Record a finished request; latency is only tracked for successes."""
+        if success and seconds is not None:
+            self.latency.record(seconds)
+        with self._lock:
+            self.outcomes.append(success)
+            if not success:
+                self.last_failure = time.monotonic()
+
+    def error_rate(self) -> float:
+        """Fraction of recent requests that failed."""
+        with self._lock:
+            if not self.outcomes:
+                return 0.0
+            return self.outcomes.count(False) / len(self.outcomes)
+
+# Shared across jobs so routing learns from every request in the process
+_stats: Dict[LLMProvider, ProviderStats] = {provider: ProviderStats() for provider in LLMProvider}
+_managers: Dict[LLMProvider, Optional[PromptManager]] = {}
+_managers_lock = threading.Lock()
+
+def get_stats(provider: LLMProvider) -> ProviderStats:
+    """Get the rolling stats for a provider."""
+    return _stats[provider]
+
+def _get_manager(provider: LLMProvider) -> Optional[PromptManager]:
+    """Get a shared prompt manager for a provider, or None if it cannot be configured."""
+    with _managers_lock:
+        if provider not in _managers:
+            try:
+                _managers[provider] = PromptManager(provider)
+            except Exception as e:
+                logger.warning(f"{provider.value} provider unavailable: {str(e)}")
+                _managers[provider] = None
+        return _managers[provider]
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether a request error should fail over to another provider (timeouts, connection errors, 5xx)."""
+    if isinstance(error, (asyncio.TimeoutError, APIConnectionError)):
+        return True
+    if isinstance(error, APIStatusError):
+        return error.status_code >= 500
+    return False
+
+class LLMRouter:
+    """Routes chat completions to the preferred provider and fails over to the others."""
+
+    def __init__(
+        self,
+        preferred: LLMProvider = LLMProvider.OPENAI,
+        timeout: Optional[float] = None,
+        hedging: Optional[bool] = None,
+        error_threshold: Optional[float] = None,
+        cooldown: Optional[float] = None
+    ):
+        """
+        Initialize LLM router.
+
+        Args:
+            preferred: Provider chosen by the user
+            timeout: Per-request deadline in seconds (LLM_CALL_TIMEOUT, default 60)
+            hedging: Send a duplicate to the next provider once the request passes
+                its provider's P90 latency (LLM_HEDGING, default false)
+            error_threshold: Recent error rate above which the preferred provider
+                is tried after healthier ones (LLM_ERROR_THRESHOLD, default 0.5)
+            cooldown: Seconds without new failures after which a demoted
+                provider is tried first again (LLM_DEMOTE_COOLDOWN, default 60)
+        """
+        self.preferred = preferred
+        self.timeout = timeout if timeout is not None else float(os.getenv('LLM_CALL_TIMEOUT', '60'))
+        self.hedging = hedging if hedging is not None else os.getenv('LLM_HEDGING', 'false').lower() in ('1', 'true', 'yes')
+        self.error_threshold = error_threshold if error_threshold is not None else float(os.getenv('LLM_ERROR_THRESHOLD', '0.5'))
+        self.cooldown = cooldown if cooldown is not None else float(os.getenv('LLM_DEMOTE_COOLDOWN', '60'))
+
+    def route(self, allowed: Optional[Sequence[LLMProvider]] = None) -> List[LLMProvider]:
+        """
+        Order providers for a request.
+
+        The user's preferred provider goes first unless its recent error rate is
+        above the threshold and it failed within the cooldown; the rest follow
+        by error rate, then P50 latency.
+
+        Args:
+            allowed: Providers that can serve this request (None for all)
+
+        Returns:
+            Available providers in the order to try them
+        """
+        candidates = [p for p in (allowed or list(LLMProvider)) if _get_manager(p) is not None]
+
+        def score(provider: LLMProvider):
+            stats = _stats[provider]
+            p50 = stats.latency.percentile(0.5)
+            return (stats.error_rate(), p50 if p50 is not None else 0.0)
+
+        others = sorted((p for p in candidates if p != self.preferred), key=score)
+        if self.preferred not in candidates:
+            if self.preferred in (allowed or list(LLMProvider)):
+                metrics.increment(f"llm.route.unavailable.{self.preferred.value}")
+            return others
+
+        preferred_stats = _stats[self.preferred]
+        preferred_error_rate = preferred_stats.error_rate()
+        if (
+            others
+            and preferred_error_rate > self.error_threshold
+            and time.monotonic() - preferred_stats.last_failure < self.cooldown
+            and _stats[others[0]].error_rate() < preferred_error_rate
+        ):
+            logger.warning(f"Demoting {self.preferred.value}: recent error rate {preferred_error_rate:.0%}")
+            metrics.increment(f"llm.route.demoted.{self.preferred.value}")
+            return others + [self.preferred]
+        return [self.preferred] + others
+
+    async def _call(self, provider: LLMProvider, messages: list, use_cache: bool, **kwargs) -> str:
+        """Make one request to a provider and record its outcome."""
+        start = time.monotonic()
+        try:
+            result = await _get_manager(provider).agenerate_response(
+                messages, model=MODELS[provider], use_cache=use_cache, **kwargs
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            _stats[provider].record(None, success=False)
+            metrics.increment(f"llm.errors.{provider.value}")
+            raise
+        latency = time.monotonic() - start
+        _stats[provider].record(latency, success=True)
+        metrics.observe(f"llm.latency.{provider.value}", latency)
+        return result
+
+    async def agenerate_response(
+        self,
+        messages: list,
+        allowed: Optional[Sequence[LLMProvider]] = None,
+        use_cache: bool = True,
+        **kwargs
+    ) -> str:
+        """
+        Generate a response, failing over between providers.
+
+        Args:
+            messages: Chat messages
+            allowed: Providers that can serve this request (None for all)
+            use_cache: Serve identical requests from the response cache
+            **kwargs: Additional chat completion parameters
+
+        Returns:
+            Generated message content
+        """
+        order = self.route(allowed)
+        if not order:
+            raise ValueError("No LLM provider available")
+
+        last_error = None
+        for index, provider in enumerate(order):
+            fallback = order[index + 1] if index + 1 < len(order) else None
+            hedge_after = _stats[provider].latency.percentile(0.9) if self.hedging and fallback else None
+            metrics.increment(f"llm.route.{provider.value}")
+            if index:
+                metrics.increment("llm.failovers")
+                logger.warning(f"Failing over to {provider.value} after: {last_error}")
+            try:
+                return await hedged_request(
+                    lambda: self._call(provider, messages, use_cache, **kwargs),
+                    hedge=(lambda: self._call(fallback, messages, use_cache, **kwargs)) if hedge_after is not None else None,
+                    hedge_after=hedge_after,
+                    timeout=self.timeout,
+                    metric_prefix="llm"
+                )
+            except Exception as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    _stats[provider].record(None, success=False)
+                if not is_retryable(e):
+                    raise
+                last_error = e
+        raise last_error
+
+    async def astream_response(
+        self,
+        messages: list,
+        allowed: Optional[Sequence[LLMProvider]] = None,
+        use_cache: bool = True,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Stream a response, failing over between providers until the first token arrives.
+
+        Once text has been yielded the provider is committed, so later errors are raised.
+
+        Args:
+            messages: Chat messages
+            allowed: Providers that can serve this request (None for all)
+            use_cache: Replay identical requests from the response cache
+            **kwargs: Additional chat completion parameters
+
+        Yields:
+            Pieces of generated message content
+        """
+        order = self.route(allowed)
+        if not order:
+            raise ValueError("No LLM provider available")
+
+        last_error = None
+        for index, provider in enumerate(order):
+            metrics.increment(f"llm.route.{provider.value}")
+            if index:
+                metrics.increment("llm.failovers")
+                logger.warning(f"Failing over to {provider.value} after: {last_error}")
+
+            stream = _get_manager(provider).astream_response(
+                messages, model=MODELS[provider], use_cache=use_cache, **kwargs
+            ).__aiter__()
+            start = time.monotonic()
+            try:
+                first = await asyncio.wait_for(stream.__anext__(), timeout=self.timeout)
+            except StopAsyncIteration:
+                return
+            except Exception as e:
+                _stats[provider].record(None, success=False)
+                metrics.increment(f"llm.errors.{provider.value}")
+                await stream.aclose()
+                if not is_retryable(e):
+                    raise
+                last_error = e
+                continue
+
+            first_token = time.monotonic() - start
+            _stats[provider].record(first_token, success=True)
+            metrics.observe(f"llm.first_token_latency.{provider.value}", first_token)
+            yield first
+            async for delta in stream:
+                yield delta
+            return
+        raise last_error
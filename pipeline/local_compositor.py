@@ -0,0 +1,269 @@
+"""
+Local compositor module
+Renders the final video with one ffmpeg process: 9:16 white padding, narration mixed in as AAC and the style logo
+"""
+
+import asyncio
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+LOGO_ROOT = Path(__file__).parent.parent / 'framesAndLogo'
+
+# Logo placement per style; opacity is a percentage and brightness ranges from -99 to 100
+LOGO_SETTINGS = {
+    'nature': {
+        'width': 120,
+        'opacity': 85,
+        'gravity': 'south_east',
+        'x': 20,
+        'y': 20,
+        'effect': 'brightness:20'  # Slightly brighten logo
+    },
+    'news': {
+        'width': 100,
+        'opacity': 90,
+        'gravity': 'north_east',
+        'x': 15,
+        'y': 15
+    },
+    'funny': {
+        'width': 110,
+        'opacity': 80,
+        'gravity': 'south_west',
+        'x': 20,
+        'y': 20
+    },
+    'infographic': {
+        'width': 130,
+        'opacity': 95,
+        'gravity': 'north_west',
+        'x': 15,
+        'y': 15
+    }
+}
+DEFAULT_LOGO_SETTINGS = {
+    'width': 100,
+    'opacity': 80,
+    'gravity': 'south_east',
+    'x': 20,
+    'y': 20
+}
+
+TARGET_RATIO = 9 / 16
+AUDIO_BITRATE = '192k'
+# x264 speed/quality trade-off for re-encoded video
+PRESET = os.getenv('COMPOSITOR_PRESET', 'veryfast')
+CRF = os.getenv('COMPOSITOR_CRF', '23')
+
+def find_logo(style_name: str) -> Optional[Path]:
+    """
+    Find the logo image for a style in framesAndLogo/<Style>.
+
+    Returns:
+        Logo path, or None if the style has no logo
+    """
+    logo_dir = LOGO_ROOT / style_name.capitalize()
+    if not logo_dir.exists():
+        logger.warning(f"Logo directory does not exist: {logo_dir}")
+        return None
+    for pattern in (f"{style_name.lower()}logo.*", "logo.*", "*.png"):
+        matches = sorted(logo_dir.glob(pattern))
+        if matches:
+            logger.info(f"Found logo using pattern '{pattern}': {matches[0]}")
+            return matches[0]
+    logger.warning(f"No logo files found in {logo_dir}")
+    return None
+
+def logo_settings(style_name: str) -> Dict:
+    """Get the logo placement for a style."""
+    return LOGO_SETTINGS.get(style_name.lower(), DEFAULT_LOGO_SETTINGS)
+
+def is_available() -> bool:
+    """Whether ffmpeg and ffprobe are installed."""
+    return shutil.which('ffmpeg') is not None and shutil.which('ffprobe') is not None
+
+async def _run(*args: str) -> bytes:
+    process = await asyncio.create_subprocess_exec(
+        *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    stdout, stderr = await process.communicate()
+    if process.returncode != 0:
+        raise RuntimeError(f"{args[0]} failed: {stderr.decode(errors='replace').strip()}")
+    return stdout
+
+async def probe_video(video_file: Path) -> Dict:
+    """
+    Read the dimensions and duration of a video and whether it has an audio track.
+
+    Returns:
+        Dict with width, height, duration (seconds) and has_audio
+    """
+    output = await _run(
+        'ffprobe', '-v', 'error', '-show_entries', 'stream=codec_type,width,height,duration:format=duration',
+        '-of', 'json', str(video_file)
+    )
+    info = json.loads(output)
+    streams = info.get('streams', [])
+    video = next((s for s in streams if s.get('codec_type') == 'video'), None)
+    if video is None:
+        raise ValueError(f"No video stream in {video_file}")
+    # Containers such as webm only report the duration at the format level
+    duration = video.get('duration') or info.get('format', {}).get('duration')
+    if duration is None:
+        raise ValueError(f"Unknown duration for {video_file}")
+    return {
+        'width': int(video['width']),
+        'height': int(video['height']),
+        'duration': float(duration),
+        'has_audio': any(s.get('codec_type') == 'audio' for s in streams)
+    }
+
+def _even(value: float) -> int:
+    """Round down to an even number of pixels, as yuv420p requires."""
+    return max(2, int(value) // 2 * 2)
+
+def _logo_position(settings: Dict) -> str:
+    """Translate a gravity and offsets into overlay filter coordinates."""
+    gravity = settings.get('gravity', 'south_east')
+    x, y = settings.get('x', 0), settings.get('y', 0)
+    x_expr = f"main_w-overlay_w-{x}" if gravity.endswith('east') else str(x)
+    y_expr = f"main_h-overlay_h-{y}" if gravity.startswith('south') else str(y)
+    return f"x={x_expr}:y={y_expr}"
+
+def _logo_filter(settings: Dict) -> str:
+    """Scale, fade and optionally brighten the logo input."""
+    gain = 1.0
+    effect = settings.get('effect', '')
+    if effect.startswith('brightness:'):
+        gain += int(effect.split(':', 1)[1]) / 100
+    mixer = f"aa={settings['opacity'] / 100:.2f}"
+    if gain != 1.0:
+        mixer = f"rr={gain:.2f}:gg={gain:.2f}:bb={gain:.2f}:{mixer}"
+    return f"scale={settings['width']}:-1,format=rgba,colorchannelmixer={mixer}"
+
+def build_command(
+    video_file: Path,
+    audio_file: Path,
+    output_file: Path,
+    width: int,
+    height: int,
+    duration: float,
+    has_audio: bool,
+    logo_path: Optional[Path] = None,
+    settings: Optional[Dict] = None
+) -> list:
+    """
+    Build the ffmpeg command for one render.
+
+    The video keeps its width and is padded on white to 9:16 when its aspect
+    ratio differs; it is stream-copied when neither padding nor a logo is needed.
+    The narration and the original audio track, if any, are padded with
+    silence and mixed, and the output is cut to the video's duration so
+    neither a short source track nor the narration ends it early.
+
+    Returns:
+        ffmpeg argument list
+    """
+    args = ['ffmpeg', '-y', '-loglevel', 'error', '-i', str(video_file), '-i', str(audio_file)]
+    if logo_path is not None:
+        args += ['-i', str(logo_path)]
+
+    video_filters = []
+    if abs(width / height - TARGET_RATIO) > 0.01:
+        target_width = _even(width)
+        target_height = _even(width * 16 / 9)
+        logger.info(f"Adding vertical padding (ratio: {width / height:.2f}, target: {TARGET_RATIO:.2f})")
+        video_filters.append(
+            f"[0:v]scale={target_width}:{target_height}:force_original_aspect_ratio=decrease,"
+            f"pad={target_width}:{target_height}:(ow-iw)/2:(oh-ih)/2:white,setsar=1[padded]"
+        )
+        video_source = '[padded]'
+    else:
+        video_source = '[0:v]'
+
+    if logo_path is not None:
+        video_filters.append(f"[2:v]{_logo_filter(settings or DEFAULT_LOGO_SETTINGS)}[logo]")
+        video_filters.append(
+            f"{video_source}[logo]overlay={_logo_position(settings or DEFAULT_LOGO_SETTINGS)}:format=auto[video]"
+        )
+        video_source = '[video]'
+
+    if has_audio:
+        audio_filter = "[0:a]apad[source];[1:a]apad[narration];[source][narration]amix=inputs=2:duration=first:normalize=0[audio]"
+    else:
+        audio_filter = "[1:a]apad[audio]"
+
+    args += ['-filter_complex', ';'.join(video_filters + [audio_filter])]
+    if video_filters:
+        args += ['-map', video_source, '-c:v', 'libx264', '-preset', PRESET, '-crf', CRF, '-pix_fmt', 'yuv420p']
+    else:
+        args += ['-map', '0:v:0', '-c:v', 'copy']
+    args += [
+        '-map', '[audio]', '-c:a', 'aac', '-b:a', AUDIO_BITRATE,
+        '-t', f"{duration:.3f}", '-movflags', '+faststart', str(output_file)
+    ]
+    return args
+
+async def compose(
+    video_file: Path,
+    audio_file: Path,
+    output_path: Path,
+    style_name: Optional[str] = None
+) -> Optional[Path]:
+    """
+    Render the final video locally.
+
+    Args:
+        video_file: Source video
+        audio_file: Narration audio
+        output_path: Path to save the final video
+        style_name: Name of the commentary style, used to pick the logo
+
+    Returns:
+        Path to the generated video if successful, None otherwise
+    """
+    if not is_available():
+        logger.error("ffmpeg is not installed, cannot composite video locally")
+        return None
+
+    started = time.perf_counter()
+    tmp_path = None
+    try:
+        info = await probe_video(video_file)
+        logger.info(f"Processing video with style: {style_name}")
+        logger.info(f"Video dimensions: {info['width']}x{info['height']}")
+
+        logo_path = find_logo(style_name) if style_name else None
+        settings = logo_settings(style_name) if logo_path else None
+
+        # Render next to the output and rename, so a failed run leaves no partial file
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=output_path.parent, suffix='.mp4')
+        os.close(fd)
+        await _run(*build_command(
+            video_file, audio_file, Path(tmp_path),
+            info['width'], info['height'], info['duration'], info['has_audio'],
+            logo_path, settings
+        ))
+        os.replace(tmp_path, output_path)
+        tmp_path = None
+
+        metrics.observe("compositor.local_seconds", time.perf_counter() - started)
+        logger.info(f"Video generated successfully: {output_path}")
+        return output_path
+    except Exception as e:
+        logger.error(f"Error compositing video locally: {str(e)}", exc_info=True)
+        return None
+    finally:
+        if tmp_path is not None:
+            Path(tmp_path).unlink(missing_ok=True)
@@ -0,0 +1,69 @@
+"""
+Pipeline metrics module
+Thread-safe in-process counters and timing summaries shared by the pipeline steps
+"""
+
+import logging
+import threading
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_counters: Dict[str, float] = {}
+_timings: Dict[str, Dict[str, float]] = {}
+
+def increment(name: str, value: float = 1.0) -> None:
+    """
+    Increase a counter.
+
+    Args:
+        name: Dotted metric name, e.g. 'vision.hedges'
+        value: Amount to add
+    """
+    with _lock:
+        _counters[name] = _counters.get(name, 0.0) + value
+
+def observe(name: str, value: float) -> None:
+    """
+    Record a timing or size sample.
+
+    Args:
+        name: Dotted metric name, e.g. 'vision.openai_latency'
+        value: Sample value (seconds, bytes, ...)
+    """
+    with _lock:
+        summary = _timings.setdefault(name, {'count': 0, 'total': 0.0, 'max': 0.0})
+        summary['count'] += 1
+        summary['total'] += value
+        summary['max'] = max(summary['max'], value)
+
+def get_counter(name: str) -> float:
+    """Get the current value of a counter."""
+    with _lock:
+        return _counters.get(name, 0.0)
+
+def snapshot(prefix: Optional[str] = None) -> dict:
+    """
+    Get a copy of all metrics, optionally restricted to a name prefix.
+
+    Returns:
+        Dictionary with 'counters' and 'timings' (count, total, max and mean per name)
+    """
+    with _lock:
+        counters = {k: v for k, v in _counters.items() if not prefix or k.startswith(prefix)}
+        timings = {
+            k: {**v, 'mean': v['total'] / v['count'] if v['count'] else 0.0}
+            for k, v in _timings.items() if not prefix or k.startswith(prefix)
+        }
+    return {'counters': counters, 'timings': timings}
+
+def log_snapshot(prefix: Optional[str] = None) -> None:
+    """Log the current metrics for a prefix."""
+    logger.info(f"Metrics{f' ({prefix})' if prefix else ''}: {snapshot(prefix)}")
+
+def reset() -> None:
+    """Clear all metrics."""
+    with _lock:
+        _counters.clear()
+        _timings.clear()
@@ -0,0 +1,99 @@
+"""
+MP3 assembly module
+Joins MP3 segments frame-wise, dropping per-segment ID3 tags and Xing/Info/VBRI headers
+"""
+
+import logging
+from typing import List, Optional, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+# Layer III bitrates in kbit/s by bitrate index
+_BITRATES_V1 = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+_BITRATES_V2 = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)
+_SAMPLE_RATES_V1 = (44100, 48000, 32000)
+ID3V1_SIZE = 128
+
+def _id3v2_size(view: memoryview) -> int:
+    """Length of a leading ID3v2 tag, or 0."""
+    if len(view) < 10 or view[0:3] != b'ID3':
+        return 0
+    size = (view[6] & 0x7F) << 21 | (view[7] & 0x7F) << 14 | (view[8] & 0x7F) << 7 | (view[9] & 0x7F)
+    footer = 10 if view[5] & 0x10 else 0
+    return 10 + size + footer
+
+def _frame_length(view: memoryview, offset: int) -> Optional[int]:
+    """
+    Length of the Layer III frame starting at offset.
+
+    Returns:
+        Frame length in bytes, or None if no valid frame header is there
+    """
+    if offset + 4 > len(view) or view[offset] != 0xFF or (view[offset + 1] & 0xE0) != 0xE0:
+        return None
+    version = (view[offset + 1] >> 3) & 0x03  # 0: MPEG 2.5, 2: MPEG 2, 3: MPEG 1
+    layer = (view[offset + 1] >> 1) & 0x03   # 1: Layer III
+    bitrate_index = view[offset + 2] >> 4
+    rate_index = (view[offset + 2] >> 2) & 0x03
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    padding = (view[offset + 2] >> 1) & 0x01
+    sample_rate = _SAMPLE_RATES_V1[rate_index] >> (3 - version if version != 0 else 2)
+    if version == 3:
+        return 144000 * _BITRATES_V1[bitrate_index] // sample_rate + padding
+    return 72000 * _BITRATES_V2[bitrate_index] // sample_rate + padding
+
+def _is_info_frame(view: memoryview, offset: int, length: int) -> bool:
+    """Whether the frame at offset is a Xing/Info or VBRI header frame rather than audio."""
+    version = (view[offset + 1] >> 3) & 0x03
+    mono = (view[offset + 3] >> 6) == 0x03
+    side_info = (17 if mono else 32) if version == 3 else (9 if mono else 17)
+    frame = view[offset:offset + length]
+    return (bytes(frame[4 + side_info:8 + side_info]) in (b'Xing', b'Info')
+            or bytes(frame[36:40]) == b'VBRI')
+
+def audio_frames(data: Union[bytes, bytearray, memoryview]) -> memoryview:
+    """
+    Locate the audio frames of an MP3 without copying them.
+
+    A leading ID3v2 tag, a trailing ID3v1 tag and a Xing/Info/VBRI header frame
+    are excluded: they describe a single segment, and left in the middle of a
+    joined stream they make decoders and duration readers (mutagen) report the
+    first segment's length.
+
+    Args:
+        data: MP3 file contents
+
+    Returns:
+        memoryview into data covering only the audio frames
+    """
+    view = memoryview(data)
+    start = _id3v2_size(view)
+    end = len(view)
+    if end - start >= ID3V1_SIZE and view[end - ID3V1_SIZE:end - ID3V1_SIZE + 3] == b'TAG':
+        end -= ID3V1_SIZE
+
+    length = _frame_length(view, start)
+    if length is not None and start + length <= end and _is_info_frame(view, start, length):
+        start += length
+    return view[start:end]
+
+def join_mp3(segments: Sequence[Union[bytes, bytearray, memoryview]]) -> bytearray:
+    """
+    Join MP3 segments with the same format into one stream.
+
+    Args:
+        segments: MP3 file contents in playback order
+
+    Returns:
+        The joined MP3, made only of audio frames
+    """
+    if not segments:
+        raise ValueError("No MP3 segments to join")
+    frames: List[memoryview] = [audio_frames(segment) for segment in segments]
+    joined = bytearray(sum(len(frame) for frame in frames))
+    position = 0
+    for frame in frames:
+        joined[position:position + len(frame)] = frame
+        position += len(frame)
+    return joined
@@ -0,0 +1,154 @@
+"""
+Prompt budget module
+Local token estimates and compaction helpers that keep LLM prompts within a token budget
+"""
+
+import logging
+import re
+from typing import Callable, Iterable, List, Optional, TypeVar
+
+from . import metrics
+from .text_segmentation import split_sentences
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken is optional, fall back to a character-class estimate
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+_NON_ASCII = re.compile(r'[^\x00-\x7F]')
+_encoding = None
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text without calling the API.
+
+    Uses tiktoken when it is installed. Otherwise counts roughly four ASCII
+    characters per token and two non-ASCII (e.g. Urdu) characters per token.
+    """
+    global _encoding
+    if not text:
+        return 0
+    if tiktoken is not None:
+        if _encoding is None:
+            _encoding = tiktoken.get_encoding("o200k_base")
+        return len(_encoding.encode(text))
+    non_ascii = len(_NON_ASCII.findall(text))
+    return (len(text) - non_ascii + 3) // 4 + (non_ascii + 1) // 2
+
+def estimate_message_tokens(messages: List[dict]) -> int:
+    """Estimate the text tokens of chat messages, including per-message overhead."""
+    total = 0
+    for message in messages:
+        content = message.get('content', '')
+        if isinstance(content, list):
+            content = ' '.join(part.get('text', '') for part in content if part.get('type') == 'text')
+        total += estimate_tokens(content) + 4
+    return total
+
+def truncate_to_budget(text: str, max_tokens: int) -> str:
+    """
+    Shorten text to a token budget, cutting at sentence boundaries where possible.
+
+    Args:
+        text: Text to shorten
+        max_tokens: Token budget
+
+    Returns:
+        The text itself if it fits, otherwise its leading sentences (or words) followed by '...'
+    """
+    text = ' '.join(text.split())
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    kept: List[str] = []
+    used = 0
+    for sentence in split_sentences(text, min_chars=0):
+        cost = estimate_tokens(sentence) + 1
+        if used + cost > max_tokens:
+            break
+        kept.append(sentence)
+        used += cost
+    if kept:
+        return ' '.join(kept) + ' ...'
+
+    # First sentence alone is over budget: keep as many words as fit
+    words: List[str] = []
+    used = 0
+    for word in text.split():
+        cost = estimate_tokens(word) + 1
+        if used + cost > max_tokens:
+            break
+        words.append(word)
+        used += cost
+    return ' '.join(words) + ' ...'
+
+def dedupe(items: Iterable[T], key: Callable[[T], str], exclude: Iterable[str] = ()) -> List[T]:
+    """
+    Drop items whose key repeats an earlier item or an excluded name, ignoring case and spacing.
+
+    Items are kept in their given order, so pass them sorted by priority.
+    """
+    seen = {' '.join(name.casefold().split()) for name in exclude}
+    unique = []
+    for item in items:
+        normalized = ' '.join(key(item).casefold().split())
+        if normalized and normalized not in seen:
+            seen.add(normalized)
+            unique.append(item)
+    return unique
+
+class PromptBudget:
+    """Tracks how many tokens compaction removed while a prompt is built."""
+
+    def __init__(self, name: str):
+        """
+        Initialize prompt budget.
+
+        Args:
+            name: Metric prefix for the prompt, e.g. 'commentary' or 'vision'
+        """
+        self.name = name
+        self.saved_tokens = 0
+
+    def truncate(self, text: Optional[str], max_tokens: int) -> str:
+        """Truncate text to a budget and account for the removed tokens."""
+        if not text:
+            return ''
+        compact = truncate_to_budget(str(text), max_tokens)
+        self.saved_tokens += max(0, estimate_tokens(str(text)) - estimate_tokens(compact))
+        return compact
+
+    def dedupe(self, items: Iterable[T], key: Callable[[T], str], exclude: Iterable[str] = ()) -> List[T]:
+        """Dedupe items and account for the removed names."""
+        items = list(items)
+        unique = dedupe(items, key, exclude)
+        if len(unique) < len(items):
+            cost = lambda group: sum(estimate_tokens(key(item)) + 1 for item in group)
+            self.saved_tokens += cost(items) - cost(unique)
+        return unique
+
+    def limit(self, items: List[T], max_items: int, key: Callable[[T], str]) -> List[T]:
+        """Keep the first max_items items and account for the dropped ones."""
+        self.saved_tokens += sum(estimate_tokens(key(item)) + 1 for item in items[max_items:])
+        return items[:max_items]
+
+    def report(self, messages: List[dict]) -> int:
+        """
+        Log and record input tokens for the finished prompt.
+
+        Args:
+            messages: Chat messages that will be sent
+
+        Returns:
+            Estimated input tokens
+        """
+        after = estimate_message_tokens(messages)
+        before = after + self.saved_tokens
+        metrics.observe(f"{self.name}.input_tokens", after)
+        metrics.increment(f"{self.name}.input_tokens_saved", self.saved_tokens)
+        logger.info(f"{self.name} prompt: ~{after} input tokens (~{before} uncompacted, saved ~{self.saved_tokens})")
+        return after
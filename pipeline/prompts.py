@@ -2,15 +2,85 @@
 Module for managing prompts and LLM model selection.
 """
 
+import asyncio
 from enum import Enum
-from typing import Dict, Optional, Any
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, Any, Set, Tuple
 import os
-from openai import OpenAI, OpenAIError
+import httpx
+from openai import AsyncOpenAI, OpenAI, OpenAIError
 import requests
 import logging
 
+from .response_cache import make_key, response_cache
+
 logger = logging.getLogger(__name__)
 
+# API endpoints; override to point at a compatible server such as benchmarks/openai_standin_server.py
+OPENAI_BASE_URL = os.getenv('OPENAI_BASE_URL') or None
+DEEPSEEK_BASE_URL = os.getenv('DEEPSEEK_BASE_URL', "https://api.deepseek.com/v1")
+
+# Shared async HTTP connection pools, one per event loop since httpx pools cannot cross loops
+_http_clients: Dict[int, Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+# Background closes of clients left behind by finished event loops
+_closing: Set[asyncio.Task] = set()
+
+def _close_in_background(close: Callable[[], Awaitable[Any]], name: str) -> None:
+    """
+    Close a client that belonged to an event loop which has since been closed.
+    
+    Best effort: connections bound to the dead loop may refuse to close
+    cleanly, in which case they are released when garbage collected.
+    
+    Args:
+        close: Factory returning the close coroutine
+        name: Client description for the log
+    """
+    async def run():
+        try:
+            await close()
+        except Exception as e:
+            logger.debug(f"Could not cleanly close stale {name}: {str(e)}")
+    
+    task = asyncio.get_running_loop().create_task(run())
+    _closing.add(task)
+    task.add_done_callback(_closing.discard)
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Get the HTTP connection pool shared by all async LLM clients on the running event loop.
+    
+    Returns:
+        httpx.AsyncClient bound to the current event loop
+    """
+    loop = asyncio.get_running_loop()
+    
+    # Close pools that belonged to event loops which have since been closed
+    for key, (owner, stale) in list(_http_clients.items()):
+        if owner.is_closed():
+            del _http_clients[key]
+            _close_in_background(stale.aclose, "HTTP connection pool")
+    
+    entry = _http_clients.get(id(loop))
+    if entry is None or entry[0] is not loop:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+            timeout=httpx.Timeout(120.0, connect=10.0)
+        )
+        entry = (loop, client)
+        _http_clients[id(loop)] = entry
+    return entry[1]
+
+async def close_async_http_client() -> None:
+    """
+    Close the running event loop's HTTP connection pool.
+    
+    Await this before a short-lived loop (asyncio.run) ends; once the loop is
+    closed its pool can no longer be closed and its connections leak.
+    """
+    entry = _http_clients.pop(id(asyncio.get_running_loop()), None)
+    if entry is not None:
+        await entry[1].aclose()
+
 class LLMProvider(Enum):
     """Available LLM providers."""
     OPENAI = "openai"
@@ -25,25 +95,62 @@ class PromptTemplate:
 class PromptManager:
     """Manager for handling prompts and LLM interactions."""
     
-    def __init__(self, provider: LLMProvider = LLMProvider.OPENAI):
-        """Initialize the prompt manager with a specific provider."""
+    def __init__(self, provider: LLMProvider = LLMProvider.OPENAI, api_key: Optional[str] = None):
+        """
+        Initialize the prompt manager with a specific provider.
+        
+        Args:
+            provider: LLM provider to use
+            api_key: Optional API key overriding the provider's environment variable
+        """
         self.provider = provider
+        self.api_key = api_key
         self.client = None
+        # Async clients per event loop, each wrapping that loop's shared connection pool
+        self._async_clients: Dict[int, Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient, AsyncOpenAI]] = {}
         self._setup_client()
+    
+    def _client_kwargs(self) -> Dict[str, Any]:
+        """Get API key and base URL for the selected provider."""
+        if self.provider == LLMProvider.OPENAI:
+            return {
+                'api_key': self.api_key or os.getenv('OPENAI_API_KEY'),
+                'base_url': OPENAI_BASE_URL
+            }
+        elif self.provider == LLMProvider.DEEPSEEK:
+            return {
+                'api_key': self.api_key or os.getenv('DEEPSEEK_API_KEY'),
+                'base_url': DEEPSEEK_BASE_URL
+            }
+        raise ValueError(f"Unsupported provider: {self.provider}")
         
     def _setup_client(self):
         """Setup the appropriate client based on provider."""
         try:
-            if self.provider == LLMProvider.OPENAI:
-                self.client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-            elif self.provider == LLMProvider.DEEPSEEK:
-                self.client = OpenAI(
-                    api_key=os.getenv('DEEPSEEK_API_KEY'),
-                    base_url="https://api.deepseek.com/v1"
-                )
+            self.client = OpenAI(**self._client_kwargs())
         except Exception as e:
             logger.error(f"Error setting up {self.provider.value} client: {str(e)}")
             raise
+    
+    def _get_async_client(self) -> AsyncOpenAI:
+        """Get an async client for the provider that uses the shared connection pool."""
+        loop = asyncio.get_running_loop()
+        http_client = get_async_http_client()
+        
+        # Close clients whose event loop has finished
+        for key, (owner, _, stale) in list(self._async_clients.items()):
+            if owner.is_closed():
+                del self._async_clients[key]
+                _close_in_background(stale.close, f"{self.provider.value} client")
+        
+        entry = self._async_clients.get(id(loop))
+        if entry is None or entry[0] is not loop or entry[1] is not http_client:
+            if entry is not None and entry[0] is loop:
+                # The loop's pool was closed and replaced; the old client wraps the closed pool
+                _close_in_background(entry[2].close, f"{self.provider.value} client")
+            entry = (loop, http_client, AsyncOpenAI(**self._client_kwargs(), http_client=http_client))
+            self._async_clients[id(loop)] = entry
+        return entry[2]
 
     def generate_response(self, messages: list, model: str = "gpt-4o-mini", **kwargs) -> str:
         """Generate response using the selected provider."""
@@ -62,6 +169,87 @@ class PromptManager:
         except Exception as e:
             logger.error(f"Error generating response: {str(e)}")
             raise
+    
+    async def agenerate_response(self, messages: list, model: str = "gpt-4o-mini", use_cache: bool = True, **kwargs) -> str:
+        """
+        Generate response using the selected provider without blocking the event loop.
+        
+        Args:
+            messages: Chat messages
+            model: Model name for the provider
+            use_cache: Serve identical requests from the response cache (False forces a fresh completion)
+            **kwargs: Additional chat completion parameters
+            
+        Returns:
+            Generated message content
+        """
+        try:
+            cache_key = make_key(self.provider.value, model, messages, kwargs)
+            if use_cache:
+                cached = response_cache.get(cache_key)
+                if cached is not None:
+                    logger.info(f"Serving {self.provider.value} response from cache")
+                    return cached
+            
+            client = self._get_async_client()
+            response = await client.chat.completions.create(
+                model=model,
+                messages=messages,
+                **kwargs
+            )
+            
+            content = response.choices[0].message.content
+            if content:
+                response_cache.put(cache_key, content)
+            return content
+            
+        except Exception as e:
+            logger.error(f"Error generating response: {str(e)}")
+            raise
+    
+    async def astream_response(self, messages: list, model: str = "gpt-4o-mini", use_cache: bool = True, **kwargs) -> AsyncIterator[str]:
+        """
+        Stream response text from the selected provider as it is generated.
+        
+        Args:
+            messages: Chat messages
+            model: Model name for the provider
+            use_cache: Replay identical requests from the response cache (False forces a fresh completion)
+            **kwargs: Additional chat completion parameters
+            
+        Yields:
+            Pieces of generated message content
+        """
+        cache_key = make_key(self.provider.value, model, messages, kwargs)
+        if use_cache:
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Serving {self.provider.value} response from cache")
+                yield cached
+                return
+        
+        parts = []
+        try:
+            client = self._get_async_client()
+            stream = await client.chat.completions.create(
+                model=model,
+                messages=messages,
+                stream=True,
+                **kwargs
+            )
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield delta
+        except Exception as e:
+            logger.error(f"Error streaming response: {str(e)}")
+            raise
+        
+        if parts:
+            response_cache.put(cache_key, ''.join(parts))
 
 # Commentary style templates
 COMMENTARY_STYLES = {
@@ -0,0 +1,122 @@
+"""
+LLM response cache module
+In-process TTL/LRU cache for chat completions keyed by normalized prompt, model and sampling parameters
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r'\s+')
+
+# Request parameters that change the generated text and must be part of the key
+SAMPLING_PARAMS = ('temperature', 'top_p', 'max_tokens', 'presence_penalty', 'frequency_penalty', 'seed')
+
+def _normalize(text: str) -> str:
+    """Collapse whitespace so cosmetic prompt differences map to the same key."""
+    return _WHITESPACE.sub(' ', text).strip()
+
+def make_key(provider: str, model: str, messages: List[Dict[str, Any]], params: Dict[str, Any]) -> str:
+    """
+    Build a cache key for a chat completion request.
+
+    Args:
+        provider: LLM provider name
+        model: Model name
+        messages: Chat messages (system and user prompts)
+        params: Request parameters; only sampling parameters are used
+
+    Returns:
+        Hex SHA-256 digest of the normalized request
+    """
+    payload = {
+        'provider': provider,
+        'model': model,
+        'messages': [
+            [message.get('role'), _normalize(message['content']) if isinstance(message.get('content'), str) else message.get('content')]
+            for message in messages
+        ],
+        'params': {name: params[name] for name in SAMPLING_PARAMS if name in params}
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+class ResponseCache:
+    """Thread-safe TTL cache with least-recently-used eviction."""
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None):
+        """
+        Initialize response cache.
+
+        Args:
+            max_entries: Maximum number of cached responses (LLM_CACHE_SIZE, default 256)
+            ttl: Seconds a response stays valid (LLM_CACHE_TTL, default 24 hours)
+        """
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv('LLM_CACHE_SIZE', '256'))
+        self.ttl = ttl if ttl is not None else float(os.getenv('LLM_CACHE_TTL', '86400'))
+        self._entries: 'OrderedDict[str, Tuple[float, str]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Returns:
+            Cached response text, or None on a miss or expired entry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                metrics.increment("llm.cache_misses")
+                return None
+            self._entries.move_to_end(key)
+        metrics.increment("llm.cache_hits")
+        return entry[1]
+
+    def put(self, key: str, value: str) -> None:
+        """Store a response, evicting the least recently used entries when full."""
+        if self.max_entries <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                metrics.increment("llm.cache_evictions")
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> Dict[str, float]:
+        """Get hit/miss counters and the hit rate."""
+        hits = metrics.get_counter("llm.cache_hits")
+        misses = metrics.get_counter("llm.cache_misses")
+        total = hits + misses
+        return {
+            'entries': len(self),
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / total if total else 0.0
+        }
+
+# Process-wide cache shared by all prompt managers
+response_cache = ResponseCache()
@@ -0,0 +1,108 @@
+"""
+Speech timing module
+Local speech-duration estimates for audio scripts and trimming them to fit a video
+"""
+
+import logging
+import os
+import re
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Speaking rates in words per minute
+WPM_RATES = {
+    'en': 150,  # English: ~150 words per minute
+    'ur': 120   # Urdu: ~120 words per minute (slower due to formal speech)
+}
+
+# Pause read for an ellipsis when no explicit break follows it
+ELLIPSIS_PAUSE = 0.3
+
+# Share of the video the narration may fill, leaving room for TTS variance
+FIT_RATIO = float(os.getenv('NARRATION_FIT_RATIO', '0.95'))
+
+_BREAK = re.compile(r'<break\s+time="([\d.]+)(m?s)"\s*/>')
+_TAG = re.compile(r'<[^>]+>')
+_ELLIPSIS = re.compile(r'\.\.\.(?!\s*<break)')
+_TOKEN = re.compile(r'<[^>]+>|[^\s<]+')
+
+# A sentence runs up to a terminator (plus its pause markup) that is followed by whitespace or the end
+_SENTENCE = re.compile(r'.*?[.!?۔؟]+(?:<break[^>]*/>)?(?=\s|$)|.+', re.DOTALL)
+
+def words_per_minute(language: str) -> int:
+    """Get the speaking rate for a language."""
+    return WPM_RATES.get(language, WPM_RATES['en'])
+
+def estimate_speech_duration(script: str, language: str = 'en', wpm: Optional[float] = None) -> float:
+    """
+    Estimate how long a script takes to speak, including SSML breaks.
+
+    Args:
+        script: Audio script, possibly with <break/> markup
+        language: Language code ('en' or 'ur')
+        wpm: Speaking rate in words per minute (defaults to the language's rate)
+
+    Returns:
+        Estimated duration in seconds
+    """
+    pauses = 0.0
+    for match in _BREAK.finditer(script):
+        value = float(match.group(1))
+        pauses += value / 1000 if match.group(2) == 'ms' else value
+    pauses += len(_ELLIPSIS.findall(script)) * ELLIPSIS_PAUSE
+    words = len(_TAG.sub(' ', script).split())
+    return words / (wpm or words_per_minute(language)) * 60 + pauses
+
+def max_speech_seconds(metadata: dict) -> Optional[float]:
+    """Get the speech budget for a video from its metadata, or None if the duration is unknown."""
+    try:
+        duration = float(metadata.get('duration') or 0)
+    except (TypeError, ValueError):
+        return None
+    return duration * FIT_RATIO if duration > 0 else None
+
+def max_words(max_seconds: float, language: str) -> int:
+    """Words that fit a speech budget, leaving a tenth for pauses."""
+    return max(1, int(max_seconds / 60 * words_per_minute(language) * 0.9))
+
+def split_script(script: str) -> List[str]:
+    """Split an audio script into sentences, keeping each sentence's pause markup."""
+    return [match.group(0).strip() for match in _SENTENCE.finditer(script) if match.group(0).strip()]
+
+def trim_to_duration(script: str, language: str, max_seconds: float) -> Optional[str]:
+    """
+    Keep the leading sentences of a script that fit a speech budget.
+
+    Args:
+        script: Audio script
+        language: Language code ('en' or 'ur')
+        max_seconds: Speech budget in seconds
+
+    Returns:
+        The script itself if it fits, the trimmed script, or None if not even
+        the first sentence fits
+    """
+    if estimate_speech_duration(script, language) <= max_seconds:
+        return script
+
+    kept: List[str] = []
+    used = 0.0
+    for sentence in split_script(script):
+        cost = estimate_speech_duration(sentence, language)
+        if used + cost > max_seconds:
+            break
+        kept.append(sentence)
+        used += cost
+    return ' '.join(kept) if kept else None
+
+def truncate_words(script: str, language: str, max_seconds: float) -> str:
+    """Cut a script mid-sentence at the last word that fits a speech budget."""
+    kept: List[str] = []
+    used = 0.0
+    for token in _TOKEN.findall(script):
+        used += estimate_speech_duration(token, language)
+        if used > max_seconds:
+            break
+        kept.append(token)
+    return ' '.join(kept)
@@ -0,0 +1,131 @@
+"""
+Text normalization module
+Precompiled cleanup passes that turn generated commentary into TTS-ready scripts
+"""
+
+import logging
+import re
+from functools import lru_cache
+from typing import Sequence
+
+logger = logging.getLogger(__name__)
+
+# Characters allowed in Urdu scripts: Arabic-script blocks, whitespace and Urdu punctuation
+_URDU_DISALLOWED = re.compile(r'[^\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF\s۔،؟!]+')
+
+# English scripts: drop markdown symbols and non-ASCII, then blank out remaining symbols
+_ENGLISH_DELETE = re.compile(r'[*_#`~]|[^\x00-\x7F]+')
+_ENGLISH_SYMBOLS = re.compile(r'[^\w\s.,!?;:()\-\'\"]+')
+
+_MARKDOWN = re.compile(r'[*_#`]')
+_LIST_MARKERS = re.compile(r'^\s*[*-]\s*', flags=re.MULTILINE)
+_SENTENCE_PAUSE = re.compile(r'[.!?] ')
+_WHITESPACE = re.compile(r'\s+')
+
+# Pause markup added after Urdu punctuation. str.replace per mark beats a
+# translate table here: it scans in C instead of mapping every character.
+_URDU_SCRIPT_BREAKS = (
+    ('۔', '۔<break time="1s"/>'),
+    ('،', '،<break time="0.5s"/>'),
+    ('؟', '؟<break time="0.8s"/>')
+)
+_URDU_RESPONSE_BREAKS = _URDU_SCRIPT_BREAKS[:2]
+
+# Speech formatting passes for format_for_audio, applied in order since later passes see earlier markup
+_SPEECH_SYMBOLS = re.compile(r'[^\w\s,.!?;:()\-\'\"]+')
+_SPEECH_BREAKS = (
+    (re.compile(r'([,;])\s'), r'\1 <break time="0.2s"/> '),
+    (re.compile(r'([.!?])\s'), r'\1 <break time="0.4s"/> '),
+    (re.compile(r'\.\.\.\s'), '... <break time="0.3s"/> '),
+    (re.compile(r'(!)\s'), r'\1 <break time="0.2s"/> '),
+    (re.compile(r'(\?)\s'), r'\1 <break time="0.3s"/> ')
+)
+_DUPLICATE_BREAKS = re.compile(r'\s*<break[^>]+>\s*<break[^>]+>\s*')
+
+def strip_nonprintable(text: str) -> str:
+    """Remove characters that are neither printable nor whitespace."""
+    # Classify each distinct character once instead of every character in the text
+    for char in [c for c in set(text) if not (c.isprintable() or c.isspace())]:
+        text = text.replace(char, '')
+    return text
+
+def _add_urdu_breaks(text: str, breaks) -> str:
+    for mark, replacement in breaks:
+        text = text.replace(mark, replacement)
+    return text
+
+def clean_response(text: str, language: str) -> str:
+    """
+    Clean raw LLM output and add sentence pauses.
+
+    Args:
+        text: Generated commentary
+        language: Language code ('en' or 'ur')
+
+    Returns:
+        Cleaned commentary
+    """
+    text = _MARKDOWN.sub('', text)
+    text = _LIST_MARKERS.sub('', text)
+    text = strip_nonprintable(text)
+
+    if language == 'ur':
+        text = _add_urdu_breaks(text, _URDU_RESPONSE_BREAKS)
+    else:
+        text = _SENTENCE_PAUSE.sub('... ', text)
+
+    return text.strip()
+
+def normalize_for_audio(text: str, language: str = 'en') -> str:
+    """
+    Restrict commentary to characters the TTS voice can read and add pauses.
+
+    Args:
+        text: Commentary text
+        language: Language code ('en' or 'ur')
+
+    Returns:
+        Audio script
+    """
+    text = strip_nonprintable(text)
+
+    if language == 'ur':
+        text = _URDU_DISALLOWED.sub('', text)
+        text = _add_urdu_breaks(text, _URDU_SCRIPT_BREAKS)
+    else:
+        text = _ENGLISH_DELETE.sub('', text)
+        text = _ENGLISH_SYMBOLS.sub(' ', text)
+        text = _SENTENCE_PAUSE.sub('... ', text)
+
+    return _WHITESPACE.sub(' ', text).strip()
+
+def clean_for_speech(text: str) -> str:
+    """Keep only word characters and basic punctuation, with normalized whitespace."""
+    return _WHITESPACE.sub(' ', _SPEECH_SYMBOLS.sub('', text))
+
+@lru_cache(maxsize=16)
+def _emphasis_pattern(words: Sequence[str]) -> re.Pattern:
+    """Compile one alternation matching any of the emphasis words as whole words."""
+    return re.compile(r'\b(?:' + '|'.join(map(re.escape, words)) + r')\b')
+
+def add_speech_markup(text: str, emphasis_words: Sequence[str]) -> str:
+    """
+    Add SSML pauses after punctuation and emphasis around emphasis words.
+
+    Args:
+        text: Sentence-joined commentary
+        emphasis_words: Words to wrap in strong emphasis
+
+    Returns:
+        Text with SSML markup
+    """
+    for pattern, replacement in _SPEECH_BREAKS:
+        text = pattern.sub(replacement, text)
+
+    if emphasis_words:
+        text = _emphasis_pattern(tuple(emphasis_words)).sub(
+            lambda match: f'<emphasis level="strong">{match.group(0)}</emphasis>', text
+        )
+
+    text = _DUPLICATE_BREAKS.sub(' <break time="0.4s"/> ', text)
+    return _WHITESPACE.sub(' ', text).strip()
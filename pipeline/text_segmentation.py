@@ -0,0 +1,83 @@
+"""
+Text segmentation module
+Incremental sentence segmentation for streamed LLM output
+"""
+
+import logging
+import re
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# A run of sentence terminators (English and Urdu), optionally followed by closing quotes/brackets,
+# that is followed by whitespace. Requiring whitespace keeps decimals like "3.5" intact.
+_SENTENCE_END = re.compile(r'[.!?۔؟]+["\')\]]*(?=\s)')
+
+# Common abbreviations that end with a period but do not end a sentence
+_ABBREVIATIONS = {'mr', 'mrs', 'ms', 'dr', 'prof', 'sr', 'jr', 'st', 'vs', 'etc', 'e.g', 'i.e', 'no'}
+
+class SentenceSegmenter:
+    """Accumulates streamed text and emits complete sentences as soon as they end."""
+
+    def __init__(self, min_chars: int = 20):
+        """
+        Initialize sentence segmenter.
+
+        Args:
+            min_chars: Shorter sentences are merged with the next one so that
+                each emitted segment is worth a separate TTS request
+        """
+        self.min_chars = min_chars
+        self._buffer = ""
+
+    def _is_abbreviation(self, text: str, end: int) -> bool:
+        """Check whether the terminator ending at `end` belongs to an abbreviation."""
+        if text[end - 1] != '.':
+            return False
+        words = text[:end - 1].split()
+        return bool(words) and words[-1].lower().lstrip('("\'') in _ABBREVIATIONS
+
+    def feed(self, chunk: str) -> List[str]:
+        """
+        Add streamed text.
+
+        Args:
+            chunk: Next piece of generated text
+
+        Returns:
+            Sentences completed by this chunk, in order
+        """
+        self._buffer += chunk
+        sentences = []
+        start = 0
+        for match in _SENTENCE_END.finditer(self._buffer):
+            end = match.end()
+            if self._is_abbreviation(self._buffer, end):
+                continue
+            sentence = self._buffer[start:end].strip()
+            if len(sentence) < self.min_chars:
+                continue
+            sentences.append(sentence)
+            start = end
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self) -> Optional[str]:
+        """
+        Emit whatever text remains once the stream has ended.
+
+        Returns:
+            Final sentence, or None if nothing is left
+        """
+        remainder = self._buffer.strip()
+        self._buffer = ""
+        return remainder or None
+
+def split_sentences(text: str, min_chars: int = 20) -> List[str]:
+    """Split complete text into sentences using the same rules as the streaming segmenter."""
+    segmenter = SentenceSegmenter(min_chars=min_chars)
+    sentences = segmenter.feed(text)
+    remainder = segmenter.flush()
+    if remainder:
+        sentences.append(remainder)
+    return sentences
@@ -0,0 +1,208 @@
+"""
+TTS backends module
+Speech synthesis backends: Google Cloud TTS and a deterministic local stand-in for offline runs
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Set, Tuple
+
+from google.cloud import texttospeech
+
+from .speech_timing import estimate_speech_duration
+from .wav_assembly import HEADER_SIZE, write_header
+
+logger = logging.getLogger(__name__)
+
+class TTSBackend(ABC):
+    """Synthesizes Google TTS requests (input, voice, audio config) into audio bytes."""
+
+    name = "base"
+    # Whether results are worth keeping in the on-disk TTS cache
+    cacheable = True
+    # Whether voices should be validated against the Google voice catalog
+    uses_voice_catalog = True
+
+    def supports(self, encoding: str) -> bool:
+        """Whether the backend can produce an AudioEncoding name directly."""
+        return True
+
+    @abstractmethod
+    def synthesize(self, synthesis_input, voice, audio_config) -> bytes:
+        """Synthesize a request, blocking until the audio is ready."""
+
+    @abstractmethod
+    async def asynthesize(self, synthesis_input, voice, audio_config) -> bytes:
+        """Synthesize a request without blocking the event loop."""
+
+    async def aclose(self) -> None:
+        """Release clients bound to the running event loop."""
+
+class GoogleTTSBackend(TTSBackend):
+    """Google Cloud Text-to-Speech."""
+
+    name = "google"
+
+    def __init__(self):
+        self._client = None
+        self._client_lock = threading.Lock()
+        # Async clients, one per event loop since gRPC channels cannot cross loops
+        self._async_clients: Dict[int, Tuple[asyncio.AbstractEventLoop, texttospeech.TextToSpeechAsyncClient]] = {}
+        self._closing: Set[asyncio.Task] = set()
+
+    def _get_client(self) -> texttospeech.TextToSpeechClient:
+        """Get the shared Text-to-Speech client (thread-safe, reused across requests)."""
+        with self._client_lock:
+            if self._client is None:
+                self._client = texttospeech.TextToSpeechClient()
+            return self._client
+
+    def _get_async_client(self) -> texttospeech.TextToSpeechAsyncClient:
+        """Get the async Text-to-Speech client for the running event loop."""
+        loop = asyncio.get_running_loop()
+
+        # Close clients that belonged to event loops which have since been closed
+        for key, (owner, stale) in list(self._async_clients.items()):
+            if owner.is_closed():
+                del self._async_clients[key]
+                self._close_in_background(stale)
+
+        entry = self._async_clients.get(id(loop))
+        if entry is None or entry[0] is not loop:
+            entry = (loop, texttospeech.TextToSpeechAsyncClient())
+            self._async_clients[id(loop)] = entry
+        return entry[1]
+
+    def _close_in_background(self, client: texttospeech.TextToSpeechAsyncClient) -> None:
+        """
+        Close the gRPC channel of a client left behind by a finished event loop.
+
+        Best effort: a channel bound to the dead loop may refuse to close
+        cleanly, in which case it is released when garbage collected.
+        """
+        async def run():
+            try:
+                await client.transport.close()
+            except Exception as e:
+                logger.debug(f"Could not cleanly close stale TTS client: {str(e)}")
+
+        task = asyncio.get_running_loop().create_task(run())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def aclose(self) -> None:
+        entry = self._async_clients.pop(id(asyncio.get_running_loop()), None)
+        if entry is not None:
+            await entry[1].transport.close()
+
+    def synthesize(self, synthesis_input, voice, audio_config) -> bytes:
+        response = self._get_client().synthesize_speech(
+            input=synthesis_input,
+            voice=voice,
+            audio_config=audio_config
+        )
+        return response.audio_content
+
+    async def asynthesize(self, synthesis_input, voice, audio_config) -> bytes:
+        response = await self._get_async_client().synthesize_speech(
+            input=synthesis_input,
+            voice=voice,
+            audio_config=audio_config
+        )
+        return response.audio_content
+
+class LocalTTSBackend(TTSBackend):
+    """
+    Deterministic offline stand-in that returns silent PCM WAV.
+
+    The audio is as long as the text would take to speak at the configured
+    words-per-minute rate (scaled by speaking_rate, plus SSML breaks), so
+    everything downstream of synthesis sees realistic durations and sizes.
+    """
+
+    name = "local"
+    cacheable = False
+    uses_voice_catalog = False
+
+    def __init__(self, wpm: Optional[float] = None, latency: Optional[float] = None, latency_per_char: Optional[float] = None):
+        """
+        Initialize local TTS backend.
+
+        Args:
+            wpm: Speaking rate in words per minute (LOCAL_TTS_WPM, default 150)
+            latency: Seconds added to every request (LOCAL_TTS_LATENCY, default 0)
+            latency_per_char: Seconds added per input character (LOCAL_TTS_LATENCY_PER_CHAR, default 0)
+        """
+        self.wpm = wpm if wpm is not None else float(os.getenv('LOCAL_TTS_WPM', '150'))
+        self.latency = latency if latency is not None else float(os.getenv('LOCAL_TTS_LATENCY', '0'))
+        self.latency_per_char = (latency_per_char if latency_per_char is not None
+                                 else float(os.getenv('LOCAL_TTS_LATENCY_PER_CHAR', '0')))
+
+    def supports(self, encoding: str) -> bool:
+        return encoding == 'LINEAR16'
+
+    def _delay(self, text: str) -> float:
+        return self.latency + self.latency_per_char * len(text)
+
+    def _render(self, text: str, voice, audio_config) -> bytes:
+        language = (voice.language_code or 'en').split('-')[0]
+        speaking_rate = audio_config.speaking_rate or 1.0
+        duration = estimate_speech_duration(text, language, wpm=self.wpm) / speaking_rate
+        sample_rate = audio_config.sample_rate_hertz or 24000
+        data_size = int(duration * sample_rate) * 2  # mono 16-bit
+        audio = bytearray(HEADER_SIZE + data_size)
+        write_header(audio, 1, 2, sample_rate, data_size)
+        return bytes(audio)
+
+    def synthesize(self, synthesis_input, voice, audio_config) -> bytes:
+        text = synthesis_input.ssml or synthesis_input.text
+        time.sleep(self._delay(text))
+        return self._render(text, voice, audio_config)
+
+    async def asynthesize(self, synthesis_input, voice, audio_config) -> bytes:
+        text = synthesis_input.ssml or synthesis_input.text
+        await asyncio.sleep(self._delay(text))
+        return self._render(text, voice, audio_config)
+
+BACKENDS = {
+    GoogleTTSBackend.name: GoogleTTSBackend,
+    LocalTTSBackend.name: LocalTTSBackend
+}
+
+_backends: Dict[str, TTSBackend] = {}
+_backends_lock = threading.Lock()
+
+def get_backend(name: Optional[str] = None) -> TTSBackend:
+    """
+    Get the shared TTS backend.
+
+    Args:
+        name: Backend name (defaults to TTS_BACKEND, 'google' or 'local')
+
+    Returns:
+        Backend instance
+    """
+    name = (name or os.getenv('TTS_BACKEND', 'google')).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown TTS backend: {name}")
+    with _backends_lock:
+        if name not in _backends:
+            _backends[name] = BACKENDS[name]()
+            logger.info(f"Using {name} TTS backend")
+        return _backends[name]
+
+async def close_async_clients() -> None:
+    """
+    Close the running event loop's clients for every backend in use.
+
+    Await this before a short-lived loop (asyncio.run) ends, alongside
+    prompts.close_async_http_client.
+    """
+    with _backends_lock:
+        backends = list(_backends.values())
+    for backend in backends:
+        await backend.aclose()
@@ -0,0 +1,161 @@
+"""
+TTS audio cache module
+Content-addressed on-disk cache of synthesized audio keyed by normalized text, voice and audio config
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r'\s+')
+
+def make_key(text: str, voice_name: str, language_code: str, audio_config: Dict[str, Any]) -> str:
+    """
+    Build a cache key for a synthesis request.
+
+    Args:
+        text: Text or SSML to synthesize; whitespace is normalized
+        voice_name: Voice name (or another stable voice description)
+        language_code: Voice language code, e.g. 'en-US'
+        audio_config: Audio settings that change the output (encoding, rate, pitch, ...)
+
+    Returns:
+        Hex SHA-256 digest of the normalized request
+    """
+    payload = {
+        'text': _WHITESPACE.sub(' ', text).strip(),
+        'voice': voice_name,
+        'language_code': language_code,
+        'audio_config': audio_config
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+class TTSCache:
+    """Thread-safe on-disk audio cache with least-recently-used size eviction."""
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: Optional[int] = None):
+        """
+        Initialize TTS cache.
+
+        Args:
+            cache_dir: Cache directory (TTS_CACHE_DIR, default ~/.video_bot/tts_cache)
+            max_bytes: Total size limit (TTS_CACHE_MAX_MB, default 512 MB); 0 disables the cache
+        """
+        self.cache_dir = Path(cache_dir or os.getenv('TTS_CACHE_DIR') or Path.home() / '.video_bot' / 'tts_cache')
+        self.max_bytes = max_bytes if max_bytes is not None else int(float(os.getenv('TTS_CACHE_MAX_MB', '512')) * 1024 * 1024)
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.audio"
+
+    def _total_size(self) -> int:
+        """Current cache size, scanned from disk on first use."""
+        if self._size is None:
+            self._size = sum(path.stat().st_size for path in self.cache_dir.glob('*/*.audio'))
+        return self._size
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Look up cached audio and mark it as recently used.
+
+        Returns:
+            Audio content, or None on a miss
+        """
+        if self.max_bytes <= 0:
+            return None
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)  # mtime tracks recency for eviction
+        except FileNotFoundError:
+            metrics.increment("tts.cache_misses")
+            return None
+        except OSError as e:
+            logger.warning(f"Error reading TTS cache entry {path}: {str(e)}")
+            metrics.increment("tts.cache_misses")
+            return None
+        metrics.increment("tts.cache_hits")
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store audio atomically, evicting the least recently used entries when over the size limit."""
+        if self.max_bytes <= 0 or not data or len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file in the same directory, then rename over the entry
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                previous = path.stat().st_size if path.exists() else 0
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Error writing TTS cache entry {path}: {str(e)}")
+            return
+
+        with self._lock:
+            self._size = self._total_size() + len(data) - previous
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache is at 90% of its limit."""
+        target = int(self.max_bytes * 0.9)
+        entries = []
+        for path in self.cache_dir.glob('*/*.audio'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        self._size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if self._size <= target:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            self._size -= size
+            metrics.increment("tts.cache_evictions")
+
+    def clear(self) -> None:
+        """Remove all cached audio."""
+        with self._lock:
+            for path in self.cache_dir.glob('*/*.audio'):
+                path.unlink(missing_ok=True)
+            self._size = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Get hit/miss counters, the hit rate and the cache size."""
+        hits = metrics.get_counter("tts.cache_hits")
+        misses = metrics.get_counter("tts.cache_misses")
+        total = hits + misses
+        with self._lock:
+            size = self._total_size() if self.cache_dir.exists() else 0
+        return {
+            'bytes': size,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / total if total else 0.0
+        }
+
+# Process-wide cache shared by all synthesis calls
+tts_cache = TTSCache()
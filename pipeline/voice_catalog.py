@@ -0,0 +1,233 @@
+"""
+Voice catalog module
+Google TTS voice list fetched once, persisted to disk with a TTL and indexed by language and gender
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from google.cloud import texttospeech
+
+logger = logging.getLogger(__name__)
+
+# Voice families in order of preference when no voice is named; all support SSML
+VOICE_TIERS = ('Neural2', 'Wavenet', 'Standard')
+
+@dataclass(slots=True, frozen=True)
+class Voice:
+    """A synthesis voice."""
+    name: str
+    language_codes: Tuple[str, ...]
+    ssml_gender: str
+    natural_sample_rate_hertz: int
+
+    @property
+    def tier(self) -> int:
+        """Preference rank of the voice family (lower is better)."""
+        for rank, family in enumerate(VOICE_TIERS):
+            if f"-{family}-" in self.name:
+                return rank
+        return len(VOICE_TIERS)
+
+def _fetch_google_voices() -> List[Voice]:
+    """List voices from Google Cloud TTS."""
+    response = texttospeech.TextToSpeechClient().list_voices()
+    return [
+        Voice(
+            name=voice.name,
+            language_codes=tuple(voice.language_codes),
+            ssml_gender=texttospeech.SsmlVoiceGender(voice.ssml_gender).name,
+            natural_sample_rate_hertz=voice.natural_sample_rate_hertz
+        )
+        for voice in response.voices
+    ]
+
+class VoiceCatalog:
+    """Thread-safe voice catalog that refreshes from the API at most once per TTL."""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        ttl: Optional[float] = None,
+        fetch: Callable[[], List[Voice]] = _fetch_google_voices
+    ):
+        """
+        Initialize voice catalog.
+
+        Args:
+            path: Catalog file (VOICE_CATALOG_PATH, default ~/.video_bot/voice_catalog.json)
+            ttl: Seconds before the catalog is fetched again (VOICE_CATALOG_TTL, default 7 days)
+            fetch: Function that lists voices from the API
+        """
+        self.path = Path(path or os.getenv('VOICE_CATALOG_PATH') or Path.home() / '.video_bot' / 'voice_catalog.json')
+        self.ttl = ttl if ttl is not None else float(os.getenv('VOICE_CATALOG_TTL', str(7 * 24 * 3600)))
+        self.fetch = fetch
+        self._voices: Optional[List[Voice]] = None
+        self._expires = 0.0
+        self._retry_after = 0.0
+        self._resolved: Dict[Tuple, Optional[Tuple[str, str]]] = {}
+        self._by_name: Dict[str, Voice] = {}
+        self._by_language: Dict[str, List[Voice]] = {}
+        self._lock = threading.Lock()
+
+    def _index(self, voices: List[Voice], fetched_at: float) -> None:
+        """Index voices by name and by full and base language code, best tier first."""
+        self._voices = voices
+        self._expires = fetched_at + self.ttl
+        self._by_name = {voice.name: voice for voice in voices}
+        self._resolved = {}
+        self._by_language = {}
+        for voice in sorted(voices, key=lambda v: (v.tier, v.name)):
+            codes = set(voice.language_codes) | {code.split('-')[0] for code in voice.language_codes}
+            for code in codes:
+                self._by_language.setdefault(code.lower(), []).append(voice)
+
+    def _read(self) -> Optional[Tuple[List[Voice], float]]:
+        """Read the persisted catalog."""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            voices = [
+                Voice(v['name'], tuple(v['language_codes']), v['ssml_gender'], v['natural_sample_rate_hertz'])
+                for v in data['voices']
+            ]
+            return voices, float(data['fetched_at'])
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable voice catalog {self.path}: {str(e)}")
+            return None
+
+    def _write(self, voices: List[Voice], fetched_at: float) -> None:
+        """Persist the catalog atomically."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump({'fetched_at': fetched_at, 'voices': [asdict(v) for v in voices]}, f)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Error saving voice catalog {self.path}: {str(e)}")
+
+    def ready(self) -> bool:
+        """Whether a fresh catalog is already in memory, so lookups will not block."""
+        now = time.time()
+        return (self._voices is not None and now < self._expires) or (self._voices is None and now < self._retry_after)
+
+    def load(self) -> bool:
+        """
+        Make sure the catalog is loaded: from memory, then disk, then the API.
+
+        A stale catalog is kept when a refresh fails.
+
+        Returns:
+            True if voices are available
+        """
+        with self._lock:
+            now = time.time()
+            if self._voices is not None and now < self._expires:
+                return True
+            if self._voices is None and now < self._retry_after:
+                return False
+
+            if self._voices is None:
+                persisted = self._read()
+                if persisted is not None:
+                    self._index(*persisted)
+                    if now < self._expires:
+                        logger.info(f"Loaded {len(self._voices)} voices from {self.path}")
+                        return True
+
+            try:
+                voices = self.fetch()
+            except Exception as e:
+                logger.warning(f"Could not fetch voice list: {str(e)}")
+                if self._voices is not None:
+                    self._expires = now + min(self.ttl, 3600)  # retry the refresh later
+                    return True
+                self._retry_after = now + 300
+                return False
+
+            self._index(voices, now)
+            self._write(voices, now)
+            logger.info(f"Fetched {len(voices)} voices")
+            return True
+
+    def voices(self, language: str, gender: Optional[str] = None) -> List[Voice]:
+        """
+        List voices for a language, best tier first.
+
+        Args:
+            language: Full ('en-US') or base ('en') language code
+            gender: Optional SSML gender name, e.g. 'FEMALE'
+
+        Returns:
+            Matching voices (empty when the catalog is unavailable)
+        """
+        if not self.load():
+            return []
+        voices = self._by_language.get(language.lower(), [])
+        if gender:
+            voices = [voice for voice in voices if voice.ssml_gender == gender.upper()]
+        return list(voices)
+
+    def get(self, name: str) -> Optional[Voice]:
+        """Look up a voice by name."""
+        return self._by_name.get(name) if self.load() else None
+
+    def resolve(self, language_code: str, name: Optional[str] = None, gender: Optional[str] = None) -> Optional[Tuple[str, str]]:
+        """
+        Choose a voice for a request.
+
+        The named voice is used when it exists for the language. Otherwise the best
+        voice of the requested gender for the language is chosen, falling back to
+        other regions of the same base language.
+
+        Args:
+            language_code: Requested language code, e.g. 'ur-PK'
+            name: Preferred voice name
+            gender: Preferred SSML gender name
+
+        Returns:
+            (voice name, language code) to request, or None when the catalog is
+            unavailable or has no voice for the language
+        """
+        if not self.load():
+            return None
+        request = (language_code, name, gender)
+        if request not in self._resolved:
+            self._resolved[request] = self._resolve(language_code, name, gender)
+        return self._resolved[request]
+
+    def _resolve(self, language_code: str, name: Optional[str], gender: Optional[str]) -> Optional[Tuple[str, str]]:
+        voice = self._by_name.get(name) if name else None
+        if voice is not None and language_code in voice.language_codes:
+            return voice.name, language_code
+        if name:
+            logger.warning(f"Voice {name} is not available for {language_code}")
+
+        base = language_code.split('-')[0]
+        for code in (language_code, base):
+            candidates = self.voices(code, gender) or self.voices(code)
+            if candidates:
+                voice = candidates[0]
+                chosen_code = language_code if language_code in voice.language_codes else voice.language_codes[0]
+                if chosen_code != language_code:
+                    logger.warning(f"No {language_code} voice available, using {voice.name} ({chosen_code})")
+                return voice.name, chosen_code
+        logger.warning(f"No voice available for {language_code}")
+        return None
+
+# Process-wide catalog shared by all synthesis calls
+voice_catalog = VoiceCatalog()
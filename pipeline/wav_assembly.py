@@ -0,0 +1,157 @@
+"""
+WAV assembly module
+Joins PCM WAV segments into one preallocated buffer or memory-mapped file without intermediate copies
+"""
+
+import logging
+import mmap
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+HEADER_SIZE = 44
+_HEADER = struct.Struct('<4sI4s4sIHHIIHH4sI')
+
+@dataclass(slots=True)
+class WavSegment:
+    """PCM samples of one WAV segment, referenced in place."""
+    channels: int
+    sample_width: int
+    frame_rate: int
+    pcm: memoryview
+
+    @property
+    def format(self):
+        return self.channels, self.sample_width, self.frame_rate
+
+    @property
+    def bytes_per_second(self) -> int:
+        return self.channels * self.sample_width * self.frame_rate
+
+def parse_wav(data: Union[bytes, bytearray, memoryview]) -> WavSegment:
+    """
+    Locate the format and PCM data of a WAV file without copying the samples.
+
+    Args:
+        data: WAV file contents
+
+    Returns:
+        Segment whose pcm is a memoryview into data
+    """
+    view = memoryview(data)
+    if len(view) < 12 or view[0:4] != b'RIFF' or view[8:12] != b'WAVE':
+        raise ValueError("Not a RIFF/WAVE file")
+
+    fmt = None
+    offset = 12
+    while offset + 8 <= len(view):
+        chunk_id = bytes(view[offset:offset + 4])
+        chunk_size = struct.unpack_from('<I', view, offset + 4)[0]
+        body = offset + 8
+        if chunk_id == b'fmt ':
+            audio_format, channels, frame_rate, _, _, bits = struct.unpack_from('<HHIIHH', view, body)
+            if audio_format != 1:
+                raise ValueError(f"Unsupported WAV format {audio_format}, expected PCM")
+            fmt = (channels, bits // 8, frame_rate)
+        elif chunk_id == b'data':
+            if fmt is None:
+                raise ValueError("WAV data chunk before fmt chunk")
+            # Streamed WAVs may carry a placeholder size; clamp to the bytes present
+            end = min(body + chunk_size, len(view))
+            return WavSegment(*fmt, pcm=view[body:end])
+        offset = body + chunk_size + (chunk_size & 1)
+    raise ValueError("WAV file has no data chunk")
+
+def write_header(buffer, channels: int, sample_width: int, frame_rate: int, data_size: int) -> None:
+    """Write a canonical 44-byte PCM WAV header at the start of a writable buffer."""
+    block_align = channels * sample_width
+    _HEADER.pack_into(
+        buffer, 0,
+        b'RIFF', 36 + data_size, b'WAVE',
+        b'fmt ', 16, 1, channels, frame_rate, frame_rate * block_align, block_align, sample_width * 8,
+        b'data', data_size
+    )
+
+def _silence_bytes(seconds: float, segment: WavSegment) -> int:
+    """Byte length of silence, rounded down to whole frames."""
+    frame_size = segment.channels * segment.sample_width
+    return int(max(0.0, seconds) * segment.frame_rate) * frame_size
+
+def assemble_wav(
+    segments: Sequence[Union[bytes, bytearray, memoryview]],
+    gaps: Union[float, Sequence[float]] = 0.0,
+    pad_to: Optional[float] = None,
+    output: Optional[Path] = None
+) -> Union[bytearray, Path]:
+    """
+    Join WAV segments with identical formats, optionally separated by silence.
+
+    The result is preallocated once: a zero-filled bytearray, or a memory-mapped
+    file when output is given. Each segment's samples are copied straight into
+    place through a memoryview, silence is left as the zero fill, and the RIFF
+    header is written last.
+
+    Args:
+        segments: WAV file contents in playback order
+        gaps: Seconds of silence after each segment but the last, as one value or per gap
+        pad_to: Optional total duration in seconds; trailing silence is added to reach it
+        output: Optional file to write through a memory map instead of returning a buffer
+
+    Returns:
+        The assembled WAV as a bytearray, or output once written
+    """
+    if not segments:
+        raise ValueError("No WAV segments to assemble")
+
+    parsed: List[WavSegment] = [parse_wav(segment) for segment in segments]
+    first = parsed[0]
+    for segment in parsed[1:]:
+        if segment.format != first.format:
+            raise ValueError("Cannot join WAV segments with different formats")
+
+    if isinstance(gaps, (int, float)):
+        gaps = [gaps] * (len(parsed) - 1)
+    elif len(gaps) != len(parsed) - 1:
+        raise ValueError(f"Expected {len(parsed) - 1} gaps, got {len(gaps)}")
+
+    # Layout: where each segment starts in the data chunk
+    offsets = []
+    position = HEADER_SIZE
+    for index, segment in enumerate(parsed):
+        offsets.append(position)
+        position += len(segment.pcm)
+        if index < len(gaps):
+            position += _silence_bytes(gaps[index], first)
+    if pad_to is not None:
+        position = max(position, HEADER_SIZE + _silence_bytes(pad_to, first))
+    total = position
+
+    if output is None:
+        buffer = bytearray(total)
+        _fill(buffer, parsed, offsets, first, total)
+        return buffer
+
+    output = Path(output)
+    with open(output, 'w+b') as f:
+        f.truncate(total)  # zero-filled (sparse where supported)
+        with mmap.mmap(f.fileno(), total) as mapped:
+            _fill(mapped, parsed, offsets, first, total)
+            mapped.flush()
+    return output
+
+def _fill(buffer, parsed: List[WavSegment], offsets: List[int], first: WavSegment, total: int) -> None:
+    view = memoryview(buffer)
+    try:
+        for segment, offset in zip(parsed, offsets):
+            view[offset:offset + len(segment.pcm)] = segment.pcm
+        write_header(view, first.channels, first.sample_width, first.frame_rate, total - HEADER_SIZE)
+    finally:
+        view.release()
+
+def wav_duration(data: Union[bytes, bytearray, memoryview]) -> float:
+    """Get the duration of a PCM WAV in seconds."""
+    segment = parse_wav(data)
+    return len(segment.pcm) / segment.bytes_per_second
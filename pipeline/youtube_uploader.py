@@ -2,6 +2,7 @@
 YouTube upload module for handling video uploads to YouTube
 """
 
+import asyncio
 import os
 import pickle
 import logging
@@ -9,7 +10,6 @@ import json
 import tempfile
 from pathlib import Path
 from typing import Optional, Dict
-from openai import OpenAI
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
@@ -18,6 +18,8 @@ from googleapiclient.errors import HttpError
 import cv2
 import re
 
+from .prompts import PromptManager, LLMProvider, close_async_http_client
+
 logger = logging.getLogger(__name__)
 
 class YouTubeUploader:
@@ -34,17 +36,17 @@ class YouTubeUploader:
         self.credentials = credentials
         self.user_email = None
         
-        # Initialize DeepSeek client
+        # Initialize DeepSeek prompt manager
         try:
             with open('railway.json', 'r') as f:
                 config = json.load(f)
-                self.deepseek_client = OpenAI(
-                    api_key=config['DEEPSEEK_API_KEY'],
-                    base_url="https://api.deepseek.com"
+                self.prompt_manager = PromptManager(
+                    provider=LLMProvider.DEEPSEEK,
+                    api_key=config['DEEPSEEK_API_KEY']
                 )
         except Exception as e:
             logger.error(f"Failed to initialize DeepSeek client: {e}")
-            self.deepseek_client = None
+            self.prompt_manager = None
         
         # If modifying these scopes, delete the token.pickle file
         self.SCOPES = [
@@ -264,10 +266,17 @@ class YouTubeUploader:
             logger.error(f"Authentication error: {str(e)}", exc_info=True)
             return False
     
-    def _generate_content(self, video_metadata: Dict) -> Dict[str, str]:
+    async def _generate_content_once(self, video_metadata: Dict) -> Dict[str, str]:
+        """Generate content on a throwaway event loop, closing its HTTP pool before the loop ends."""
+        try:
+            return await self._generate_content(video_metadata)
+        finally:
+            await close_async_http_client()
+
+    async def _generate_content(self, video_metadata: Dict) -> Dict[str, str]:
         """Generate video title and description using DeepSeek."""
         try:
-            if not self.deepseek_client:
+            if not self.prompt_manager:
                 raise ValueError("DeepSeek client not initialized")
 
             # Extract metadata
@@ -312,7 +321,7 @@ class YouTubeUploader:
             IMPORTANT: Stay focused on the specific content (e.g., if it's about a polar bear crossing ice, don't make it generic about nature)
             """
 
-            response = self.deepseek_client.chat.completions.create(
+            content = await self.prompt_manager.agenerate_response(
                 model="deepseek-chat",
                 messages=[
                     {
@@ -323,8 +332,6 @@ class YouTubeUploader:
                 ],
                 stream=False
             )
-
-            content = response.choices[0].message.content
             
             try:
                 # Extract title between *Title:* and next newline
@@ -438,7 +445,7 @@ class YouTubeUploader:
                 logger.info(f"Processing vertical video as Shorts (duration: {duration:.2f}s, ratio: {height/width:.2f})")
             
             # Generate content using DeepSeek
-            content = self._generate_content(video_metadata or {})
+            content = asyncio.run(self._generate_content_once(video_metadata or {}))
             
             # Initialize tags list
             if tags is None:
@@ -604,6 +604,8 @@ try:
         
         from new_bot import VideoBot
         from pipeline import Step_1_download_video, Step_7_cleanup
+        from pipeline.prompts import close_async_http_client
+        from pipeline.tts_backends import close_async_clients
         from pipeline.youtube_uploader import YouTubeUploader
         
         # Initialize VideoBot with proper caching
@@ -937,11 +939,18 @@ try:
             }
             st.caption(style_descriptions[style])
             
+            fresh_commentary = st.checkbox(
+                "🎲 Fresh commentary",
+                help="Generate new commentary even if this video was processed before with the same settings",
+                key="fresh_commentary"
+            )
+            
             # Update settings in session state and bot's user settings
             user_id = 0  # Default user ID for Streamlit interface
             init_bot().update_user_setting(user_id, 'style', style)
             init_bot().update_user_setting(user_id, 'llm', llm)
             init_bot().update_user_setting(user_id, 'language', language)
+            init_bot().update_user_setting(user_id, 'fresh_commentary', fresh_commentary)
             st.session_state.settings = init_bot().get_user_settings(user_id)
         
         # Add these classes and process_video function before the tab sections
@@ -1087,6 +1096,13 @@ try:
                 logger.error(f"Error processing video: {str(e)}")
                 status_placeholder.error(f"❌ Error processing video: {str(e)}")
             finally:
+                # Close this job's connection pools before asyncio.run closes its event loop
+                try:
+                    await close_async_http_client()
+                    await close_async_clients()
+                except Exception as e:
+                    logger.warning(f"Error closing API clients: {str(e)}")
+                
                 # Clear processing state
                 st.session_state.is_processing = False
                 if hasattr(st.session_state, 'processing_start_time'):